@@ -0,0 +1,160 @@
+"""
+Deterministic stand-ins for the `ssh`- and `rsync`-executables used
+by the 'DCM Transfer Module'-app.
+
+The executables `benchmarks/fake/ssh` and `benchmarks/fake/rsync` can
+be selected via `SSHClient(command=...)`/`TransferManager(command=...)`
+(or the app's `SSH_COMMAND`/`RSYNC_COMMAND`). The "remote" is the
+local file system, i.e., `REMOTE_DESTINATION` has to be a local
+directory. Their behavior is configured with environment variables
+(see `Settings`) which are inherited from the calling process:
+* `FAKE_LATENCY`: delay in seconds for establishing a connection
+  (every ssh-call and every rsync-call with remote destination)
+* `FAKE_UNREACHABLE`: if `1`, connections fail (exit code 255); the
+  same applies while the file `unreachable` exists in the state
+  directory (see `set_reachable`)
+* `FAKE_THROUGHPUT`: transfer rate in bytes per second (rsync's
+  `--bwlimit` is honored as well); `0` means unlimited
+* `FAKE_PROGRESS_CHUNK`: number of bytes between two progress
+  records (`--info=progress2`)
+* `FAKE_FAILURES`: number of rsync-invocations that fail (counted in
+  the state directory, see `reset`)
+* `FAKE_FAILURE_MODE`: `error` (connection is lost, exit code 12) or
+  `timeout` (the transfer stalls until rsync's `--timeout` is
+  exceeded or for `FAKE_STALL` seconds, exit code 30)
+* `FAKE_FAIL_AFTER`: fraction of the total size that is transferred
+  before a failure occurs
+* `FAKE_STATE_DIRECTORY`: directory for shared state
+"""
+
+from typing import Optional
+import os
+from pathlib import Path
+import tempfile
+import fcntl
+
+
+FAKE_SSH = Path(__file__).parent / "ssh"
+FAKE_RSYNC = Path(__file__).parent / "rsync"
+DEFAULT_STATE_DIRECTORY = (
+    Path(tempfile.gettempdir()) / "dcm-transfer-module-fake"
+)
+_VARIABLES = {
+    "latency": "FAKE_LATENCY",
+    "unreachable": "FAKE_UNREACHABLE",
+    "throughput": "FAKE_THROUGHPUT",
+    "progress_chunk": "FAKE_PROGRESS_CHUNK",
+    "failures": "FAKE_FAILURES",
+    "failure_mode": "FAKE_FAILURE_MODE",
+    "fail_after": "FAKE_FAIL_AFTER",
+    "stall": "FAKE_STALL",
+    "state_directory": "FAKE_STATE_DIRECTORY",
+}
+
+
+class Settings:
+    """
+    Settings of the fake executables.
+
+    Keyword arguments:
+    environ -- mapping of environment variables
+               (default None; uses `os.environ`)
+    """
+
+    def __init__(self, environ: Optional[dict[str, str]] = None) -> None:
+        environ = os.environ if environ is None else environ
+        self.latency = float(environ.get("FAKE_LATENCY") or 0)
+        self._unreachable = (
+            int(environ.get("FAKE_UNREACHABLE") or 0)
+        ) == 1
+        self.throughput = float(environ.get("FAKE_THROUGHPUT") or 0)
+        self.progress_chunk = int(
+            environ.get("FAKE_PROGRESS_CHUNK") or 2**20
+        )
+        self.failures = int(environ.get("FAKE_FAILURES") or 0)
+        self.failure_mode = environ.get("FAKE_FAILURE_MODE") or "error"
+        if self.failure_mode not in ("error", "timeout"):
+            raise ValueError(
+                f"Unknown failure mode '{self.failure_mode}'."
+            )
+        self.fail_after = float(environ.get("FAKE_FAIL_AFTER") or 0.5)
+        self.stall = float(environ.get("FAKE_STALL") or 3600)
+        self.state_directory = Path(
+            environ.get("FAKE_STATE_DIRECTORY") or DEFAULT_STATE_DIRECTORY
+        )
+
+    @property
+    def unreachable(self) -> bool:
+        """Returns `True` if connections should fail."""
+        return (
+            self._unreachable
+            or (self.state_directory / "unreachable").exists()
+        )
+
+    def next_invocation(self, name: str) -> int:
+        """
+        Increments and returns the invocation counter `name` (shared by
+        all processes using the same state directory).
+        """
+        self.state_directory.mkdir(parents=True, exist_ok=True)
+        with open(
+            self.state_directory / f"{name}.count", "a+", encoding="utf-8"
+        ) as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            file.seek(0)
+            count = int(file.read() or 0) + 1
+            file.seek(0)
+            file.truncate()
+            file.write(str(count))
+        return count
+
+
+def environment(**kwargs) -> dict[str, str]:
+    """
+    Returns a mapping of environment variables for the given settings
+    (e.g. `environment(latency=0.1, failures=1)`), which can be used
+    to update `os.environ`.
+    """
+    result = {}
+    for key, value in kwargs.items():
+        if key not in _VARIABLES:
+            raise ValueError(f"Unknown setting '{key}'.")
+        if isinstance(value, bool):
+            value = int(value)
+        result[_VARIABLES[key]] = str(value)
+    return result
+
+
+def reset(state_directory: Optional[Path] = None) -> None:
+    """
+    Resets the shared state (invocation counters and reachability).
+
+    Keyword arguments:
+    state_directory -- state directory
+                       (default None; uses `DEFAULT_STATE_DIRECTORY`)
+    """
+    state_directory = state_directory or DEFAULT_STATE_DIRECTORY
+    if not state_directory.is_dir():
+        return
+    for file in state_directory.glob("*.count"):
+        file.unlink()
+    (state_directory / "unreachable").unlink(missing_ok=True)
+
+
+def set_reachable(
+    reachable: bool, state_directory: Optional[Path] = None
+) -> None:
+    """
+    Toggles the reachability of the fake remote at runtime.
+
+    Keyword arguments:
+    reachable -- whether connections should succeed
+    state_directory -- state directory
+                       (default None; uses `DEFAULT_STATE_DIRECTORY`)
+    """
+    state_directory = state_directory or DEFAULT_STATE_DIRECTORY
+    state_directory.mkdir(parents=True, exist_ok=True)
+    if reachable:
+        (state_directory / "unreachable").unlink(missing_ok=True)
+    else:
+        (state_directory / "unreachable").touch()
@@ -0,0 +1,561 @@
+"""
+Fake S3-compatible object storage (MinIO-style stand-in, see
+`benchmarks.fake`).
+
+Implements the subset of the S3 REST-API (path-style addressing) that
+is used by the `S3Transport`: buckets (create, head), objects (put,
+head, get, delete, batch-delete, list v2), and multipart uploads
+(create, upload part, complete, abort). Content-MD5 and SHA256
+checksums (`x-amz-checksum-sha256`) of requests are validated.
+Authentication is not checked.
+
+Objects are stored in `root`. The latency and throughput of requests
+are emulated with the settings of `benchmarks.fake` (`FAKE_LATENCY`,
+`FAKE_THROUGHPUT`). Run as server with, e.g.,
+ python -m benchmarks.fake.s3 --root /tmp/s3 --port 9000 --bucket dcm
+"""
+
+from typing import Optional
+import sys
+import base64
+import hashlib
+import json
+import argparse
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread, Lock
+from urllib.parse import urlsplit, parse_qs, unquote
+from uuid import uuid4
+from time import time, sleep, gmtime, strftime
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from benchmarks.fake import Settings
+
+
+_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class S3Error(Exception):
+    """Error response of the fake storage."""
+
+    def __init__(self, status: int, code: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _md5(data: bytes) -> bytes:
+    return hashlib.md5(data, usedforsecurity=False).digest()
+
+
+def _sha256(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+class FakeS3Storage:
+    """
+    File-based storage of the fake object storage.
+
+    Keyword arguments:
+    root -- directory for data
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = Lock()
+        self.fail_parts = False
+
+    def _bucket(self, bucket: str) -> Path:
+        path = self.root / "buckets" / bucket
+        if not path.is_dir():
+            raise S3Error(
+                404, "NoSuchBucket", "The specified bucket does not exist"
+            )
+        return path
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def create_bucket(self, bucket: str) -> None:
+        """Creates `bucket`."""
+        (self.root / "buckets" / bucket).mkdir(parents=True, exist_ok=True)
+
+    def head_bucket(self, bucket: str) -> None:
+        """Raises `S3Error` if `bucket` does not exist."""
+        self._bucket(bucket)
+
+    def put(
+        self, bucket: str, key: str, data: bytes, checksum: Optional[str]
+    ) -> dict:
+        """Stores object and returns its metadata."""
+        return self._store(
+            bucket, key, data, {
+                "etag": f'"{_md5(data).hex()}"', "checksum": checksum,
+            }
+        )
+
+    def _store(self, bucket: str, key: str, data: bytes, meta: dict) -> dict:
+        path = self._bucket(bucket) / self._name(key)
+        meta.update(key=key, size=len(data), modified=time())
+        with self._lock:
+            path.with_suffix(".data").write_bytes(data)
+            path.with_suffix(".json").write_text(
+                json.dumps(meta), encoding="utf-8"
+            )
+        return meta
+
+    def meta(self, bucket: str, key: str) -> dict:
+        """Returns metadata of an object."""
+        try:
+            return json.loads(
+                (self._bucket(bucket) / f"{self._name(key)}.json").read_text(
+                    encoding="utf-8"
+                )
+            )
+        except FileNotFoundError as exc_info:
+            raise S3Error(
+                404, "NoSuchKey", "The specified key does not exist."
+            ) from exc_info
+
+    def get(self, bucket: str, key: str) -> bytes:
+        """Returns data of an object."""
+        self.meta(bucket, key)
+        return (self._bucket(bucket) / f"{self._name(key)}.data").read_bytes()
+
+    def delete(self, bucket: str, key: str) -> None:
+        """Deletes an object (if it exists)."""
+        path = self._bucket(bucket) / self._name(key)
+        with self._lock:
+            path.with_suffix(".json").unlink(missing_ok=True)
+            path.with_suffix(".data").unlink(missing_ok=True)
+
+    def objects(self, bucket: str, prefix: str = "") -> list[dict]:
+        """Returns the sorted metadata of objects with `prefix`."""
+        objects = []
+        for path in self._bucket(bucket).glob("*.json"):
+            try:
+                meta = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if meta["key"].startswith(prefix):
+                objects.append(meta)
+        return sorted(objects, key=lambda meta: meta["key"])
+
+    def _upload(self, upload_id: str) -> Path:
+        path = self.root / "uploads" / upload_id
+        if not path.is_dir():
+            raise S3Error(
+                404, "NoSuchUpload", "The specified upload does not exist."
+            )
+        return path
+
+    def uploads(self) -> list[str]:
+        """Returns ids of incomplete multipart uploads."""
+        path = self.root / "uploads"
+        return sorted(p.name for p in path.iterdir()) if path.is_dir() else []
+
+    def create_upload(self, bucket: str, key: str) -> str:
+        """Creates multipart upload and returns its id."""
+        self._bucket(bucket)
+        upload_id = str(uuid4())
+        path = self.root / "uploads" / upload_id
+        path.mkdir(parents=True)
+        (path / "upload.json").write_text(
+            json.dumps({"bucket": bucket, "key": key}), encoding="utf-8"
+        )
+        return upload_id
+
+    def put_part(
+        self, upload_id: str, number: int, data: bytes,
+        checksum: Optional[str],
+    ) -> str:
+        """Stores part and returns its ETag."""
+        path = self._upload(upload_id)
+        if self.fail_parts:
+            raise S3Error(500, "InternalError", "Emulated failure.")
+        etag = f'"{_md5(data).hex()}"'
+        (path / f"{number}.data").write_bytes(data)
+        (path / f"{number}.json").write_text(
+            json.dumps({"etag": etag, "checksum": checksum}),
+            encoding="utf-8",
+        )
+        return etag
+
+    def complete_upload(
+        self, upload_id: str, parts: list[tuple[int, str]]
+    ) -> dict:
+        """Assembles object from `parts` and returns its metadata."""
+        path = self._upload(upload_id)
+        upload = json.loads(
+            (path / "upload.json").read_text(encoding="utf-8")
+        )
+        data = []
+        metas = []
+        for number, etag in parts:
+            try:
+                meta = json.loads(
+                    (path / f"{number}.json").read_text(encoding="utf-8")
+                )
+            except FileNotFoundError as exc_info:
+                raise S3Error(
+                    400, "InvalidPart", f"Part {number} not found."
+                ) from exc_info
+            if meta["etag"].strip('"') != etag.strip('"'):
+                raise S3Error(
+                    400, "InvalidPart", f"ETag of part {number} differs."
+                )
+            metas.append(meta)
+            data.append((path / f"{number}.data").read_bytes())
+        checksum = None
+        if all(meta["checksum"] for meta in metas):
+            checksum = _b64(
+                _sha256(
+                    b"".join(
+                        base64.b64decode(meta["checksum"]) for meta in metas
+                    )
+                )
+            ) + f"-{len(metas)}"
+        etag = (
+            f'"{_md5(b"".join(_md5(part) for part in data)).hex()}'
+            + f'-{len(data)}"'
+        )
+        meta = self._store(
+            upload["bucket"], upload["key"], b"".join(data),
+            {"etag": etag, "checksum": checksum},
+        )
+        self.abort_upload(upload_id)
+        return meta
+
+    def abort_upload(self, upload_id: str) -> None:
+        """Discards a multipart upload."""
+        path = self._upload(upload_id)
+        for file in path.iterdir():
+            file.unlink()
+        path.rmdir()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler of `FakeS3Server`."""
+
+    protocol_version = "HTTP/1.1"
+    server: "FakeS3Server"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _respond(
+        self,
+        status: int = 200,
+        body: bytes = b"",
+        headers: Optional[dict] = None,
+        head: bool = False,
+    ) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body and "Content-Type" not in (headers or {}):
+            self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _xml(self, tag: str, content: str) -> bytes:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            + f'<{tag} xmlns="{_NAMESPACE}">{content}</{tag}>'
+        ).encode("utf-8")
+
+    def _body(self) -> bytes:
+        data = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        settings = Settings()
+        if settings.throughput > 0:
+            sleep(len(data) / settings.throughput)
+        if "Content-MD5" in self.headers and self.headers[
+            "Content-MD5"
+        ] != _b64(_md5(data)):
+            raise S3Error(400, "BadDigest", "Content-MD5 does not match.")
+        checksum = self.headers.get("x-amz-checksum-sha256")
+        if checksum is not None and checksum != _b64(_sha256(data)):
+            raise S3Error(
+                400, "BadDigest", "SHA256-checksum does not match."
+            )
+        return data
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = parse_qs(url.query, keep_blank_values=True)
+        bucket, _, key = unquote(url.path).lstrip("/").partition("/")
+        sleep(Settings().latency)
+        try:
+            # read body before responding (persistent connections)
+            body = self._body() if method in ("PUT", "POST") else b""
+            if key:
+                self._object(method, bucket, key, query, body)
+            else:
+                self._bucket(method, bucket, query, body)
+        except S3Error as exc_info:
+            self._respond(
+                exc_info.status,
+                self._xml(
+                    "Error",
+                    f"<Code>{exc_info.code}</Code>"
+                    + f"<Message>{escape(exc_info.message)}</Message>",
+                ),
+                head=method == "HEAD",
+            )
+
+    def _bucket(
+        self, method: str, bucket: str, query: dict, body: bytes
+    ) -> None:
+        storage = self.server.storage
+        if method == "PUT":
+            storage.create_bucket(bucket)
+            self._respond()
+        elif method == "HEAD":
+            storage.head_bucket(bucket)
+            self._respond(head=True)
+        elif method == "GET":
+            self._list(bucket, query)
+        elif method == "POST" and "delete" in query:
+            root = ElementTree.fromstring(body)
+            deleted = []
+            for key in root.iterfind("{*}Object/{*}Key"):
+                storage.delete(bucket, key.text)
+                deleted.append(key.text)
+            quiet = (root.findtext("{*}Quiet") or "").lower() == "true"
+            self._respond(
+                body=self._xml(
+                    "DeleteResult",
+                    "" if quiet else "".join(
+                        f"<Deleted><Key>{escape(key)}</Key></Deleted>"
+                        for key in deleted
+                    ),
+                )
+            )
+        else:
+            raise S3Error(405, "MethodNotAllowed", "Not supported.")
+
+    def _list(self, bucket: str, query: dict) -> None:
+        prefix = query.get("prefix", [""])[0]
+        max_keys = int(query.get("max-keys", ["1000"])[0])
+        after = (
+            query.get("continuation-token")
+            or query.get("start-after")
+            or [""]
+        )[0]
+        objects = [
+            meta
+            for meta in self.server.storage.objects(bucket, prefix)
+            if meta["key"] > after
+        ]
+        page = objects[:max_keys]
+        truncated = len(objects) > max_keys
+        content = (
+            f"<Name>{escape(bucket)}</Name><Prefix>{escape(prefix)}</Prefix>"
+            + f"<KeyCount>{len(page)}</KeyCount><MaxKeys>{max_keys}</MaxKeys>"
+            + f"<IsTruncated>{str(truncated).lower()}</IsTruncated>"
+            + (
+                "<NextContinuationToken>"
+                + f"{escape(page[-1]['key'])}</NextContinuationToken>"
+                if truncated
+                else ""
+            )
+            + "".join(
+                f"<Contents><Key>{escape(meta['key'])}</Key>"
+                + "<LastModified>"
+                + strftime("%Y-%m-%dT%H:%M:%S.000Z", gmtime(meta["modified"]))
+                + "</LastModified>"
+                + f"<ETag>{escape(meta['etag'])}</ETag>"
+                + f"<Size>{meta['size']}</Size>"
+                + "<StorageClass>STANDARD</StorageClass></Contents>"
+                for meta in page
+            )
+        )
+        self._respond(body=self._xml("ListBucketResult", content))
+
+    def _object(
+        self, method: str, bucket: str, key: str, query: dict, body: bytes
+    ) -> None:
+        storage = self.server.storage
+        checksum = self.headers.get("x-amz-checksum-sha256")
+        if method == "PUT" and "uploadId" in query:
+            etag = storage.put_part(
+                query["uploadId"][0], int(query["partNumber"][0]), body,
+                checksum,
+            )
+            self._respond(
+                headers={"ETag": etag}
+                | ({"x-amz-checksum-sha256": checksum} if checksum else {})
+            )
+        elif method == "PUT":
+            meta = storage.put(bucket, key, body, checksum)
+            self._respond(
+                headers={"ETag": meta["etag"]}
+                | ({"x-amz-checksum-sha256": checksum} if checksum else {})
+            )
+        elif method == "POST" and "uploads" in query:
+            upload_id = storage.create_upload(bucket, key)
+            self._respond(
+                body=self._xml(
+                    "InitiateMultipartUploadResult",
+                    f"<Bucket>{escape(bucket)}</Bucket>"
+                    + f"<Key>{escape(key)}</Key>"
+                    + f"<UploadId>{upload_id}</UploadId>",
+                )
+            )
+        elif method == "POST" and "uploadId" in query:
+            root = ElementTree.fromstring(body)
+            meta = storage.complete_upload(
+                query["uploadId"][0],
+                [
+                    (int(part.findtext("{*}PartNumber")),
+                     part.findtext("{*}ETag"))
+                    for part in root.iterfind("{*}Part")
+                ],
+            )
+            self._respond(
+                body=self._xml(
+                    "CompleteMultipartUploadResult",
+                    f"<Bucket>{escape(bucket)}</Bucket>"
+                    + f"<Key>{escape(key)}</Key>"
+                    + f"<ETag>{escape(meta['etag'])}</ETag>"
+                    + (
+                        f"<ChecksumSHA256>{meta['checksum']}</ChecksumSHA256>"
+                        if meta["checksum"]
+                        else ""
+                    ),
+                )
+            )
+        elif method == "DELETE" and "uploadId" in query:
+            storage.abort_upload(query["uploadId"][0])
+            self._respond(204)
+        elif method == "DELETE":
+            storage.delete(bucket, key)
+            self._respond(204)
+        elif method in ("HEAD", "GET"):
+            meta = storage.meta(bucket, key)
+            headers = {
+                "ETag": meta["etag"],
+                "Last-Modified": strftime(
+                    "%a, %d %b %Y %H:%M:%S GMT", gmtime(meta["modified"])
+                ),
+                "Content-Type": "application/octet-stream",
+            }
+            if (
+                meta["checksum"]
+                and self.headers.get("x-amz-checksum-mode") == "ENABLED"
+            ):
+                headers["x-amz-checksum-sha256"] = meta["checksum"]
+            if method == "HEAD":
+                self.send_response(200)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(meta["size"]))
+                self.end_headers()
+            else:
+                self._respond(
+                    body=storage.get(bucket, key), headers=headers
+                )
+        else:
+            raise S3Error(405, "MethodNotAllowed", "Not supported.")
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        """Handle HEAD-request."""
+        self._handle("HEAD")
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET-request."""
+        self._handle("GET")
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        """Handle PUT-request."""
+        self._handle("PUT")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST-request."""
+        self._handle("POST")
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        """Handle DELETE-request."""
+        self._handle("DELETE")
+
+
+class FakeS3Server(ThreadingHTTPServer):
+    """
+    HTTP-server of the fake object storage. Use `start` and `stop` to
+    run it in a background thread.
+
+    Keyword arguments:
+    root -- directory for data
+    address -- server address
+               (default ("127.0.0.1", 0); uses a free port)
+    buckets -- names of buckets that are created initially
+               (default None)
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        root: Path,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        buckets: Optional[list[str]] = None,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.storage = FakeS3Storage(root)
+        for bucket in buckets or []:
+            self.storage.create_bucket(bucket)
+        self._thread: Optional[Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Returns the endpoint URL."""
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self) -> "FakeS3Server":
+        """Serves requests in a background thread."""
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the server."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main(args: list[str]) -> int:
+    """Run fake object storage and return exit code."""
+    parser = argparse.ArgumentParser(
+        description="Fake S3-compatible object storage."
+    )
+    parser.add_argument("--root", type=Path, required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--bucket", action="append", default=[])
+    parsed = parser.parse_args(args)
+    server = FakeS3Server(
+        parsed.root, (parsed.host, parsed.port), parsed.bucket
+    )
+    print(f"Serving fake object storage at {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
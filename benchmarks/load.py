@@ -0,0 +1,475 @@
+"""
+Load test of the 'DCM Transfer Module'-app.
+
+Jobs are submitted to an app (created with `app_factory` in local
+transfer mode or with the stand-in remote from `benchmarks.fake`) with
+a given arrival rate (open loop; Poisson or constant inter-arrival
+times) and a weighted mix of synthetic SIPs (see `benchmarks.sip`).
+All outstanding jobs are polled via the '/report'-endpoint.
+
+For every arrival rate, the following is reported (percentiles p50,
+p90, p99, and max):
+* submission latency (duration of 'POST /transfer'),
+* queue wait (from submission until a worker starts the job),
+* job duration (execution of the job in the worker),
+* turnaround (from submission until the completed report is seen),
+* cost of polling '/report' (latency and response size), and
+* the achieved throughput compared to the offered load.
+
+Queue wait and job duration are taken from the app's trace export
+(see `TRACING_EXPORT_FILE`). A service that is saturated shows a
+growing queue wait (`queue_wait_growth`) and a throughput below the
+arrival rate.
+
+Run from the repository root as
+    python -m benchmarks.load [--rate R ...] [--jobs N]
+        [--mix PROFILE=WEIGHT ...] [--remote fake] [--set KEY=JSON ...]
+"""
+
+from typing import Optional
+import argparse
+import os
+import sys
+import json
+import statistics
+import tempfile
+from pathlib import Path
+from random import Random
+from shutil import copytree, rmtree
+from threading import Thread, Event, Lock
+from time import perf_counter, sleep
+
+from dcm_transfer_module import app_factory
+from benchmarks import fake
+from benchmarks.sip import PROFILES, DATA_KINDS, generate_sip
+from benchmarks.transfer import environment, benchmark_config
+
+
+def percentiles(values: list[float]) -> Optional[dict]:
+    """Returns p50, p90, p99, and max of `values`."""
+    if not values:
+        return None
+    if len(values) == 1:
+        return dict.fromkeys(("p50", "p90", "p99", "max"), values[0])
+    quantiles = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        "p50": quantiles[49],
+        "p90": quantiles[89],
+        "p99": quantiles[98],
+        "max": max(values),
+    }
+
+
+def arrivals(
+    rate: float, jobs: int, process: str, rng: Random
+) -> list[float]:
+    """
+    Returns offsets (in seconds) of `jobs` arrivals for the given
+    `rate` (jobs per second) and arrival `process` ('poisson' or
+    'constant').
+    """
+    offsets = []
+    offset = 0.0
+    for _ in range(jobs):
+        offsets.append(offset)
+        offset += (
+            rng.expovariate(rate) if process == "poisson" else 1 / rate
+        )
+    return offsets
+
+
+def read_trace(path: Path) -> dict[str, dict[str, float]]:
+    """
+    Returns durations (in seconds) of the spans 'queue' and
+    'TransferView.transfer' by job token from the trace export at
+    `path`.
+    """
+    tokens = {}
+    durations: dict[str, dict[str, float]] = {}
+    if not path.is_file():
+        return {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        for resource in json.loads(line)["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                for span in scope["spans"]:
+                    attributes = {
+                        a["key"]: next(iter(a["value"].values()))
+                        for a in span["attributes"]
+                    }
+                    if span["name"] == "POST /transfer":
+                        if "token" in attributes:
+                            tokens[span["traceId"]] = attributes["token"]
+                        continue
+                    if span["name"] not in ("queue", "TransferView.transfer"):
+                        continue
+                    durations.setdefault(span["traceId"], {})[
+                        span["name"]
+                    ] = (
+                        int(span["endTimeUnixNano"])
+                        - int(span["startTimeUnixNano"])
+                    ) / 1e9
+    return {
+        tokens[trace_id]: value
+        for trace_id, value in durations.items()
+        if trace_id in tokens
+    }
+
+
+class Poller:
+    """
+    Polls '/report' for all outstanding jobs in a background thread.
+
+    Keyword arguments:
+    app -- flask app
+    interval -- interval between polling rounds in seconds
+    """
+
+    def __init__(self, app, interval: float) -> None:
+        self.client = app.test_client()
+        self.interval = interval
+        self.outstanding: dict[str, dict] = {}
+        self.latencies: list[float] = []
+        self.sizes: list[int] = []
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+
+    def add(self, token: str, job: dict) -> None:
+        """Add job to be polled."""
+        with self._lock:
+            self.outstanding[token] = job
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                tokens = list(self.outstanding)
+            for token in tokens:
+                time0 = perf_counter()
+                response = self.client.get(f"/report?token={token}")
+                self.latencies.append(perf_counter() - time0)
+                self.sizes.append(len(response.data))
+                job = self.outstanding[token]
+                job["polls"] += 1
+                status = (
+                    (response.json or {}).get("progress", {}).get("status")
+                )
+                if status in ("completed", "aborted"):
+                    job["finished"] = perf_counter()
+                    job["success"] = (
+                        response.json.get("data", {}).get("success", False)
+                    )
+                    with self._lock:
+                        del self.outstanding[token]
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start polling."""
+        self._thread.start()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait until no job is outstanding (or `timeout`) and stop
+        polling; returns `True` if all jobs finished.
+        """
+        time0 = perf_counter()
+        while self.outstanding and perf_counter() - time0 < timeout:
+            sleep(self.interval)
+        self._stop.set()
+        self._thread.join()
+        return not self.outstanding
+
+
+def run_rate(
+    app,
+    workdir: Path,
+    sources: dict[str, Path],
+    mix: dict[str, float],
+    rate: float,
+    jobs: int,
+    process: str,
+    rng: Random,
+    poll_interval: float,
+    timeout: float,
+) -> dict:
+    """Run load test for a single arrival `rate`."""
+    poller = Poller(app, poll_interval)
+    client = app.test_client()
+    records = []
+    offsets = arrivals(rate, jobs, process, rng)
+    profiles = rng.choices(list(mix), weights=list(mix.values()), k=jobs)
+    # prepare SIPs (hard links, unique names -> unique destinations)
+    sips = []
+    for i, profile in enumerate(profiles):
+        sip = workdir / "sips" / f"{profile}-{rate:g}-{i}"
+        copytree(sources[profile], sip, copy_function=os.link)
+        sips.append(sip.relative_to(workdir))
+
+    poller.start()
+    time0 = perf_counter()
+    for offset, profile, sip in zip(offsets, profiles, sips):
+        delay = time0 + offset - perf_counter()
+        if delay > 0:
+            sleep(delay)
+        submitted = perf_counter()
+        response = client.post(
+            "/transfer", json={"transfer": {"target": {"path": str(sip)}}}
+        )
+        job = {
+            "profile": profile,
+            "submitted": submitted,
+            "submission": perf_counter() - submitted,
+            "lag": submitted - time0 - offset,
+            "polls": 0,
+            "finished": None,
+            "success": False,
+        }
+        records.append(job)
+        if response.status_code == 201:
+            job["token"] = response.json["value"]
+            poller.add(job["token"], job)
+        else:
+            job["rejected"] = response.status_code
+    complete = poller.wait(timeout)
+
+    trace = read_trace(workdir / "trace.jsonl")
+    queue_wait = []
+    duration = []
+    for job in records:
+        spans = trace.get(job.get("token"), {})
+        if "queue" in spans:
+            queue_wait.append(spans["queue"])
+        if "TransferView.transfer" in spans:
+            duration.append(spans["TransferView.transfer"])
+    finished = [job for job in records if job["finished"] is not None]
+    third = max(1, len(queue_wait) // 3)
+    makespan = (
+        max(job["finished"] for job in finished) - time0
+        if finished else None
+    )
+    return {
+        "rate": rate,
+        "jobs": jobs,
+        "complete": complete,
+        "succeeded": sum(job["success"] for job in records),
+        "rejected": sum("rejected" in job for job in records),
+        "profiles": {p: profiles.count(p) for p in mix},
+        "throughput": len(finished) / makespan if makespan else None,
+        "submission_lag": percentiles([job["lag"] for job in records]),
+        "submission_seconds": percentiles(
+            [job["submission"] for job in records]
+        ),
+        "queue_wait_seconds": percentiles(queue_wait),
+        "queue_wait_growth": (
+            statistics.median(queue_wait[-third:])
+            - statistics.median(queue_wait[:third])
+            if queue_wait else None
+        ),
+        "job_duration_seconds": percentiles(duration),
+        "turnaround_seconds": percentiles(
+            [job["finished"] - job["submitted"] for job in finished]
+        ),
+        "report_polling": {
+            "requests": len(poller.latencies),
+            "requests_per_job": (
+                len(poller.latencies) / len(records) if records else None
+            ),
+            "latency_seconds": percentiles(poller.latencies),
+            "mean_bytes": (
+                statistics.mean(poller.sizes) if poller.sizes else None
+            ),
+        },
+    }
+
+
+def run(
+    workdir: Path,
+    rates: list[float],
+    jobs: int,
+    mix: dict[str, float],
+    process: str = "poisson",
+    data: str = "incompressible",
+    scale: float = 0.1,
+    remote: str = "local",
+    fake_settings: Optional[dict] = None,
+    config_overrides: Optional[dict] = None,
+    poll_interval: float = 0.1,
+    timeout: float = 3600,
+    seed: int = 0,
+) -> dict:
+    """Run load test in `workdir` and return results."""
+    settings = {
+        "rates": rates,
+        "jobs": jobs,
+        "mix": mix,
+        "process": process,
+        "data": data,
+        "scale": scale,
+        "remote": remote,
+        "poll_interval": poll_interval,
+        "seed": seed,
+        "config": config_overrides or {},
+    }
+    overrides = {"TRACING_EXPORT_FILE": workdir / "trace.jsonl"}
+    if remote == "fake":
+        os.environ.update(
+            fake.environment(
+                state_directory=workdir / "fake", **(fake_settings or {})
+            )
+        )
+        fake.reset(workdir / "fake")
+        settings["fake"] = fake_settings or {}
+        overrides.update(
+            LOCAL_TRANSFER=False,
+            SSH_COMMAND=str(fake.FAKE_SSH),
+            RSYNC_COMMAND=str(fake.FAKE_RSYNC),
+            SSH_IDENTITY_FILE=workdir / "id_fake",
+        )
+    overrides.update(config_overrides or {})
+    config = benchmark_config(workdir, **overrides)
+    config.REMOTE_DESTINATION.mkdir(parents=True, exist_ok=True)
+
+    sources = {}
+    for profile in mix:
+        sources[profile] = workdir / "sources" / profile
+        rmtree(sources[profile], ignore_errors=True)
+        generate_sip(sources[profile], profile, data, scale, seed)
+
+    rng = Random(seed)
+    results = {
+        "benchmark": "load",
+        "environment": environment(),
+        "settings": settings,
+        "results": [],
+    }
+    app = app_factory(config(), block=True)
+    try:
+        for rate in rates:
+            results["results"].append(
+                run_rate(
+                    app, workdir, sources, mix, rate, jobs, process, rng,
+                    poll_interval, timeout,
+                )
+            )
+            rmtree(workdir / "sips", ignore_errors=True)
+            rmtree(config.REMOTE_DESTINATION, ignore_errors=True)
+            config.REMOTE_DESTINATION.mkdir(parents=True, exist_ok=True)
+    finally:
+        app.extensions["orchestra"].stop(stop_on_idle=True)
+    return results
+
+
+def _key_value(value: str, convert=json.loads) -> tuple[str, object]:
+    key, sep, value = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got '{key}'.")
+    try:
+        return key, convert(value)
+    except ValueError as exc_info:
+        raise argparse.ArgumentTypeError(str(exc_info)) from exc_info
+
+
+def _mix(value: str) -> tuple[str, float]:
+    key, weight = _key_value(value, float)
+    if key not in PROFILES:
+        raise argparse.ArgumentTypeError(f"Unknown profile '{key}'.")
+    return key, weight
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    """Run load test and print results."""
+    args_parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    args_parser.add_argument(
+        "--rate", type=float, action="append",
+        help="arrival rate in jobs per second (can be repeated; default: 1)"
+    )
+    args_parser.add_argument(
+        "--arrival", choices=("poisson", "constant"), default="poisson",
+        help="arrival process"
+    )
+    args_parser.add_argument(
+        "--jobs", type=int, default=20, help="number of jobs per rate"
+    )
+    args_parser.add_argument(
+        "--mix", type=_mix, action="append",
+        help="SIP profile and weight as PROFILE=WEIGHT (can be repeated; "
+        + "default: tiny-files=1)"
+    )
+    args_parser.add_argument(
+        "--data", choices=DATA_KINDS, default="incompressible",
+        help="kind of file contents"
+    )
+    args_parser.add_argument(
+        "--scale", type=float, default=0.1,
+        help="factor applied to the number of files per SIP"
+    )
+    args_parser.add_argument(
+        "--remote", choices=("local", "fake"), default="local",
+        help="local transfer or stand-in remote (benchmarks.fake)"
+    )
+    args_parser.add_argument(
+        "--fake", type=_key_value, action="append", default=[],
+        help="setting of the stand-in remote as KEY=JSON (e.g. "
+        + "latency=0.05, throughput=1e8; see benchmarks.fake)"
+    )
+    args_parser.add_argument(
+        "--set", type=_key_value, action="append", default=[],
+        help="app-config attribute as KEY=JSON (can be repeated)"
+    )
+    args_parser.add_argument(
+        "--poll-interval", type=float, default=0.1,
+        help="interval between '/report'-polling rounds in seconds"
+    )
+    args_parser.add_argument(
+        "--timeout", type=float, default=3600,
+        help="maximum duration in seconds to wait for jobs per rate"
+    )
+    args_parser.add_argument(
+        "--seed", type=int, default=0,
+        help="seed for arrivals, SIP mix, and SIP contents"
+    )
+    args_parser.add_argument(
+        "--workdir", type=Path,
+        help="working directory (default: temporary directory)"
+    )
+    args_parser.add_argument(
+        "--output", type=Path, help="write results to this file"
+    )
+    args = args_parser.parse_args(argv)
+
+    workdir = (
+        args.workdir
+        or Path(tempfile.mkdtemp(prefix="dcm-transfer-load-"))
+    ).resolve()
+    try:
+        results = run(
+            workdir,
+            args.rate or [1.0],
+            args.jobs,
+            dict(args.mix or [("tiny-files", 1.0)]),
+            args.arrival,
+            args.data,
+            args.scale,
+            args.remote,
+            dict(args.fake),
+            dict(args.set),
+            args.poll_interval,
+            args.timeout,
+            args.seed,
+        )
+    finally:
+        if args.workdir is None:
+            rmtree(workdir, ignore_errors=True)
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(results, indent=2), encoding="utf-8"
+        )
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return results
+
+
+if __name__ == "__main__":
+    main()
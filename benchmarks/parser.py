@@ -0,0 +1,118 @@
+"""
+Micro-benchmark for the progress parsing of the 'DCM Transfer
+Module'-app.
+
+A recorded `rsync --info=progress2`-stream is replayed through a pipe
+(in chunks as written by rsync) and parsed with both the line-based
+`RsyncParser.consume` and the chunked `RsyncParser.consume_fd`. The
+CPU time of the parsing thread is reported as JSON.
+
+Run from the repository root as
+    python -m benchmarks.parser [--repeat N] [--chunk-size BYTES]
+"""
+
+from typing import Callable
+import argparse
+import os
+import io
+import sys
+import json
+from pathlib import Path
+from threading import Thread
+from time import perf_counter, thread_time
+
+from dcm_common.orchestra.models import Progress
+
+from dcm_transfer_module.components import RsyncParser
+
+
+RECORDING = Path(__file__).parent / "data" / "rsync_progress2.txt"
+
+
+def replay(data: bytes, repeat: int, chunk_size: int) -> tuple[int, Thread]:
+    """
+    Returns the reading end of a pipe and the (started) `Thread` which
+    writes `data` `repeat` times into the pipe in chunks of
+    `chunk_size` bytes.
+    """
+    read_fd, write_fd = os.pipe()
+
+    def _write():
+        with io.open(write_fd, "wb", buffering=0) as pipe:
+            for _ in range(repeat):
+                for i in range(0, len(data), chunk_size):
+                    pipe.write(data[i:i + chunk_size])
+
+    t = Thread(target=_write, daemon=True)
+    t.start()
+    return read_fd, t
+
+
+def measure(
+    consume: Callable[[int, Progress, Callable], None],
+    data: bytes,
+    repeat: int,
+    chunk_size: int,
+) -> dict:
+    """Run a single benchmark and return results as dictionary."""
+    progress = Progress()
+    pushes = []
+    read_fd, writer = replay(data, repeat, chunk_size)
+    wall0, cpu0 = perf_counter(), thread_time()
+    consume(read_fd, progress, lambda: pushes.append(progress.numeric))
+    cpu, wall = thread_time() - cpu0, perf_counter() - wall0
+    writer.join()
+    return {
+        "cpu_seconds": cpu,
+        "wall_seconds": wall,
+        "cpu_seconds_per_mb": cpu / (len(data) * repeat / 2**20),
+        "pushes": len(pushes),
+        "final": progress.numeric,
+    }
+
+
+def main(argv=None) -> dict:
+    """Run benchmark and print results."""
+    args_parser = argparse.ArgumentParser(description=__doc__)
+    args_parser.add_argument(
+        "--repeat", type=int, default=50,
+        help="number of times the recording is replayed"
+    )
+    args_parser.add_argument(
+        "--chunk-size", type=int, default=4096,
+        help="size of chunks written into the pipe"
+    )
+    args_parser.add_argument(
+        "--recording", type=Path, default=RECORDING,
+        help="path to the recorded progress stream"
+    )
+    args = args_parser.parse_args(argv)
+
+    data = args.recording.read_bytes()
+    parser = RsyncParser()
+
+    def line_based(fd, progress, push):
+        with io.open(fd, "r", encoding="utf-8") as pipe:
+            parser.consume(pipe, progress, push)
+
+    def chunked(fd, progress, push):
+        try:
+            parser.consume_fd(fd, progress, push)
+        finally:
+            os.close(fd)
+
+    results = {
+        "benchmark": "parser",
+        "records": (data.count(b"\r") + data.count(b"\n")) * args.repeat,
+        "bytes": len(data) * args.repeat,
+        "chunk_size": args.chunk_size,
+        "line_based": measure(line_based, data, args.repeat, args.chunk_size),
+        "chunked": measure(chunked, data, args.repeat, args.chunk_size),
+    }
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return results
+
+
+if __name__ == "__main__":
+    main()
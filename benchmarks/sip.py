@@ -0,0 +1,134 @@
+"""
+Synthetic SIP generator for the benchmarks of the 'DCM Transfer
+Module'-app.
+
+SIPs are generated deterministically (for a given profile, data kind,
+scale, and seed) such that benchmark results of different releases
+can be compared.
+
+Run from the repository root as
+    python -m benchmarks.sip PROFILE DIRECTORY [--data KIND] [--scale X]
+"""
+
+from typing import Optional
+import argparse
+import sys
+import json
+from pathlib import Path
+from random import Random
+
+
+# every profile is a list of (number of files, file size in bytes,
+# directory depth)
+PROFILES = {
+    "tiny-files": [(2000, 1024, 1)],
+    "huge-files": [(2, 64 * 2**20, 0)],
+    "mixed": [(500, 4 * 1024, 1), (20, 2**20, 1), (2, 16 * 2**20, 0)],
+    "deep-tree": [(500, 16 * 1024, 16)],
+}
+DATA_KINDS = ("compressible", "incompressible")
+_TEXT = (
+    b"Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do "
+    + b"eiusmod tempor incididunt ut labore et dolore magna aliqua.\n"
+)
+
+
+def _content(rng: Random, size: int, data: str) -> bytes:
+    """Returns `size` bytes of content of the given kind."""
+    if data == "incompressible":
+        return rng.randbytes(size)
+    offset = rng.randrange(len(_TEXT))
+    repeated = _TEXT * (size // len(_TEXT) + 2)
+    return repeated[offset:offset + size]
+
+
+def generate_sip(
+    path: Path,
+    profile: str,
+    data: str = "incompressible",
+    scale: float = 1.0,
+    seed: int = 0,
+) -> dict:
+    """
+    Generates a SIP at `path` (which must not exist) and returns a
+    summary (number of files and directories, total size in bytes).
+
+    Keyword arguments:
+    path -- output directory
+    profile -- name of the profile (see `PROFILES`)
+    data -- kind of file contents (see `DATA_KINDS`)
+            (default 'incompressible')
+    scale -- factor applied to the number of files (at least one file
+             per group is generated)
+             (default 1.0)
+    seed -- seed for the random number generator
+            (default 0)
+    """
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown profile '{profile}' (expected one of {list(PROFILES)})."
+        )
+    if data not in DATA_KINDS:
+        raise ValueError(
+            f"Unknown data kind '{data}' (expected one of {DATA_KINDS})."
+        )
+    rng = Random(f"{profile}-{data}-{seed}")
+    path.mkdir(parents=True)
+    files = 0
+    directories = set()
+    size_total = 0
+    for group, (count, size, depth) in enumerate(PROFILES[profile]):
+        for i in range(max(1, round(count * scale))):
+            directory = path.joinpath(
+                *(
+                    f"g{group}d{level}_{rng.randrange(2)}"
+                    for level in range(depth)
+                )
+            )
+            if directory not in directories:
+                directory.mkdir(parents=True, exist_ok=True)
+                directories.add(directory)
+            (directory / f"file_{group}_{i}.bin").write_bytes(
+                _content(rng, size, data)
+            )
+            files += 1
+            size_total += size
+    return {
+        "profile": profile,
+        "data": data,
+        "scale": scale,
+        "seed": seed,
+        "files": files,
+        "directories": len(directories - {path}),
+        "bytes": size_total,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    """Generate SIP and print summary."""
+    args_parser = argparse.ArgumentParser(description=__doc__)
+    args_parser.add_argument("profile", choices=list(PROFILES))
+    args_parser.add_argument("directory", type=Path)
+    args_parser.add_argument(
+        "--data", choices=DATA_KINDS, default="incompressible",
+        help="kind of file contents"
+    )
+    args_parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="factor applied to the number of files"
+    )
+    args_parser.add_argument(
+        "--seed", type=int, default=0,
+        help="seed for the random number generator"
+    )
+    args = args_parser.parse_args(argv)
+    summary = generate_sip(
+        args.directory, args.profile, args.data, args.scale, args.seed
+    )
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Transfer benchmark of the 'DCM Transfer Module'-app.
+
+For every combination of SIP profile and data kind (see
+`benchmarks.sip`), a synthetic SIP is generated and transferred in
+local mode
+* directly with `TransferManager.transfer` (including progress
+  parsing via `ProgressChannel`) and
+* as full job via the app's `/transfer`-endpoint (from submission
+  until the report is completed).
+
+Results (median over repetitions) are reported as JSON. If a baseline
+(output of a previous run, e.g. of another release) is given, the
+relative throughput compared to that baseline is included.
+
+Run from the repository root as
+    python -m benchmarks.transfer [--profile NAME ...] [--data KIND ...]
+        [--scale X] [--repeat N] [--output PATH] [--baseline PATH]
+"""
+
+from typing import Optional, Callable
+import argparse
+import os
+import sys
+import json
+import platform
+import resource
+import subprocess
+import statistics
+import tempfile
+from pathlib import Path
+from shutil import rmtree
+from time import perf_counter, sleep
+
+from dcm_common import LoggingContext as Context
+from dcm_common.orchestra.models import Progress
+
+from dcm_transfer_module import app_factory
+from dcm_transfer_module.config import AppConfig
+from dcm_transfer_module.components import (
+    RsyncParser,
+    ProgressChannel,
+    TransferManager,
+)
+from benchmarks.sip import PROFILES, DATA_KINDS, generate_sip
+
+
+def environment() -> dict:
+    """Returns information on the benchmark environment."""
+    try:
+        rsync = subprocess.run(
+            ["rsync", "--version"], capture_output=True, text=True,
+            check=True
+        ).stdout.split("\n")[0]
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        rsync = "?"
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "rsync": rsync,
+    }
+
+
+def benchmark_config(workdir: Path, **kwargs) -> type[AppConfig]:
+    """
+    Returns an app-config for local transfer within `workdir`; `kwargs`
+    are set as additional class attributes.
+    """
+    class BenchmarkConfig(AppConfig):
+        FS_MOUNT_POINT = workdir
+        LOCAL_TRANSFER = True
+        REMOTE_DESTINATION = workdir / "remote"
+        TRANSFER_RETRIES = 0
+        ORCHESTRA_DAEMON_INTERVAL = 0.01
+        ORCHESTRA_WORKER_INTERVAL = 0.01
+        ORCHESTRA_WORKER_ARGS = {"messages_interval": 0.01}
+
+    for key, value in kwargs.items():
+        setattr(BenchmarkConfig, key, value)
+    return BenchmarkConfig
+
+
+def wait_for_report(
+    client, token: str, interval: float = 0.01, timeout: float = 3600
+) -> tuple[dict, int]:
+    """
+    Polls the '/report'-endpoint until the job `token` has finished and
+    returns the report and the number of requests.
+    """
+    polls = 0
+    time0 = perf_counter()
+    while perf_counter() - time0 < timeout:
+        polls += 1
+        report = client.get(f"/report?token={token}").json
+        if report.get("progress", {}).get("status") in (
+            "completed", "aborted"
+        ):
+            return report, polls
+        sleep(interval)
+    raise TimeoutError(f"Job '{token}' did not finish within {timeout}s.")
+
+
+def _children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def measure_transfer_manager(sip: Path, destination: Path) -> dict:
+    """Transfer `sip` with `TransferManager` and return measurements."""
+    manager = TransferManager()
+    progress = Progress()
+    cpu0 = _children_cpu()
+    time0 = perf_counter()
+    with ProgressChannel(progress, parser=RsyncParser()) as progress_file:
+        log = manager.transfer(
+            src=sip, dst=destination, progress_file=progress_file,
+            mirror=True,
+        )
+    wall = perf_counter() - time0
+    return {
+        "success": Context.ERROR not in log,
+        "wall_seconds": wall,
+        "rsync_cpu_seconds": _children_cpu() - cpu0,
+        "final_progress": progress.numeric,
+    }
+
+
+def measure_job(app, sip: Path) -> dict:
+    """Submit job for `sip` to `app` and return measurements."""
+    client = app.test_client()
+    time0 = perf_counter()
+    response = client.post(
+        "/transfer", json={"transfer": {"target": {"path": str(sip)}}}
+    )
+    submission = perf_counter() - time0
+    if response.status_code != 201:
+        raise RuntimeError(f"Submission failed: {response.text}")
+    report, polls = wait_for_report(client, response.json["value"])
+    wall = perf_counter() - time0
+    phases = {}
+    for phase in report["data"].get("phases", []):
+        phases[phase["name"]] = (
+            phases.get(phase["name"], 0) + phase["duration"]
+        )
+    return {
+        "success": report["data"].get("success", False),
+        "wall_seconds": wall,
+        "submission_seconds": submission,
+        "report_polls": polls,
+        "phases": phases,
+    }
+
+
+def _median(runs: list[dict], size: int, files: int) -> dict:
+    """Aggregate `runs` (median) and add throughput."""
+    result = {
+        "success": all(run["success"] for run in runs),
+        "runs": len(runs),
+    }
+    for key in runs[0]:
+        if isinstance(runs[0][key], (int, float)) and key != "success":
+            result[key] = statistics.median(run[key] for run in runs)
+    if "phases" in runs[0]:
+        result["phases"] = {
+            name: statistics.median(
+                run["phases"].get(name, 0) for run in runs
+            )
+            for name in runs[0]["phases"]
+        }
+    wall = result["wall_seconds"]
+    result["bytes_per_second"] = size / wall if wall > 0 else None
+    result["files_per_second"] = files / wall if wall > 0 else None
+    return result
+
+
+def _repeat(
+    measure: Callable[[int], dict], repeat: int, size: int, files: int
+) -> dict:
+    return _median([measure(i) for i in range(repeat)], size, files)
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """
+    Adds the relative throughput (current/baseline) for every result in
+    `results` that has a counterpart in `baseline`.
+    """
+    previous = {
+        (result["sip"]["profile"], result["sip"]["data"]): result
+        for result in baseline.get("results", [])
+    }
+    for result in results["results"]:
+        key = (result["sip"]["profile"], result["sip"]["data"])
+        if key not in previous:
+            continue
+        result["relative_throughput"] = {
+            name: (
+                result[name]["bytes_per_second"]
+                / previous[key][name]["bytes_per_second"]
+            )
+            for name in ("transfer_manager", "job")
+            if result.get(name, {}).get("bytes_per_second")
+            and previous[key].get(name, {}).get("bytes_per_second")
+        }
+
+
+def run(
+    workdir: Path,
+    profiles: list[str],
+    data_kinds: list[str],
+    scale: float = 1.0,
+    repeat: int = 3,
+    job: bool = True,
+) -> dict:
+    """Run benchmarks in `workdir` and return results."""
+    results = {
+        "benchmark": "transfer",
+        "environment": environment(),
+        "settings": {"scale": scale, "repeat": repeat},
+        "results": [],
+    }
+    config = benchmark_config(workdir)
+    app = app_factory(config(), block=True) if job else None
+    try:
+        for profile in profiles:
+            for data in data_kinds:
+                name = f"{profile}-{data}"
+                sip = workdir / "sips" / name
+                rmtree(sip, ignore_errors=True)
+                summary = generate_sip(sip, profile, data, scale)
+                result = {"sip": summary}
+
+                def _measure_manager(i):
+                    destination = workdir / "manager" / f"{name}-{i}"
+                    try:
+                        return measure_transfer_manager(sip, destination)
+                    finally:
+                        rmtree(destination, ignore_errors=True)
+
+                result["transfer_manager"] = _repeat(
+                    _measure_manager,
+                    repeat,
+                    summary["bytes"],
+                    summary["files"],
+                )
+                if app is not None:
+
+                    def _measure_job(_):
+                        try:
+                            return measure_job(app, sip.relative_to(workdir))
+                        finally:
+                            rmtree(
+                                config.REMOTE_DESTINATION / sip.name,
+                                ignore_errors=True,
+                            )
+
+                    result["job"] = _repeat(
+                        _measure_job,
+                        repeat,
+                        summary["bytes"],
+                        summary["files"],
+                    )
+                rmtree(sip)
+                results["results"].append(result)
+    finally:
+        if app is not None:
+            app.extensions["orchestra"].stop(stop_on_idle=True)
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    """Run benchmarks and print results."""
+    args_parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    args_parser.add_argument(
+        "--profile", choices=list(PROFILES), action="append",
+        help="SIP profile (can be repeated; default: all)"
+    )
+    args_parser.add_argument(
+        "--data", choices=DATA_KINDS, action="append",
+        help="kind of file contents (can be repeated; default: all)"
+    )
+    args_parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="factor applied to the number of files per SIP"
+    )
+    args_parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="number of repetitions per benchmark"
+    )
+    args_parser.add_argument(
+        "--no-job", action="store_true",
+        help="skip full-job benchmarks"
+    )
+    args_parser.add_argument(
+        "--workdir", type=Path,
+        help="working directory (default: temporary directory)"
+    )
+    args_parser.add_argument(
+        "--output", type=Path, help="write results to this file"
+    )
+    args_parser.add_argument(
+        "--baseline", type=Path,
+        help="results of a previous run to compare against"
+    )
+    args = args_parser.parse_args(argv)
+
+    workdir = (
+        args.workdir
+        or Path(tempfile.mkdtemp(prefix="dcm-transfer-benchmark-"))
+    ).resolve()
+    try:
+        results = run(
+            workdir,
+            args.profile or list(PROFILES),
+            args.data or list(DATA_KINDS),
+            args.scale,
+            args.repeat,
+            not args.no_job,
+        )
+    finally:
+        if args.workdir is None:
+            rmtree(workdir, ignore_errors=True)
+    if args.baseline is not None:
+        compare(
+            results, json.loads(args.baseline.read_text(encoding="utf-8"))
+        )
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(results, indent=2), encoding="utf-8"
+        )
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ from dcm_common.services import DefaultView, ReportView
 from dcm_common.services import extensions
 
 from dcm_transfer_module.config import AppConfig
-from dcm_transfer_module.views import TransferView
+from dcm_transfer_module.views import TransferView, MetricsView
 
 
 def app_factory(
@@ -53,6 +53,11 @@ def app_factory(
         return (
             not config.ORCHESTRA_AT_STARTUP
             or app.extensions["orchestra"].ready.is_set()
+        ) and (
+            # circuit breaker for remote
+            view.health is None
+            or not config.REMOTE_HEALTH_READINESS
+            or not view.health.is_open()
         )
 
     # block until ready
@@ -67,5 +72,9 @@ def app_factory(
     )
     app.register_blueprint(view.get_blueprint(), url_prefix="/")
     app.register_blueprint(ReportView(config).get_blueprint(), url_prefix="/")
+    if config.EXPOSE_METRICS:
+        app.register_blueprint(
+            MetricsView(config).get_blueprint(), url_prefix="/"
+        )
 
     return app
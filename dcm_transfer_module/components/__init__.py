@@ -1,7 +1,35 @@
-from .parser import RsyncParser
-from .transfer import SSHClient, TransferManager
+from .parser import (
+    RsyncProgress,
+    PushThrottle,
+    ProgressRecordReader,
+    RsyncParser,
+    RsyncStats,
+    ProgressWriter,
+    ProgressChannel,
+)
+from .timeline import FileTimeline
+from .transfer import OutputCapture, SSHClient, TransferManager
+from .semaphore import RemoteSemaphore, SemaphoreSlot
+from .phases import PhaseTimer
+from .metrics import Metric, MetricsStore
+from .tracing import Span, Tracer
+from .health import RemoteHealthMonitor
+from .space import directory_size, SpaceReservation, SpaceLedger
+from .transport import (
+    Transport, RsyncTransport, register_transport, get_transport
+)
+from .daemon import RsyncDaemonManager, RsyncDaemonTransport
+from .fanout import extract_stream, ArchiveDigests, FanOut
+from .s3 import S3Transport
 
 __all__ = [
-    "RsyncParser",
-    "SSHClient", "TransferManager",
+    "RsyncProgress", "PushThrottle", "ProgressRecordReader", "RsyncParser",
+    "RsyncStats", "ProgressWriter", "ProgressChannel", "FileTimeline",
+    "OutputCapture", "SSHClient", "TransferManager",
+    "RemoteSemaphore", "SemaphoreSlot", "PhaseTimer",
+    "Metric", "MetricsStore", "Span", "Tracer", "RemoteHealthMonitor",
+    "directory_size", "SpaceReservation", "SpaceLedger", "Transport",
+    "RsyncTransport", "register_transport", "get_transport",
+    "RsyncDaemonManager", "RsyncDaemonTransport", "extract_stream",
+    "ArchiveDigests", "FanOut", "S3Transport",
 ]
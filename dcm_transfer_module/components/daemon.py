@@ -0,0 +1,256 @@
+"""
+This module defines the `RsyncDaemonManager` component and the
+`RsyncDaemonTransport`-backend of the Transfer Module-app.
+
+Transfers are made to a module of an rsync daemon (`rsync://`-URL)
+instead of over ssh. This avoids the overhead of a remote shell and
+encryption (e.g. in trusted networks) and does not require shell
+access to the remote. Paths in the remote (like `REMOTE_DESTINATION`)
+are interpreted relative to the root of the daemon module.
+"""
+
+from typing import Optional, BinaryIO
+import re
+import subprocess
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from dcm_common import Logger
+
+from dcm_transfer_module.components.transfer import TransferManager
+from dcm_transfer_module.components.transport import (
+    RsyncTransport, register_transport
+)
+from dcm_transfer_module.components.tracing import Tracer
+
+
+def _escape_pattern(name: str, wildcards: bool = False) -> str:
+    """
+    Returns `name` escaped for use in an rsync filter pattern. rsync
+    only interprets backslashes in patterns that contain wildcards
+    (`*`, `?`, `[`), i.e., other names are left as they are.
+
+    Keyword arguments:
+    name -- file name
+    wildcards -- whether the pattern contains wildcards apart from
+                 `name`
+                 (default False)
+    """
+    if not wildcards and not re.search(r"[*?\[]", name):
+        return name
+    return re.sub(r"([\\*?\[])", r"\\\1", name)
+
+
+class RsyncDaemonManager(TransferManager):
+    """
+    A `RsyncDaemonManager` performs transfers and all other operations
+    on the remote with the rsync client in daemon mode (no remote shell
+    is used).
+
+    Keyword arguments:
+    url -- URL of the daemon module
+           (format 'rsync://[user@]host[:port]/module')
+    password_file -- file containing the password of the daemon user
+                     (default None; no authentication or
+                     `RSYNC_PASSWORD` from the environment)
+    connect_timeout -- timeout in seconds for connecting to the daemon
+                       (default 30)
+    kwargs -- see `TransferManager` (except for `ssh_client`)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        password_file: Optional[Path] = None,
+        connect_timeout: int = 30,
+        **kwargs,
+    ) -> None:
+        super().__init__(None, **kwargs)
+        self.url = url.rstrip("/")
+        self.password_file = password_file
+        self.connect_timeout = connect_timeout
+
+    @property
+    def connection(self) -> list[str]:
+        return (
+            [f"--contimeout={self.connect_timeout}"]
+            + (
+                [f"--password-file={self.password_file}"]
+                if self.password_file is not None
+                else []
+            )
+        )
+
+    def destination(self, dst: Path) -> str:
+        return f"{self.url}/{str(dst).lstrip('/')}"
+
+    def _run(self, args: list[str]) -> subprocess.CompletedProcess:
+        """Runs the rsync client with `args` and returns the result."""
+        with self.tracer.span(
+            "RsyncDaemonManager.query", {"rsync.daemon": self.url}
+        ) as span:
+            result = subprocess.run(
+                [self.command] + self.connection + args,
+                capture_output=True,
+                check=False,
+                text=True,
+                errors="replace",
+            )
+            if span is not None:
+                span.set_attribute("process.exit_code", result.returncode)
+        return result
+
+    def list_only(self, dst: Path) -> subprocess.CompletedProcess:
+        """
+        Returns the result of listing `dst` in the daemon module
+        (`--list-only`; the module root if `dst` is '/').
+        """
+        destination = self.destination(dst)
+        return self._run(
+            ["--list-only", destination + ("/" if str(dst) == "/" else "")]
+        )
+
+    def _entry_type(self, dst: Path) -> Optional[str]:
+        """
+        Returns the type-character of `dst` in the listing ('d' for
+        directories, '-' for regular files) or `None` if not listed.
+        """
+        result = self.list_only(dst)
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        return result.stdout.strip().splitlines()[0][0]
+
+    def file_exists(self, dst: Path) -> bool:
+        return self._entry_type(dst) == "-"
+
+    def dir_exists(self, dst: Path) -> bool:
+        return self._entry_type(dst) == "d"
+
+    def free_space(self, dst: Path) -> Optional[int]:
+        # not exposed by the rsync daemon protocol
+        return None
+
+    def receive(self, stream: BinaryIO, dst: Path, **kwargs) -> Logger:
+        """
+        Not supported: the daemon cannot extract archives (and staging
+        every replica locally is avoided).
+        """
+        # pylint: disable=unused-argument
+        raise NotImplementedError(
+            "The rsync daemon does not support receiving archives."
+        )
+
+    def mkdir(self, target: Path) -> tuple[int, str, str]:
+        """
+        Creates the directory `target` (including parents) in the
+        daemon module by transferring an empty directory tree.
+
+        Returns a tuple of resulting exit code, stdout, and stderr.
+        """
+        with TemporaryDirectory() as tmp:
+            relative = str(target).strip("/")
+            if relative:
+                (Path(tmp) / relative).mkdir(parents=True)
+            result = self._run(["-r", f"{tmp}/", f"{self.url}/"])
+        return result.returncode, result.stdout, result.stderr
+
+    def rm(self, target: Path) -> tuple[int, str, str]:
+        """
+        Attempts to delete `target` in the daemon module. Since the
+        daemon does not offer commands for deletion, an empty directory
+        is mirrored onto the parent of `target` with filters that only
+        select `target`.
+
+        Returns a tuple of resulting exit code, stdout, and stderr.
+
+        Keyword arguments:
+        target -- path to target dir or file
+        """
+        with TemporaryDirectory() as tmp:
+            result = self._run(
+                [
+                    "-r",
+                    "--delete",
+                    f"--include=/{_escape_pattern(target.name)}",
+                    f"--include=/{_escape_pattern(target.name, True)}/***",
+                    "--exclude=*",
+                    f"{tmp}/",
+                    self.destination(target.parent).rstrip("/") + "/",
+                ]
+            )
+        return result.returncode, result.stdout, result.stderr
+
+
+class RsyncDaemonTransport(RsyncTransport):
+    """
+    Transport backend for transfers to an rsync daemon (see
+    `RsyncDaemonManager`).
+
+    Keyword arguments:
+    daemon_manager -- `RsyncDaemonManager` performing the transfers
+    key -- identifier of the remote
+           (default None; uses the URL of the daemon module)
+    """
+
+    def __init__(
+        self, daemon_manager: RsyncDaemonManager, key: Optional[str] = None
+    ) -> None:
+        super().__init__(daemon_manager, key=key or daemon_manager.url)
+        self.daemon_manager = daemon_manager
+
+    @classmethod
+    def from_config(
+        cls, config, tracer: Optional[Tracer] = None
+    ) -> "RsyncDaemonTransport":
+        """
+        Returns an `RsyncDaemonTransport` that is configured according
+        to `config` (see `AppConfig`).
+        """
+        return cls(
+            RsyncDaemonManager(
+                "rsync://"
+                + (
+                    f"{config.RSYNC_DAEMON_USER}@"
+                    if config.RSYNC_DAEMON_USER
+                    else ""
+                )
+                + f"{config.RSYNC_DAEMON_HOST}:{config.RSYNC_DAEMON_PORT}/"
+                + config.RSYNC_DAEMON_MODULE,
+                password_file=(
+                    config.RSYNC_DAEMON_PASSWORD_FILE.resolve()
+                    if config.RSYNC_DAEMON_PASSWORD_FILE is not None
+                    else None
+                ),
+                default_options=(
+                    config.TRANSFER_DEFAULT_OPTIONS + config.TRANSFER_OPTIONS
+                ),
+                max_stderr_lines=config.TRANSFER_STDERR_BUFFER,
+                tracer=tracer,
+                command=config.RSYNC_COMMAND,
+                terminate_timeout=config.TRANSFER_TERMINATE_TIMEOUT,
+            ),
+        )
+
+    @property
+    def remote(self) -> bool:
+        return True
+
+    @property
+    def description(self) -> str:
+        return self.daemon_manager.url
+
+    @property
+    def streaming(self) -> bool:
+        return False
+
+    def preflight(self, destination: Path) -> tuple[bool, str]:
+        query = self.daemon_manager.list_only(Path("/"))
+        if query.returncode != 0:
+            return False, query.stderr
+        if self.daemon_manager.dir_exists(destination):
+            return True, ""
+        returncode, _, stderr = self.daemon_manager.mkdir(destination)
+        return returncode == 0, stderr
+
+
+register_transport("rsync-daemon", RsyncDaemonTransport.from_config)
@@ -0,0 +1,416 @@
+"""
+This module defines the `FanOut` component of the Transfer Module-app.
+
+It reads a source directory once and streams its contents as a
+tar-archive to multiple receivers (e.g. the `receive`-methods of
+transport backends for different remotes) concurrently. Every receiver
+is connected through a bounded in-memory pipe, i.e., the source is
+read at the pace of the slowest receiver and the I/O on the source
+does not grow with the number of receivers.
+"""
+
+from typing import Optional, Callable, BinaryIO, TextIO
+import os
+import tarfile
+import hashlib
+from pathlib import Path, PurePosixPath
+from queue import Queue, Full
+from threading import Thread
+from time import monotonic
+
+from dcm_common import LoggingContext as Context, Logger
+
+from dcm_transfer_module.components.parser import ProgressWriter
+from dcm_transfer_module.components.space import directory_size
+
+
+def member_name(member: tarfile.TarInfo) -> str:
+    """
+    Returns the normalized relative name of `member`. Raises a
+    `ValueError` for names that point outside of the archive's root.
+    """
+    path = PurePosixPath(member.name)
+    if path.is_absolute() or ".." in path.parts:
+        raise ValueError(f"Bad path in archive: '{member.name}'.")
+    return path.as_posix().removeprefix("./")
+
+
+def extract_stream(stream: BinaryIO, path: Path) -> None:
+    """
+    Extracts the tar-archive `stream` (read sequentially) into the
+    directory `path`. Only regular files, directories, and symbolic
+    links are extracted; members with paths outside of `path` are
+    rejected (`ValueError`).
+
+    Keyword arguments:
+    stream -- readable binary stream
+    path -- target directory
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(fileobj=stream, mode="r|") as tar:
+        for member in tar:
+            name = member_name(member)
+            if not name or name == ".":
+                continue
+            if not (member.isfile() or member.isdir() or member.issym()):
+                continue
+            if member.issym() and (
+                PurePosixPath(member.linkname).is_absolute()
+                or ".." in PurePosixPath(member.linkname).parts
+            ):
+                raise ValueError(f"Bad link in archive: '{member.name}'.")
+            member.name = name
+            # pylint: disable=deprecated-argument
+            if hasattr(tarfile, "data_filter"):
+                tar.extract(member, path, filter="data")
+            else:
+                tar.extract(member, path)
+
+
+class _Pipe:
+    """
+    Bounded pipe from the source reader to a single receiver. The
+    receiver-side is file-like (`read`) and exposes whether the pipe
+    has been aborted (`aborted`).
+
+    Keyword arguments:
+    size -- maximum number of buffered chunks
+    poll_interval -- interval in seconds for polling when full
+    """
+
+    def __init__(self, size: int, poll_interval: float) -> None:
+        self._queue: Queue[Optional[bytes]] = Queue(size)
+        self._buffer = bytearray()
+        self._eof = False
+        self._aborted = False
+        self.poll_interval = poll_interval
+        self.closed = False
+
+    def put(
+        self, chunk: Optional[bytes], timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Adds `chunk` (`None` for end of stream); blocks while the pipe
+        is full. Data is discarded if the receiver has closed the pipe.
+        Returns `False` if the pipe has remained full for `timeout`
+        seconds (`None` for no limit).
+        """
+        start = monotonic()
+        while not self.closed:
+            try:
+                self._queue.put(chunk, timeout=self.poll_interval)
+                return True
+            except Full:
+                if timeout is not None and monotonic() - start > timeout:
+                    return False
+        return True
+
+    @property
+    def aborted(self) -> bool:
+        """Whether the receiver is supposed to stop."""
+        return self._aborted
+
+    def abort(self) -> None:
+        """Lets the receiver fail on its next read."""
+        self._aborted = True
+        try:
+            self._queue.put_nowait(None)
+        except Full:
+            # receiver is not blocked and will notice
+            pass
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads up to `size` bytes (everything if negative)."""
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self._queue.get()
+            if self._aborted:
+                raise OSError("Reading the source has been aborted.")
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def close(self) -> None:
+        """Closes the receiver-side."""
+        self.closed = True
+
+
+class _TeeWriter:
+    """
+    Writable file-like that copies all data into `pipes`. Pipes that do
+    not accept data within `timeout` seconds are aborted and skipped
+    from then on (see `stalled`).
+    """
+
+    def __init__(
+        self, pipes: list[_Pipe], timeout: Optional[float] = None
+    ) -> None:
+        self.pipes = pipes
+        self.timeout = timeout
+        self.stalled: list[_Pipe] = []
+
+    def put(self, chunk: Optional[bytes]) -> None:
+        """Adds `chunk` to all pipes (see `_Pipe.put`)."""
+        for pipe in self.pipes:
+            if pipe in self.stalled:
+                continue
+            if not pipe.put(chunk, self.timeout):
+                pipe.abort()
+                self.stalled.append(pipe)
+
+    def write(self, data: bytes) -> int:
+        chunk = bytes(data)
+        self.put(chunk)
+        return len(chunk)
+
+
+class _CountingReader:
+    """Readable file-like that reports progress to a `ProgressWriter`."""
+
+    def __init__(self, file: BinaryIO, progress: ProgressWriter) -> None:
+        self.file = file
+        self.progress = progress
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.file.read(size)
+        self.progress.advance(len(data))
+        return data
+
+
+class ArchiveDigests:
+    """
+    Computes the SHA256-digests of the regular files in a tar-archive
+    (see `FanOut`) that is passed through in chunks via `feed`, e.g.,
+    to validate the files that are extracted from the same archive
+    elsewhere. The archive is parsed in a background thread.
+
+    Keyword arguments:
+    buffer_size -- maximum number of buffered chunks
+                   (default 16)
+    poll_interval -- interval in seconds at which a full buffer is
+                     checked
+                     (default 0.1)
+    """
+
+    def __init__(
+        self, buffer_size: int = 16, poll_interval: float = 0.1
+    ) -> None:
+        self.digests: dict[str, str] = {}
+        self.error: Optional[Exception] = None
+        self._pipe = _Pipe(buffer_size, poll_interval)
+        self._thread = Thread(target=self._parse, daemon=True)
+        self._thread.start()
+
+    def _parse(self) -> None:
+        try:
+            with tarfile.open(fileobj=self._pipe, mode="r|") as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    digest = hashlib.sha256()
+                    file = tar.extractfile(member)
+                    while data := file.read(1024 * 1024):
+                        digest.update(data)
+                    self.digests[member_name(member)] = digest.hexdigest()
+        except (OSError, ValueError, tarfile.TarError) as exc_info:
+            self.error = exc_info
+        finally:
+            # discard remaining chunks
+            self._pipe.close()
+
+    def feed(self, chunk: bytes) -> None:
+        """Passes on the next `chunk` of the archive."""
+        self._pipe.put(chunk)
+
+    def close(self) -> dict[str, str]:
+        """
+        Marks the end of the archive and returns the hex-digests by
+        member name. Raises a `ValueError` if the archive is invalid.
+        """
+        self._pipe.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise ValueError(f"Unable to read archive: {self.error}")
+        return self.digests
+
+    def abort(self) -> None:
+        """Stops parsing (the archive is incomplete)."""
+        self._pipe.abort()
+
+
+class FanOut:
+    """
+    A `FanOut` streams a source directory to multiple receivers at
+    once. Receivers are callables that accept a readable binary stream
+    containing a tar-archive of the source's contents (paths relative
+    to the source) and return a log (errors indicate failure). A
+    receiver that fails does not affect the others.
+
+    Receivers are aborted if they stall (see `timeout`), if the source
+    cannot be read, or if the run is interrupted. Reading from an
+    aborted stream raises an `OSError`; receivers that do not read from
+    the stream for a while (e.g. while blocked by a remote) are
+    expected to check the stream's attribute `aborted` and to stop
+    their transfer. `run` only returns after all receivers have exited.
+
+    The memory used per receiver is bounded by
+    `chunk_size` * `buffer_size`.
+
+    Keyword arguments:
+    chunk_size -- size in bytes of the chunks that are passed on to
+                  the receivers
+                  (default 1 MiB)
+    buffer_size -- maximum number of buffered chunks per receiver
+                   (default 16)
+    poll_interval -- interval in seconds at which a full receiver
+                     buffer and the receiver threads are checked
+                     (default 0.1)
+    timeout -- time in seconds after which a receiver that does not
+               accept data is aborted (so that it does not hold back
+               the others)
+               (default None; no limit)
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1024 * 1024,
+        buffer_size: int = 16,
+        poll_interval: float = 0.1,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.buffer_size = buffer_size
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def _write(
+        self, src: Path, tee: _TeeWriter, progress_file: Optional[TextIO]
+    ) -> None:
+        """Reads `src` and writes a tar-archive into `tee`."""
+        if not src.is_dir():
+            raise FileNotFoundError(f"No such directory: '{src}'")
+        entries = []
+        for root, dirs, names in os.walk(src):
+            dirs.sort()
+            entries.extend(Path(root) / name for name in sorted(dirs))
+            entries.extend(Path(root) / name for name in sorted(names))
+        progress = ProgressWriter(
+            progress_file,
+            directory_size(src),
+            sum(1 for path in entries if path.is_file()),
+        )
+        with tarfile.open(
+            fileobj=tee,
+            mode="w|",
+            bufsize=self.chunk_size,
+            format=tarfile.PAX_FORMAT,
+        ) as tar:
+            for path in entries:
+                info = tar.gettarinfo(
+                    path, arcname=path.relative_to(src).as_posix()
+                )
+                if info is None:
+                    # e.g. sockets
+                    continue
+                if not info.isreg():
+                    tar.addfile(info)
+                    continue
+                with path.open("rb") as file:
+                    tar.addfile(info, _CountingReader(file, progress))
+                progress.advance(0, True)
+        progress.close()
+
+    def run(
+        self,
+        src: Path,
+        receivers: dict[str, Callable[[BinaryIO], Logger]],
+        progress_file: Optional[TextIO] = None,
+    ) -> dict[str, Logger]:
+        """
+        Streams `src` to all `receivers` concurrently and returns their
+        logs by name. If the source cannot be read, the error is added
+        to all logs. Receivers that stall for longer than `timeout` are
+        aborted. Returns (or raises) only after all receivers have
+        exited.
+
+        Keyword arguments:
+        src -- source directory
+        receivers -- receivers by name
+        progress_file -- output target to write progress information
+                         (bytes read from `src`) in the format of
+                         `rsync --info=progress2`
+                         (default None)
+        """
+        pipes = {
+            name: _Pipe(self.buffer_size, self.poll_interval)
+            for name in receivers
+        }
+        logs: dict[str, Logger] = {}
+        tee = _TeeWriter(list(pipes.values()), self.timeout)
+
+        def receive(name: str):
+            try:
+                logs[name] = receivers[name](pipes[name])
+            # pylint: disable=broad-exception-caught
+            except Exception as exc_info:
+                logs[name] = Logger(default_origin="Transfer Module")
+                logs[name].log(
+                    Context.ERROR,
+                    body=f"Transfer failed: {type(exc_info).__name__}: "
+                    + str(exc_info),
+                )
+            finally:
+                pipes[name].close()
+
+        threads = {
+            name: Thread(target=receive, args=(name,), daemon=True)
+            for name in receivers
+        }
+        for thread in threads.values():
+            thread.start()
+        error = None
+        try:
+            try:
+                self._write(src, tee, progress_file)
+            except (OSError, ValueError, tarfile.TarError) as exc_info:
+                error = exc_info
+                for pipe in pipes.values():
+                    pipe.abort()
+            else:
+                tee.put(None)
+            for thread in threads.values():
+                while thread.is_alive():
+                    thread.join(self.poll_interval)
+        except BaseException:
+            # e.g. job has been aborted; receivers must not outlive the
+            # run (and with that the job's connection slot)
+            for pipe in pipes.values():
+                pipe.abort()
+            for thread in threads.values():
+                thread.join()
+            raise
+        results = {name: logs[name] for name in receivers}
+        for name, pipe in pipes.items():
+            if pipe in tee.stalled:
+                results[name].log(
+                    Context.ERROR,
+                    origin="Transfer Module",
+                    body=f"Receiver '{name}' has not accepted data for "
+                    + f"{self.timeout}s and has been aborted.",
+                )
+        if error is not None:
+            for log in results.values():
+                log.log(
+                    Context.ERROR,
+                    origin="Transfer Module",
+                    body=f"Unable to read source '{src}': {error}",
+                )
+        return results
@@ -0,0 +1,247 @@
+"""
+This module defines the `RemoteHealthMonitor` component of the
+Transfer Module-app.
+
+It periodically checks the reachability of a remote in a background
+thread and implements a circuit breaker based on the results. The
+status is shared by all processes of a host via a state file; only a
+single process (holding an advisory file lock) performs the checks.
+"""
+
+from typing import Optional, Callable
+import os
+from pathlib import Path
+from collections import deque
+from threading import Thread, Event, Lock
+from time import time, sleep, monotonic
+import fcntl
+import json
+
+
+class RemoteHealthMonitor:
+    """
+    A `RemoteHealthMonitor` keeps a rolling status of the remote's
+    reachability and latency. The circuit breaker opens after
+    `failure_threshold` consecutive failed checks and closes again
+    with the first successful check.
+
+    The background thread is started on first use of `status` (or
+    explicitly with `start`) in every process (e.g. after forking).
+    Across processes, only the thread that holds the lock on
+    `<state_file>.lock` runs checks; all others only read the state
+    file. If the checking process exits, another one takes over.
+
+    Keyword arguments:
+    check -- callable that checks the remote and returns a tuple of
+             success and a message (e.g. stderr)
+    state_file -- path to the shared state file
+    interval -- interval between two checks in seconds
+                (default 10)
+    window -- number of recent checks that are considered for
+              statistics
+              (default 10)
+    failure_threshold -- number of consecutive failures after which
+                         the circuit breaker opens
+                         (default 3)
+    stale_after -- age in seconds after which the state is considered
+                   unknown (e.g. if checks hang)
+                   (default None; uses 3 * `interval` + 30)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    UNKNOWN = "unknown"
+
+    def __init__(
+        self,
+        check: Callable[[], tuple[bool, str]],
+        state_file: Path,
+        interval: float = 10,
+        window: int = 10,
+        failure_threshold: int = 3,
+        stale_after: Optional[float] = None,
+    ) -> None:
+        self.check = check
+        self.state_file = state_file
+        self.interval = interval
+        self.failure_threshold = failure_threshold
+        self.stale_after = (
+            3 * interval + 30 if stale_after is None else stale_after
+        )
+        self._results: deque[tuple[bool, float]] = deque(maxlen=window)
+        self._state = self.UNKNOWN
+        self._consecutive_failures = 0
+        self._opened: Optional[float] = None
+        self._thread: Optional[Thread] = None
+        self._pid: Optional[int] = None
+        self._stop = Event()
+        self._start_lock = Lock()
+
+    @property
+    def _lock_file(self) -> Path:
+        return self.state_file.with_name(self.state_file.name + ".lock")
+
+    def start(self) -> None:
+        """Starts the background thread (if not already running)."""
+        with self._start_lock:
+            if (
+                self._thread is not None
+                and self._pid == os.getpid()
+                and self._thread.is_alive()
+            ):
+                return
+            self._pid = os.getpid()
+            self._stop = Event()
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background thread of this process."""
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+
+    def _try_lead(self) -> Optional[int]:
+        """Returns a file descriptor holding the lock or `None`."""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._lock_file, os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError:
+            return None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _run(self) -> None:
+        fd = None
+        try:
+            while not self._stop.is_set():
+                if fd is None:
+                    fd = self._try_lead()
+                    if fd is not None:
+                        self._resume()
+                if fd is not None:
+                    self.run_check()
+                self._stop.wait(self.interval)
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def _resume(self) -> None:
+        """Continue with the state of a previous checking process."""
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if state.get("state") in (self.CLOSED, self.OPEN):
+            self._state = state["state"]
+            self._consecutive_failures = state.get("consecutive_failures", 0)
+            self._opened = state.get("opened")
+
+    def run_check(self) -> dict:
+        """
+        Runs a single check, updates the shared state, and returns the
+        new state.
+        """
+        time0 = monotonic()
+        try:
+            success, message = self.check()
+        # pylint: disable=broad-exception-caught
+        except Exception as exc_info:
+            success = False
+            message = f"{type(exc_info).__name__}: {exc_info}"
+        latency = monotonic() - time0
+        self._results.append((success, latency))
+        if success:
+            self._consecutive_failures = 0
+            self._state = self.CLOSED
+            self._opened = None
+        else:
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._opened = time()
+                self._state = self.OPEN
+            elif self._state == self.UNKNOWN:
+                self._state = self.CLOSED
+        latencies = [latency for ok, latency in self._results if ok]
+        state = {
+            "state": self._state,
+            "reachable": success,
+            "message": None if success else message.strip(),
+            "checked": time(),
+            "latency": latency,
+            "mean_latency": (
+                sum(latencies) / len(latencies) if latencies else None
+            ),
+            "success_rate": (
+                sum(ok for ok, _ in self._results) / len(self._results)
+            ),
+            "consecutive_failures": self._consecutive_failures,
+            "opened": self._opened,
+        }
+        self._write(state)
+        return state
+
+    def _write(self, state: dict) -> None:
+        # replace atomically such that readers never see partial state
+        tmp = self.state_file.with_name(
+            f".{self.state_file.name}.{os.getpid()}"
+        )
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(state), encoding="utf-8")
+            tmp.replace(self.state_file)
+        except OSError:
+            pass
+
+    def status(self) -> dict:
+        """
+        Returns the current (shared) state. The key 'state' is one of
+        'closed', 'open', or 'unknown' (no recent check available).
+        """
+        self.start()
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"state": self.UNKNOWN}
+        if time() - state.get("checked", 0) > self.stale_after:
+            state["state"] = self.UNKNOWN
+        return state
+
+    def is_open(self) -> bool:
+        """Returns `True` if the circuit breaker is open."""
+        return self.status()["state"] == self.OPEN
+
+    def wait(
+        self,
+        timeout: float,
+        interval: float = 1.0,
+        on_wait: Optional[Callable[[dict], None]] = None,
+    ) -> bool:
+        """
+        Blocks while the circuit breaker is open. Returns `True` if it
+        is not open (anymore) or `False` if `timeout` is exceeded.
+
+        Keyword arguments:
+        timeout -- maximum duration in seconds to wait
+        interval -- polling interval in seconds
+                    (default 1.0)
+        on_wait -- callback that is executed once with the current
+                   state if the breaker is open
+                   (default None)
+        """
+        state = self.status()
+        if state["state"] != self.OPEN:
+            return True
+        if on_wait is not None:
+            on_wait(state)
+        time0 = monotonic()
+        while monotonic() - time0 < timeout:
+            sleep(min(interval, max(0, timeout - (monotonic() - time0))))
+            if not self.is_open():
+                return True
+        return False
@@ -0,0 +1,320 @@
+"""
+This module defines the `Metric` and `MetricsStore` components of the
+Transfer Module-app.
+
+Metrics are aggregated in a SQLite-database such that all processes
+of a host (e.g. web-server and orchestration workers) contribute to
+the same samples.
+"""
+
+from typing import Optional, Iterable
+import os
+from pathlib import Path
+import math
+import sqlite3
+
+
+class Metric:
+    """
+    Record class for the definition of a metric family.
+
+    Keyword arguments:
+    name -- name of the metric family
+    type_ -- one of 'counter', 'gauge', or 'histogram'
+    help_ -- short description
+    buckets -- upper bounds of histogram buckets (a '+Inf'-bucket is
+               added automatically)
+               (default None)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        type_: str,
+        help_: str,
+        buckets: Optional[Iterable[float]] = None,
+    ) -> None:
+        if type_ not in ("counter", "gauge", "histogram"):
+            raise ValueError(f"Unknown metric type '{type_}'.")
+        if type_ == "histogram" and buckets is None:
+            raise ValueError(f"Missing buckets for histogram '{name}'.")
+        self.name = name
+        self.type_ = type_
+        self.help_ = help_
+        self.buckets = (
+            None
+            if buckets is None
+            else tuple(sorted(set(buckets) | {math.inf}))
+        )
+
+
+def _format_value(value: float) -> str:
+    """Format `value` for the text exposition format."""
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(labels: Optional[dict[str, str]]) -> str:
+    """Returns canonical label-string (without braces)."""
+    if not labels:
+        return ""
+    return ",".join(
+        f'{key}="'
+        + str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        + '"'
+        for key, value in sorted(labels.items())
+    )
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsStore:
+    """
+    A `MetricsStore` aggregates metric samples in the SQLite-database
+    at `path`. Every operation uses a short-lived connection, i.e.,
+    instances can be shared between threads and forked processes.
+
+    Counters and histograms are accumulated across all processes.
+    Gauges are kept per process and summed up over all living
+    processes when read (values of terminated processes are dropped).
+
+    Keyword arguments:
+    path -- path to the database file (parent directories are created
+            if needed)
+    timeout -- timeout in seconds for acquiring the database lock
+               (default 5.0)
+    strict -- if `False`, database errors during updates are ignored
+              (reading is always strict)
+              (default True)
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS samples (
+        name TEXT NOT NULL,
+        labels TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        value REAL NOT NULL,
+        PRIMARY KEY (name, labels, pid)
+    )
+    """
+    _INC = """
+    INSERT INTO samples VALUES (?, ?, ?, ?)
+    ON CONFLICT (name, labels, pid)
+    DO UPDATE SET value = value + excluded.value
+    """
+    _SET = """
+    INSERT INTO samples VALUES (?, ?, ?, ?)
+    ON CONFLICT (name, labels, pid)
+    DO UPDATE SET value = excluded.value
+    """
+
+    def __init__(
+        self, path: Path, timeout: float = 5.0, strict: bool = True
+    ) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.strict = strict
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=self.timeout)
+        if not self._initialized:
+            with connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(self._SCHEMA)
+            self._initialized = True
+        return connection
+
+    def _write(self, statement: str, rows: list[tuple]) -> None:
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany(statement, rows)
+            finally:
+                connection.close()
+        except (sqlite3.Error, OSError):
+            if self.strict:
+                raise
+
+    def inc(
+        self,
+        metric: Metric,
+        value: float = 1,
+        labels: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Increments the counter `metric` by `value`.
+
+        Keyword arguments:
+        metric -- counter definition
+        value -- increment
+                 (default 1)
+        labels -- sample labels
+                  (default None)
+        """
+        self._write(
+            self._INC, [(metric.name, _format_labels(labels), 0, value)]
+        )
+
+    def set(
+        self,
+        metric: Metric,
+        value: float,
+        labels: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Sets the gauge `metric` to `value` for the current process.
+
+        Keyword arguments:
+        metric -- gauge definition
+        value -- new value
+        labels -- sample labels
+                  (default None)
+        """
+        self._write(
+            self._SET,
+            [(metric.name, _format_labels(labels), os.getpid(), value)],
+        )
+
+    def add(
+        self,
+        metric: Metric,
+        value: float,
+        labels: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Adds `value` to the gauge `metric` of the current process.
+
+        Keyword arguments:
+        metric -- gauge definition
+        value -- increment (may be negative)
+        labels -- sample labels
+                  (default None)
+        """
+        self._write(
+            self._INC,
+            [(metric.name, _format_labels(labels), os.getpid(), value)],
+        )
+
+    def observe(
+        self,
+        metric: Metric,
+        value: float,
+        labels: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Records the observation `value` for the histogram `metric`.
+
+        Keyword arguments:
+        metric -- histogram definition
+        value -- observed value
+        labels -- sample labels
+                  (default None)
+        """
+        _labels = _format_labels(labels)
+        # 'le' is always the last label (see `_bucket_key`)
+        rows = [
+            (
+                f"{metric.name}_bucket",
+                (f"{_labels}," if _labels else "")
+                + f'le="{_format_value(bound)}"',
+                0,
+                1 if value <= bound else 0,
+            )
+            for bound in metric.buckets
+        ]
+        rows.append((f"{metric.name}_sum", _labels, 0, value))
+        rows.append((f"{metric.name}_count", _labels, 0, 1))
+        self._write(self._INC, rows)
+
+    def samples(self) -> dict[str, dict[str, float]]:
+        """
+        Returns all samples as mapping of sample name to a mapping of
+        label-string and value (gauges are aggregated over all living
+        processes).
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                rows = connection.execute(
+                    "SELECT name, labels, pid, value FROM samples"
+                ).fetchall()
+                dead = {
+                    pid for _, _, pid, _ in rows
+                    if pid != 0 and not _pid_alive(pid)
+                }
+                connection.executemany(
+                    "DELETE FROM samples WHERE pid = ?",
+                    [(pid,) for pid in dead],
+                )
+        finally:
+            connection.close()
+        result: dict[str, dict[str, float]] = {}
+        for name, labels, pid, value in rows:
+            if pid in dead:
+                continue
+            result.setdefault(name, {})
+            result[name][labels] = result[name].get(labels, 0) + value
+        return result
+
+    @staticmethod
+    def _bucket_key(item: tuple[str, float]) -> tuple[str, float]:
+        """Sort key for buckets (numerically by upper bound)."""
+        base, _, bound = item[0].rpartition('le="')
+        return base, float(bound.rstrip('"').replace("+Inf", "inf"))
+
+    def render(
+        self,
+        metrics: Iterable[Metric],
+        samples: Optional[dict[str, dict[str, float]]] = None,
+    ) -> str:
+        """
+        Returns the current samples of `metrics` in the Prometheus text
+        exposition format.
+
+        Keyword arguments:
+        metrics -- metric definitions to be included
+        samples -- samples as returned by `samples`
+                   (default None; read from database)
+        """
+        if samples is None:
+            samples = self.samples()
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_}")
+            lines.append(f"# TYPE {metric.name} {metric.type_}")
+            if metric.type_ == "histogram":
+                names = [
+                    (f"{metric.name}_bucket", self._bucket_key),
+                    (f"{metric.name}_sum", None),
+                    (f"{metric.name}_count", None),
+                ]
+            else:
+                names = [(metric.name, None)]
+            for name, key in names:
+                for labels, value in sorted(
+                    samples.get(name, {}).items(), key=key
+                ):
+                    lines.append(
+                        f"{name}{{{labels}}} {_format_value(value)}"
+                        if labels
+                        else f"{name} {_format_value(value)}"
+                    )
+        return "\n".join(lines) + "\n"
@@ -3,15 +3,19 @@ This module defines the `ProgressParser` component of the Transfer
 Module-app.
 """
 
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, TextIO
+import os
 import re
 from pathlib import Path
 from dataclasses import dataclass, field
 import io
-from threading import Thread, Event
+from threading import Thread, Lock
+from time import monotonic
 
 from dcm_common.orchestra.models import Progress
 
+from dcm_transfer_module.components.timeline import FileTimeline
+
 
 class RegexParser:
     """
@@ -59,6 +63,82 @@ class RegexParser:
         return self._convert_match_types(match.groupdict())
 
 
+_UNITS = {
+    "": 1,
+    "K": 1 << 10,
+    "M": 1 << 20,
+    "G": 1 << 30,
+    "T": 1 << 40,
+    "P": 1 << 50,
+}
+_NUMBER_UNIT = re.compile(r"([0-9.,]*)\s*([a-zA-Z]?)")
+
+
+def _split_unit(value: str) -> tuple[str, str]:
+    """Returns tuple of numeric part and unit (upper case) of `value`."""
+    match = _NUMBER_UNIT.match(value)
+    return match.group(1), match.group(2).upper()
+
+
+def parse_size(value: str) -> Optional[int]:
+    """
+    Returns the number of bytes represented by the rsync-formatted
+    `value` or `None` if it cannot be parsed.
+
+    Supported are plain numbers with (locale-dependent) thousands
+    separators like '1,234,567' and human-readable numbers with suffix
+    (like '1.23G' or '1,23G'; interpreted in units of 1024).
+
+    Keyword arguments:
+    value -- formatted size
+    """
+    number, unit = _split_unit(value.strip())
+    if unit not in _UNITS:
+        return None
+    try:
+        if unit == "":
+            return int(number.replace(",", "").replace(".", ""))
+        return int(float(number.replace(",", ".")) * _UNITS[unit])
+    except ValueError:
+        return None
+
+
+def parse_rate(value: str) -> Optional[float]:
+    """
+    Returns the transfer rate in bytes per second represented by the
+    rsync-formatted `value` (like '45.6MB/s' or '12,34kB/s'; interpreted
+    in units of 1024) or `None` if it cannot be parsed.
+
+    Keyword arguments:
+    value -- formatted rate
+    """
+    number, unit = _split_unit(value.strip())
+    if unit == "B":
+        unit = ""
+    if unit not in _UNITS:
+        return None
+    try:
+        return float(number.replace(",", ".")) * _UNITS[unit]
+    except ValueError:
+        return None
+
+
+def parse_duration(value: str) -> Optional[int]:
+    """
+    Returns the number of seconds represented by the rsync-formatted
+    `value` (like '1:02:03') or `None` if it cannot be parsed.
+
+    Keyword arguments:
+    value -- formatted duration
+    """
+    seconds = 0
+    for part in value.strip().split(":"):
+        if not part.isdigit():
+            return None
+        seconds = 60 * seconds + int(part)
+    return seconds
+
+
 @dataclass
 class RsyncProgress:
     """
@@ -71,7 +151,9 @@ class RsyncProgress:
               (default 0)
     rate -- current transfer rate
               (default "?")
-    time -- time since transfer start
+    time -- estimated remaining time or, if the record marks the
+            completion of a file (`xfr` is set), time since transfer
+            start
               (default "?")
     xfr -- current file id
               (default 0)
@@ -92,6 +174,366 @@ class RsyncProgress:
     def __getitem__(self, key):
         return getattr(self, key)
 
+    @property
+    def bytes(self) -> Optional[int]:
+        """Returns the number of transferred bytes."""
+        return parse_size(self.volume)
+
+    @property
+    def bytes_per_second(self) -> Optional[float]:
+        """Returns the current transfer rate in bytes per second."""
+        return parse_rate(self.rate)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """
+        Returns the estimated remaining time in seconds. If rsync does
+        not provide an estimate, it is derived from `percent`, `bytes`,
+        and `bytes_per_second`.
+        """
+        if self.xfr is None:
+            return parse_duration(self.time)
+        if self.percent >= 100:
+            return 0
+        if not self.percent or not self.bytes_per_second:
+            return None
+        if (_bytes := self.bytes) is None:
+            return None
+        return (
+            _bytes * (100 - self.percent) / self.percent
+        ) / self.bytes_per_second
+
+    @property
+    def files_done(self) -> Optional[int]:
+        """
+        Returns the number of checked files (based on `chk`) or `None`
+        if not available.
+        """
+        if self.chk is None:
+            return None
+        remaining, total = self.chk.split("/")
+        return int(total) - int(remaining)
+
+    @property
+    def files_total(self) -> Optional[int]:
+        """
+        Returns the total number of files (based on `chk`; may grow
+        during incremental recursion) or `None` if not available.
+        """
+        if self.chk is None:
+            return None
+        return int(self.chk.split("/")[1])
+
+
+class PushThrottle:
+    """
+    A `PushThrottle` wraps a push-function and coalesces calls based on
+    a minimum interval and a minimum change in (percent-)progress. The
+    first update, the completion (100%), and the last suppressed update
+    (via `flush`) are always pushed.
+
+    Keyword arguments:
+    push -- function to push progress to the host process
+    min_interval -- minimum duration in seconds between two pushes
+                    (default 0)
+    min_delta -- minimum change of progress in percent between two
+                 pushes
+                 (default 0)
+    """
+
+    def __init__(
+        self,
+        push: Callable,
+        min_interval: float = 0,
+        min_delta: int = 0,
+    ) -> None:
+        self._push = push
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self._last_time: Optional[float] = None
+        self._last_value: Optional[int] = None
+        self._pending = False
+
+    @property
+    def pending(self) -> bool:
+        """Returns `True` if the latest update has not been pushed."""
+        return self._pending
+
+    def __call__(self, value: int) -> bool:
+        """
+        Pushes if sufficient time has passed and `value` has changed
+        sufficiently since the last push. Returns `True` if a push has
+        been made.
+
+        Keyword arguments:
+        value -- current progress in percent
+        """
+        now = monotonic()
+        if (
+            self._last_time is None
+            or (value >= 100 and self._last_value < 100)
+            or (
+                now - self._last_time >= self.min_interval
+                and abs(value - self._last_value) >= self.min_delta
+            )
+        ):
+            self._push()
+            self._last_time = now
+            self._last_value = value
+            self._pending = False
+            return True
+        self._pending = True
+        return False
+
+    def flush(self) -> bool:
+        """
+        Pushes the latest update if it has been suppressed. Returns
+        `True` if a push has been made.
+        """
+        if not self._pending:
+            return False
+        self._push()
+        self._last_time = monotonic()
+        self._pending = False
+        return True
+
+
+def _parse_float(value: str) -> Optional[float]:
+    """Parse a plain decimal number (e.g. '0.001')."""
+    try:
+        return float(value.replace(",", "."))
+    except ValueError:
+        return None
+
+
+class RsyncStats:
+    """
+    Collector for the summary that is printed by `rsync --stats`.
+    Records are fed one by one via `feed`; recognized values are
+    collected in `values` (sizes/counts as `int`, durations in seconds
+    and the speedup as `float`).
+    """
+
+    _PATTERNS = {
+        "files": (r"Number of files:\s*(\S+)", parse_size),
+        "files_transferred": (
+            r"Number of regular files transferred:\s*(\S+)", parse_size
+        ),
+        "total_size": (r"Total file size:\s*(\S+)", parse_size),
+        "total_transferred_size": (
+            r"Total transferred file size:\s*(\S+)", parse_size
+        ),
+        "literal_data": (r"Literal data:\s*(\S+)", parse_size),
+        "matched_data": (r"Matched data:\s*(\S+)", parse_size),
+        "file_list_size": (r"File list size:\s*(\S+)", parse_size),
+        "file_list_generation_time": (
+            r"File list generation time:\s*(\S+)", _parse_float
+        ),
+        "file_list_transfer_time": (
+            r"File list transfer time:\s*(\S+)", _parse_float
+        ),
+        "bytes_sent": (r"Total bytes sent:\s*(\S+)", parse_size),
+        "bytes_received": (r"Total bytes received:\s*(\S+)", parse_size),
+        "speedup": (r"total size is .*speedup is\s*(\S+)", _parse_float),
+    }
+    # summary lines without a collected value
+    _OTHER = re.compile(
+        r"Number of (created|deleted) files:|sent .* bytes\s+received .*"
+    )
+
+    def __init__(self) -> None:
+        self.values: dict[str, int | float] = {}
+        self._patterns = [
+            (name, re.compile(pattern), convert)
+            for name, (pattern, convert) in self._PATTERNS.items()
+        ]
+
+    def feed(self, record: str) -> bool:
+        """
+        Parses `record` and returns `True` if it is part of rsync's
+        summary.
+
+        Keyword arguments:
+        record -- single line of rsync's output
+        """
+        record = record.strip()
+        for name, pattern, convert in self._patterns:
+            match = pattern.match(record)
+            if match is None:
+                continue
+            value = convert(match.group(1))
+            if value is not None:
+                self.values[name] = value
+            return True
+        return self._OTHER.match(record) is not None
+
+
+class ProgressWriter:
+    """
+    A `ProgressWriter` writes progress records in the format of
+    `rsync --info=progress2` into `stream` such that transfers that are
+    not made with rsync can be parsed with the `RsyncParser`.
+    Thread-safe.
+
+    Keyword arguments:
+    stream -- output target (`None` disables output)
+    total -- total number of bytes
+    files -- total number of files
+    """
+
+    def __init__(
+        self, stream: Optional[TextIO], total: int, files: int
+    ) -> None:
+        self.stream = stream
+        self.total = total
+        self.files = files
+        self.done = 0
+        self.xfr = 0
+        self._start = monotonic()
+        self._lock = Lock()
+
+    def advance(self, size: int, complete: bool = False) -> None:
+        """Adds `size` bytes (and a completed file if `complete`)."""
+        with self._lock:
+            self.done += size
+            if complete:
+                self.xfr += 1
+            self._write("\r")
+
+    def close(self) -> None:
+        """Writes the final record."""
+        with self._lock:
+            self._write("\n")
+
+    def _write(self, end: str) -> None:
+        if self.stream is None:
+            return
+        elapsed = monotonic() - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0
+        seconds = int(
+            (self.total - self.done) / rate
+            if end == "\r" and rate > 0
+            else elapsed
+        )
+        percent = (
+            min(100, 100 * self.done // self.total) if self.total else 100
+        )
+        self.stream.write(
+            f"{self.done:15,d} {percent:3d}% {rate / 1048576:7.2f}MB/s "
+            + f"{seconds // 3600:4d}:{seconds // 60 % 60:02d}:"
+            + f"{seconds % 60:02d} (xfr#{self.xfr}, to-chk="
+            + f"{self.files - self.xfr}/{self.files}){end}"
+        )
+        self.stream.flush()
+
+
+class ProgressRecordReader:
+    """
+    Incremental reader for a byte-stream of `--info=progress2`-style
+    output. Records are separated by carriage returns or newlines.
+
+    Instead of splitting the input into lines, every chunk that is fed
+    into the reader is searched backwards for the newest complete
+    record containing a percent-sign; all older records of that chunk
+    are skipped without being copied or decoded. An incomplete trailing
+    record is kept until the next chunk arrives.
+
+    Keyword arguments:
+    max_buffer -- maximum size in bytes of an incomplete record that is
+                  retained between chunks
+                  (default 4096)
+    """
+
+    def __init__(self, max_buffer: int = 4096) -> None:
+        self.max_buffer = max_buffer
+        self._tail = b""
+        self.trailing: list[str] = []
+
+    @staticmethod
+    def _rfind_separator(data: bytes, end: int) -> int:
+        return max(data.rfind(b"\r", 0, end), data.rfind(b"\n", 0, end))
+
+    def _newest_record(self, data: bytes, end: int) -> Optional[str]:
+        """
+        Returns the newest record containing a '%' in `data[:end]` and
+        stores all newer records in `trailing`.
+        """
+        trailing = []
+        record = None
+        while end > 0:
+            start = self._rfind_separator(data, end) + 1
+            if data.find(b"%", start, end) >= 0:
+                record = data[start:end].decode("utf-8", errors="replace")
+                break
+            if start < end:
+                trailing.append(data[start:end])
+            end = start - 1
+        self.trailing = [
+            r.decode("utf-8", errors="replace") for r in reversed(trailing)
+        ]
+        return record
+
+    def feed(self, chunk: bytes) -> Optional[str]:
+        """
+        Process `chunk` and return the newest complete progress record
+        (or `None` if the chunk does not complete any such record).
+        Complete records that do not contain a percent-sign and are
+        newer than the returned record (e.g. rsync's summary) are made
+        available in `trailing`.
+
+        Keyword arguments:
+        chunk -- next chunk of the stream
+        """
+        data = self._tail + chunk if self._tail else chunk
+        end = self._rfind_separator(data, len(data))
+        if end < 0:
+            self._tail = data[-self.max_buffer:]
+            self.trailing = []
+            return None
+        self._tail = data[end + 1:][-self.max_buffer:]
+        return self._newest_record(data, end)
+
+    def flush(self) -> Optional[str]:
+        """
+        Returns the incomplete trailing record if it is a progress
+        record and resets the reader (otherwise, the record is made
+        available in `trailing`).
+        """
+        tail, self._tail = self._tail, b""
+        return self._newest_record(tail, len(tail))
+
+    def feed_all(self, chunk: bytes) -> list[str]:
+        """
+        Process `chunk` and return all non-empty records that are
+        completed by it (unlike `feed`, no records are skipped).
+
+        Keyword arguments:
+        chunk -- next chunk of the stream
+        """
+        data = self._tail + chunk if self._tail else chunk
+        end = self._rfind_separator(data, len(data))
+        if end < 0:
+            self._tail = data[-self.max_buffer:]
+            return []
+        self._tail = data[end + 1:][-self.max_buffer:]
+        return [
+            record
+            for record in data[:end].decode(
+                "utf-8", errors="replace"
+            ).replace("\r", "\n").split("\n")
+            if record
+        ]
+
+    def flush_all(self) -> list[str]:
+        """
+        Returns the incomplete trailing record (if any) as list and
+        resets the reader.
+        """
+        tail, self._tail = self._tail, b""
+        if not tail:
+            return []
+        return [tail.decode("utf-8", errors="replace")]
+
 
 class RsyncParser:
     """
@@ -110,17 +552,23 @@ class RsyncParser:
         "xfr": int
     }
     _FORMAT = "syncing files, {percent}% @ {rate}"
+    # messages that rsync writes to stdout next to the file names of
+    # `--info=name1`
+    _MESSAGES = re.compile(
+        r"(sending|receiving) incremental file list$"
+        + r"|(building|receiving) file list "
+        + r"|created directory "
+        + r"|\*?deleting "
+        + r"|cannot delete non-empty directory: "
+        + r"|skipping (non-regular file|directory) "
+        + r"|file has vanished: "
+        + r"|IO error encountered "
+        + r"|rsync( error| warning)?: "
+        + r"|Transfer starting: "
+    )
 
     def __init__(self) -> None:
         self._regex_parser = RegexParser(self._PATTERN, self._TYPES)
-        self._listening = Event()
-
-    @property
-    def listening(self) -> bool:
-        """
-        Returns whether the parser is listening.
-        """
-        return self._listening.is_set()
 
     def parse(self, progress: str) -> RsyncProgress:
         """
@@ -131,38 +579,333 @@ class RsyncParser:
         """
         return RsyncProgress(**self._regex_parser.parse(progress))
 
+    def consume(
+        self,
+        stream: TextIO,
+        progress: Progress,
+        push: Callable,
+        push_interval: float = 0,
+        push_delta: int = 0,
+        on_update: Optional[Callable[[RsyncProgress, float], None]] = None,
+        stats: Optional[RsyncStats] = None,
+    ) -> None:
+        """
+        Parse `stream` until EOF and update `progress` accordingly.
+        Lines that do not match the progress-format are skipped (or
+        passed to `stats`).
+
+        Keyword arguments:
+        stream -- text stream containing rsync's stdout
+        progress -- the `Progress` object to be updated
+        push -- function to push the updated `progress` to the host
+                process
+        push_interval -- minimum duration in seconds between pushes
+                         (see `PushThrottle`)
+                         (default 0)
+        push_delta -- minimum change in percent between pushes
+                      (see `PushThrottle`)
+                      (default 0)
+        on_update -- callback that is executed with every parsed
+                     `RsyncProgress` and the time in seconds since the
+                     stream has been opened (before pushing)
+                     (default None)
+        stats -- if given, rsync's summary (`--stats`) is collected in
+                 this `RsyncStats`
+                 (default None)
+        """
+        throttle = PushThrottle(push, push_interval, push_delta)
+        start = monotonic()
+        for line in stream:
+            if (
+                not self._update(line, progress, throttle, on_update, start)
+                and stats is not None
+            ):
+                stats.feed(line)
+        throttle.flush()
+
+    def consume_fd(
+        self,
+        fd: int,
+        progress: Progress,
+        push: Callable,
+        push_interval: float = 0,
+        push_delta: int = 0,
+        on_update: Optional[Callable[[RsyncProgress, float], None]] = None,
+        timeline: Optional[FileTimeline] = None,
+        stats: Optional[RsyncStats] = None,
+        chunk_size: int = 65536,
+    ) -> None:
+        """
+        Read file descriptor `fd` in chunks until EOF and update
+        `progress` accordingly. Only the newest complete progress record
+        of every chunk is parsed (see `ProgressRecordReader`), unless a
+        `timeline` is requested.
+
+        Keyword arguments:
+        fd -- file descriptor (e.g. reading end of a pipe)
+        progress -- the `Progress` object to be updated
+        push -- function to push the updated `progress` to the host
+                process
+        push_interval -- minimum duration in seconds between pushes
+                         (see `PushThrottle`)
+                         (default 0)
+        push_delta -- minimum change in percent between pushes
+                      (see `PushThrottle`)
+                      (default 0)
+        on_update -- callback that is executed with every parsed
+                     `RsyncProgress` and the time in seconds since the
+                     stream has been opened (before pushing)
+                     (default None)
+        timeline -- if given, file names in the stream (as generated by
+                    rsync's `--info=name1`) are recorded in this
+                    `FileTimeline`; this requires all records to be
+                    processed
+                    (default None)
+        stats -- if given, rsync's summary (`--stats`) is collected in
+                 this `RsyncStats`
+                 (default None)
+        chunk_size -- maximum number of bytes read at once
+                      (default 65536)
+        """
+        feed, close = self._consumer(
+            progress, push, push_interval, push_delta, on_update, timeline,
+            stats
+        )
+        while chunk := os.read(fd, chunk_size):
+            feed(chunk)
+        close()
+
+    def _consumer(
+        self,
+        progress: Progress,
+        push: Callable,
+        push_interval: float,
+        push_delta: int,
+        on_update: Optional[Callable[[RsyncProgress, float], None]],
+        timeline: Optional[FileTimeline],
+        stats: Optional[RsyncStats],
+    ) -> tuple[Callable[[bytes], None], Callable[[], None]]:
+        """
+        Returns a pair of functions to feed chunks of a stream and to
+        process the end of that stream, respectively.
+        """
+        throttle = PushThrottle(push, push_interval, push_delta)
+        start = monotonic()
+        reader = ProgressRecordReader()
+        # the summary is never recorded as file names
+        summary = stats if stats is not None else RsyncStats()
+
+        def feed(chunk: bytes) -> None:
+            if timeline is None:
+                record = reader.feed(chunk)
+                self._update_stats(reader.trailing, stats)
+            else:
+                record = self._update_timeline(
+                    reader.feed_all(chunk),
+                    timeline,
+                    summary,
+                    monotonic() - start,
+                )
+            if record is not None:
+                self._update(record, progress, throttle, on_update, start)
+
+        def close() -> None:
+            if timeline is None:
+                record = reader.flush()
+                self._update_stats(reader.trailing, stats)
+            else:
+                record = self._update_timeline(
+                    reader.flush_all(), timeline, summary, monotonic() - start
+                )
+                timeline.finish(monotonic() - start)
+            if record is not None:
+                self._update(record, progress, throttle, on_update, start)
+            throttle.flush()
+
+        return feed, close
+
+    @staticmethod
+    def _update_stats(records: list[str], stats: Optional[RsyncStats]):
+        """Feed `records` into `stats` (if not `None`)."""
+        if stats is None:
+            return
+        for record in records:
+            stats.feed(record)
+
+    def _update_timeline(
+        self,
+        records: list[str],
+        timeline: FileTimeline,
+        stats: RsyncStats,
+        time: float,
+    ) -> Optional[str]:
+        """
+        Process `records` for `timeline` and `stats` and return the
+        newest progress record (or `None` if there is none). Only file
+        names are recorded in `timeline`; directories and other
+        messages of rsync are skipped.
+        """
+        latest = None
+        for record in records:
+            match = self._regex_parser.parse(record)
+            if match is not None:
+                latest = record
+                if (_bytes := RsyncProgress(**match).bytes) is not None:
+                    timeline.offset = _bytes
+                continue
+            if stats.feed(record):
+                continue
+            name = record.strip()
+            if not name or name.endswith("/") or self._MESSAGES.match(name):
+                continue
+            # symlinks are listed as 'name -> target'
+            timeline.start(name.split(" -> ", 1)[0], time)
+        return latest
+
+    def _update(
+        self,
+        record: str,
+        progress: Progress,
+        throttle: PushThrottle,
+        on_update: Optional[Callable[[RsyncProgress, float], None]],
+        start: float,
+    ) -> bool:
+        """
+        Parse `record` and update `progress` if it matches. Returns
+        `True` on match.
+        """
+        match = self._regex_parser.parse(record)
+        if match is None:
+            return False
+        parsed = RsyncProgress(**match)
+        progress.numeric = parsed.percent
+        progress.verbose = self._FORMAT.format(**parsed)
+        if on_update is not None:
+            on_update(parsed, monotonic() - start)
+        throttle(parsed.percent)
+        return True
+
     def _listen_thread(
-        self, pipe: Path, progress: Progress, push: Callable
+        self, pipe: Path | int, progress: Progress, push: Callable, **kwargs
     ) -> None:
-        self._listening.set()
-        with io.open(pipe, "r", encoding="utf-8") as _pipe:
-            for line in _pipe:
-                if line != "\n":
-                    parsed = self.parse(line)
-                    progress.numeric = parsed.percent
-                    progress.verbose = self._FORMAT.format(**parsed)
-                    push()
-        self._listening.clear()
+        fd = os.open(pipe, os.O_RDONLY) if isinstance(pipe, Path) else pipe
+        try:
+            self.consume_fd(fd, progress, push, **kwargs)
+        finally:
+            os.close(fd)
 
     def listen(
-        self, pipe: Path, progress: Progress, push: Optional[Callable] = None
-    ) -> None:
+        self,
+        pipe: Path | int,
+        progress: Progress,
+        push: Optional[Callable] = None,
+        **kwargs,
+    ) -> Thread:
         """
         Continuously parse the given `pipe` in a separate `Thread` and
-        update `progress` accordingly.
+        update `progress` accordingly. Returns the (started) `Thread`
+        which terminates once the writing end of `pipe` is closed.
+
+        Multiple listeners can be active at the same time.
 
         Keyword arguments:
-        pipe -- the path to the named pipe/fifo
+        pipe -- the path to a named pipe/fifo or file descriptor of the
+                reading end of a pipe (gets closed by the listener)
         progress -- the `Progress` object to be updated
         push -- function to push the updated `progress` to the host
                 process
                 (default None)
+        kwargs -- keyword arguments that are passed on to `consume_fd`
+                  (like `push_interval`)
         """
-        if self.listening:
-            raise RuntimeError(f"Already listening at '{pipe}'.")
         t = Thread(
             target=self._listen_thread,
-            args=(pipe, progress, push or (lambda: None))
+            args=(pipe, progress, push or (lambda: None)),
+            kwargs=kwargs,
+            daemon=True,
         )
         t.start()
-        self._listening.wait()
+        return t
+
+
+class ProgressChannel:
+    """
+    A `ProgressChannel` provides a per-job, in-process channel for
+    rsync's progress output based on an anonymous pipe. While open, a
+    listener-`Thread` parses everything that is written to `writer`
+    and updates the given `progress`.
+
+    The channel leaves no artifacts in the file system and is closed
+    deterministically (the listener is joined on `close`). Can be used
+    as context manager (returning `writer`).
+
+    Keyword arguments:
+    progress -- the `Progress` object to be updated
+    push -- function to push the updated `progress` to the host
+            process
+            (default None)
+    parser -- `RsyncParser` to be used
+              (default None; uses new instance)
+    kwargs -- keyword arguments that are passed on to
+              `RsyncParser.consume_fd` (like `push_interval`,
+              `push_delta`, `on_update`, `timeline`, or `stats`)
+    """
+
+    def __init__(
+        self,
+        progress: Progress,
+        push: Optional[Callable] = None,
+        parser: Optional[RsyncParser] = None,
+        **kwargs,
+    ) -> None:
+        self._progress = progress
+        self._push = push
+        self._parser = parser or RsyncParser()
+        self._kwargs = kwargs
+        self._writer: Optional[TextIO] = None
+        self._thread: Optional[Thread] = None
+
+    @property
+    def writer(self) -> Optional[TextIO]:
+        """
+        Returns the writing end of the channel (`None` if not open).
+        """
+        return self._writer
+
+    def open(self) -> TextIO:
+        """Opens the channel and returns its writing end."""
+        if self._writer is not None:
+            raise RuntimeError("Progress channel is already open.")
+        read_fd, write_fd = os.pipe()
+        try:
+            self._thread = self._parser.listen(
+                read_fd, self._progress, self._push, **self._kwargs
+            )
+        except BaseException:
+            os.close(read_fd)
+            os.close(write_fd)
+            raise
+        self._writer = io.open(write_fd, "w", encoding="utf-8")
+        return self._writer
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Closes the writing end of the channel and waits for the listener
+        to process the remaining output.
+
+        Keyword arguments:
+        timeout -- timeout for joining the listener-`Thread`
+                   (default None)
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> TextIO:
+        return self.open()
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.close()
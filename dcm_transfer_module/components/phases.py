@@ -0,0 +1,82 @@
+"""
+This module defines the `PhaseTimer` component of the Transfer
+Module-app.
+"""
+
+from typing import Optional, Callable
+from time import monotonic
+
+
+class PhaseTimer:
+    """
+    A `PhaseTimer` measures the durations of consecutive phases of a
+    job based on a monotonic clock. A phase is entered with `start`; it
+    ends when the next phase is started or with `stop`.
+
+    The phase in which a job has failed can be marked with `fail` (see
+    `failed_phase`).
+
+    Can be used as context manager (stopping the current phase on
+    exit).
+
+    Keyword arguments:
+    on_record -- callback that is executed with name, attempt, and
+                 duration (in seconds) whenever a phase ends
+                 (default None)
+    clock -- clock used for measurements
+             (default `time.monotonic`)
+    """
+
+    def __init__(
+        self,
+        on_record: Optional[
+            Callable[[str, Optional[int], float], None]
+        ] = None,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.on_record = on_record
+        self._clock = clock
+        self.phases: list[tuple[str, Optional[int], float]] = []
+        self._current: Optional[tuple[str, Optional[int], float]] = None
+        self.failed_phase: Optional[str] = None
+
+    @property
+    def current(self) -> Optional[str]:
+        """Returns the name of the current phase (if any)."""
+        return None if self._current is None else self._current[0]
+
+    def start(self, name: str, attempt: Optional[int] = None) -> None:
+        """
+        Starts the phase `name` (and stops the current phase).
+
+        Keyword arguments:
+        name -- name of the phase
+        attempt -- index of the attempt for repeated phases
+                   (default None)
+        """
+        self.stop()
+        self._current = (name, attempt, self._clock())
+
+    def fail(self) -> None:
+        """
+        Marks the current phase as the phase in which the job has
+        failed (replaces an earlier mark).
+        """
+        self.failed_phase = self.current
+
+    def stop(self) -> None:
+        """Stops the current phase (no-op if there is none)."""
+        if self._current is None:
+            return
+        name, attempt, start = self._current
+        self._current = None
+        duration = self._clock() - start
+        self.phases.append((name, attempt, duration))
+        if self.on_record is not None:
+            self.on_record(name, attempt, duration)
+
+    def __enter__(self) -> "PhaseTimer":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.stop()
@@ -0,0 +1,589 @@
+"""
+This module defines the `S3Transport`-backend of the Transfer
+Module-app.
+
+Files are uploaded as objects into a bucket of an S3-compatible object
+storage (e.g. MinIO). The object keys follow the layout of the other
+backends: a target `REMOTE_DESTINATION/<name>` is mapped onto the key
+prefix 'REMOTE_DESTINATION/<name>/' (without leading slash). Files
+larger than the part size are uploaded with multipart uploads. Objects
+and parts are uploaded concurrently through a pooled client and every
+request carries a SHA256-checksum that is validated by the storage.
+
+Requires the optional dependency `boto3` (extra 's3').
+"""
+
+from typing import Optional, Any, Callable, Iterable, Iterator, TextIO
+from typing import BinaryIO
+import os
+import io
+import tarfile
+import base64
+import hashlib
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from itertools import count
+from threading import BoundedSemaphore, Lock
+
+from dcm_common import LoggingContext as Context, Logger
+
+from dcm_transfer_module.components.parser import ProgressWriter
+from dcm_transfer_module.components.fanout import member_name
+from dcm_transfer_module.components.transport import (
+    Transport, register_transport
+)
+from dcm_transfer_module.components.tracing import Tracer
+
+
+def _checksum(data: bytes) -> str:
+    """Returns the base64-encoded SHA256-digest of `data`."""
+    return base64.b64encode(hashlib.sha256(data).digest()).decode("ascii")
+
+
+def _changed(key: str) -> RuntimeError:
+    """Returns the error for a source that changes during its upload."""
+    return RuntimeError(
+        f"Size of the source for object '{key}' has changed during the "
+        + "transfer."
+    )
+
+
+def object_checksum(path: Path, part_size: int) -> str:
+    """
+    Returns the SHA256-checksum that an object storage reports for the
+    upload of file `path` by `S3Transport`. For multipart uploads, this
+    is the checksum of the concatenated part-digests with the suffix
+    '-<number of parts>'.
+
+    Keyword arguments:
+    path -- path to the file
+    part_size -- part size of the upload in bytes
+    """
+    digests = []
+    with path.open("rb") as file:
+        while True:
+            data = file.read(part_size)
+            if not data and digests:
+                break
+            digests.append(hashlib.sha256(data).digest())
+            if len(data) < part_size:
+                break
+    if len(digests) == 1:
+        return base64.b64encode(digests[0]).decode("ascii")
+    return (
+        base64.b64encode(hashlib.sha256(b"".join(digests)).digest()).decode(
+            "ascii"
+        )
+        + f"-{len(digests)}"
+    )
+
+
+class S3Transport(Transport):
+    """
+    Transport backend for an S3-compatible object storage.
+
+    The number of concurrent requests (and therefore the size of the
+    client's connection pool) is limited by `max_concurrency` (or the
+    transfer option `parallelism`). Files are read in parts of
+    `part_size` bytes and at most that many parts are buffered at a
+    time (bounded memory).
+    The client is created lazily in every process (e.g. after
+    forking).
+
+    Of the transfer options, `mirror` (delete objects that do not
+    exist in source), `resume` (skip objects that already exist with
+    the same size), and `parallelism` are supported. Checksums are
+    always validated by the storage; the remaining options are
+    ignored.
+
+    Keyword arguments:
+    client_factory -- callable that returns a (boto3) S3 client
+    bucket -- name of the bucket
+    endpoint -- URL of the storage (used as identifier only)
+                (default None)
+    part_size -- size of parts of multipart uploads in bytes (S3
+                 requires at least 5 MiB); smaller files are uploaded
+                 with a single request
+                 (default 8 MiB)
+    max_concurrency -- maximum number of concurrent requests
+                       (default 8)
+    tracer -- `Tracer` for instrumentation of transfers
+              (default None)
+    poll_interval -- interval in seconds for polling pending uploads
+                     (default 0.1)
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        bucket: str,
+        endpoint: Optional[str] = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 8,
+        tracer: Optional[Tracer] = None,
+        poll_interval: float = 0.1,
+    ) -> None:
+        if part_size < 1 or max_concurrency < 1:
+            raise ValueError(
+                "Part size and concurrency of S3-transport must be "
+                + f"positive, got {part_size} and {max_concurrency}."
+            )
+        self.client_factory = client_factory
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        self.tracer = tracer or Tracer()
+        self.poll_interval = poll_interval
+        self._client = None
+        self._pid: Optional[int] = None
+        self._client_lock = Lock()
+
+    @classmethod
+    def from_config(
+        cls, config, tracer: Optional[Tracer] = None
+    ) -> "S3Transport":
+        """
+        Returns an `S3Transport` that is configured according to
+        `config` (see `AppConfig`). Raises a `ValueError` if `boto3` is
+        not available.
+        """
+        try:
+            # pylint: disable=import-outside-toplevel
+            import boto3
+            from botocore.config import Config
+        except ImportError as exc_info:
+            raise ValueError(
+                "Transport 's3' requires the package 'boto3' (install "
+                + "extra 's3')."
+            ) from exc_info
+
+        def client_factory():
+            return boto3.session.Session().client(
+                "s3",
+                endpoint_url=config.S3_ENDPOINT_URL,
+                region_name=config.S3_REGION,
+                aws_access_key_id=config.S3_ACCESS_KEY_ID,
+                aws_secret_access_key=config.S3_SECRET_ACCESS_KEY,
+                config=Config(
+                    # jobs may request a higher parallelism
+                    max_pool_connections=max(
+                        config.S3_MAX_CONCURRENCY,
+                        config.REQUEST_MAX_PARALLELISM,
+                    ),
+                    connect_timeout=config.TRANSFER_TIMEOUT,
+                    s3={"addressing_style": config.S3_ADDRESSING_STYLE},
+                    retries={"mode": "standard"},
+                ),
+            )
+
+        return cls(
+            client_factory,
+            config.S3_BUCKET,
+            endpoint=config.S3_ENDPOINT_URL,
+            part_size=config.S3_PART_SIZE,
+            max_concurrency=config.S3_MAX_CONCURRENCY,
+            tracer=tracer,
+        )
+
+    @property
+    def client(self):
+        """Returns the S3 client of this process."""
+        with self._client_lock:
+            if self._client is None or self._pid != os.getpid():
+                self._client = self.client_factory()
+                self._pid = os.getpid()
+            return self._client
+
+    @property
+    def key(self) -> str:
+        return f"s3:{self.endpoint or 'default'}/{self.bucket}"
+
+    @property
+    def description(self) -> str:
+        return f"{self.endpoint or 's3:'}/{self.bucket}"
+
+    @property
+    def streaming(self) -> bool:
+        return True
+
+    @staticmethod
+    def object_key(dst: Path, relative: str = "") -> str:
+        """
+        Returns the object key for the file `relative` in target `dst`.
+        """
+        prefix = str(dst).strip("/")
+        return f"{prefix}/{relative}" if relative else prefix
+
+    def _objects(self, dst: Path) -> Iterator[dict]:
+        """Yields the listing-entries of all objects of target `dst`."""
+        key = self.object_key(dst)
+        for page in self.client.get_paginator("list_objects_v2").paginate(
+            Bucket=self.bucket, Prefix=key
+        ):
+            for obj in page.get("Contents", []):
+                if obj["Key"] == key or obj["Key"].startswith(key + "/"):
+                    yield obj
+
+    @staticmethod
+    def _files(src: Path) -> list[tuple[str, Path, int]]:
+        """
+        Returns a sorted list of relative path, path, and size for all
+        regular files in `src` (or `src` itself if it is a file).
+        """
+        if not src.is_dir():
+            return [("", src, src.stat().st_size)]
+        files = []
+        for root, dirs, names in os.walk(src):
+            dirs.sort()
+            for name in sorted(names):
+                path = Path(root) / name
+                if path.is_file() and not path.is_symlink():
+                    files.append(
+                        (
+                            path.relative_to(src).as_posix(),
+                            path,
+                            path.stat().st_size,
+                        )
+                    )
+        return files
+
+    def preflight(self, destination: Path) -> tuple[bool, str]:
+        # no directories need to be created in object storage
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        # pylint: disable=broad-exception-caught
+        except Exception as exc_info:
+            return False, f"{type(exc_info).__name__}: {exc_info}"
+        return True, ""
+
+    def exists(self, dst: Path) -> bool:
+        return next(self._objects(dst), None) is not None
+
+    def _delete(self, keys: list[str]) -> list[str]:
+        """Deletes `keys` and returns a list of error messages."""
+        errors = []
+        for i in range(0, len(keys), 1000):
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [{"Key": key} for key in keys[i:i + 1000]],
+                    "Quiet": True,
+                },
+            )
+            errors.extend(
+                f"{error.get('Key')}: {error.get('Message')}"
+                for error in response.get("Errors", [])
+            )
+        return errors
+
+    def remove(self, dst: Path) -> tuple[int, str, str]:
+        try:
+            errors = self._delete([obj["Key"] for obj in self._objects(dst)])
+        # pylint: disable=broad-exception-caught
+        except Exception as exc_info:
+            return 1, "", f"{type(exc_info).__name__}: {exc_info}"
+        return (1 if errors else 0), "", "\n".join(errors)
+
+    def _put(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ChecksumAlgorithm="SHA256",
+            ChecksumSHA256=_checksum(data),
+        )
+
+    def _upload_part(
+        self, key: str, upload_id: str, number: int, data: bytes
+    ) -> dict:
+        checksum = _checksum(data)
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=data,
+            ChecksumAlgorithm="SHA256",
+            ChecksumSHA256=checksum,
+        )
+        return {
+            "PartNumber": number,
+            "ETag": response["ETag"],
+            "ChecksumSHA256": checksum,
+        }
+
+    def _wait(self, futures: list[Future]) -> None:
+        """
+        Waits for `futures` and raises the first exception.
+        """
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, self.poll_interval)
+            for future in done:
+                if future.exception() is not None:
+                    raise future.exception()
+
+    def _logged(
+        self, body: str, span: str, attributes: dict, upload: Callable
+    ) -> Logger:
+        """
+        Runs `upload` in a trace-`span` and returns a log with the
+        result (starting with `body`).
+        """
+        log = Logger(default_origin="S3 Transport")
+        log.log(Context.EVENT, body=body)
+        try:
+            with self.tracer.span(
+                span, attributes | {"s3.bucket": self.bucket}
+            ):
+                upload()
+        # pylint: disable=broad-exception-caught
+        except Exception as exc_info:
+            log.log(
+                Context.ERROR, body=f"{type(exc_info).__name__}: {exc_info}"
+            )
+            log.log(
+                Context.EVENT, body="Error encountered during transfer."
+            )
+            return log
+        log.log(Context.EVENT, body="Transfer complete.")
+        return log
+
+    def transfer(
+        self,
+        src: Path,
+        dst: Path,
+        progress_file: Optional[TextIO | Path] = None,
+        **options: Any,
+    ) -> Logger:
+        files = self._files(src)
+
+        def entries():
+            for relative, path, size in files:
+                with path.open("rb") as file:
+                    yield relative, size, file
+
+        stream = (
+            io.open(  # pylint: disable=consider-using-with
+                progress_file, "w", encoding="utf-8"
+            )
+            if isinstance(progress_file, Path)
+            else progress_file
+        )
+        try:
+            return self._logged(
+                f"Starting transfer of '{src}'.",
+                "S3Transport.transfer",
+                {
+                    "transfer.source": str(src),
+                    "transfer.destination": str(dst),
+                },
+                lambda: self._transfer(
+                    dst,
+                    entries(),
+                    ProgressWriter(
+                        stream, sum(size for _, _, size in files), len(files)
+                    ),
+                    options.get("mirror", False),
+                    options.get("resume", False),
+                    options.get("parallelism"),
+                ),
+            )
+        finally:
+            if isinstance(progress_file, Path):
+                stream.close()
+
+    def receive(self, stream: BinaryIO, dst: Path, **options: Any) -> Logger:
+        # objects are uploaded directly from the archive
+        def entries():
+            with tarfile.open(fileobj=stream, mode="r|") as tar:
+                for member in tar:
+                    if member.isfile():
+                        yield (
+                            member_name(member),
+                            member.size,
+                            tar.extractfile(member),
+                        )
+
+        return self._logged(
+            f"Starting transfer into '{dst}'.",
+            "S3Transport.receive",
+            {"transfer.destination": str(dst)},
+            lambda: self._transfer(
+                dst,
+                entries(),
+                ProgressWriter(None, 0, 0),
+                options.get("mirror", False),
+                options.get("resume", False),
+                options.get("parallelism"),
+                # stop uploading as soon as the stream is aborted
+                lambda: getattr(stream, "aborted", False),
+            ),
+        )
+
+    def _transfer(
+        self,
+        dst: Path,
+        entries: Iterable[tuple[str, int, BinaryIO]],
+        progress: ProgressWriter,
+        mirror: bool,
+        resume: bool,
+        concurrency: Optional[int] = None,
+        aborted: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Uploads `entries` (tuples of relative path, size, and readable
+        file) into `dst` with up to `concurrency` (default
+        `max_concurrency`) concurrent requests; raises errors of the
+        client. Incomplete multipart uploads are aborted if `aborted`
+        returns `True` while waiting for a free request.
+        """
+        concurrency = concurrency or self.max_concurrency
+        existing = (
+            {obj["Key"]: obj["Size"] for obj in self._objects(dst)}
+            if mirror or resume
+            else {}
+        )
+        keys = set()
+        # limits the number of buffered parts
+        slots = BoundedSemaphore(concurrency)
+        futures: list[Future] = []
+        uploads: dict[str, tuple[str, list[Future]]] = {}
+
+        def submit(pool, size, complete, function, *args) -> Future:
+            # wait for a free slot in the upload queue
+            while not slots.acquire(timeout=self.poll_interval):
+                if aborted is not None and aborted():
+                    raise OSError("Reading the source has been aborted.")
+            future = pool.submit(function, *args)
+
+            def done(future: Future):
+                slots.release()
+                if not future.cancelled() and future.exception() is None:
+                    progress.advance(size, complete)
+
+            future.add_done_callback(done)
+            futures.append(future)
+            return future
+
+        pool = ThreadPoolExecutor(concurrency)
+        try:
+            for relative, size, file in entries:
+                key = self.object_key(dst, relative)
+                keys.add(key)
+                if resume and existing.get(key) == size:
+                    progress.advance(size, True)
+                    continue
+                if size <= self.part_size:
+                    data = file.read(size + 1)
+                    if len(data) != size:
+                        raise _changed(key)
+                    submit(pool, size, True, self._put, key, data)
+                    continue
+                upload_id = self.client.create_multipart_upload(
+                    Bucket=self.bucket, Key=key, ChecksumAlgorithm="SHA256"
+                )["UploadId"]
+                parts = []
+                uploads[key] = (upload_id, parts)
+                remaining = size
+                for number in count(1):
+                    data = file.read(min(self.part_size, remaining))
+                    if not data:
+                        # file has shrunk; abort upload (see below)
+                        raise _changed(key)
+                    remaining -= len(data)
+                    parts.append(
+                        submit(
+                            pool, len(data), remaining <= 0,
+                            self._upload_part, key, upload_id, number, data,
+                        )
+                    )
+                    del data
+                    if remaining <= 0:
+                        break
+                if file.read(1):
+                    raise _changed(key)
+                # fail early
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+                futures = [future for future in futures if not future.done()]
+            self._wait(futures)
+            for key, (upload_id, parts) in list(uploads.items()):
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={
+                        "Parts": [part.result() for part in parts]
+                    },
+                )
+                del uploads[key]
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            # discard incomplete multipart uploads (best effort)
+            for key, (upload_id, _) in uploads.items():
+                try:
+                    self.client.abort_multipart_upload(
+                        Bucket=self.bucket, Key=key, UploadId=upload_id
+                    )
+                # pylint: disable=broad-exception-caught
+                except Exception:
+                    pass
+        progress.close()
+        if mirror:
+            errors = self._delete(
+                [key for key in existing if key not in keys]
+            )
+            if errors:
+                raise RuntimeError(
+                    "Unable to delete objects: " + "; ".join(errors)
+                )
+
+    def verify(self, src: Path, dst: Path) -> Logger:
+        log = Logger(default_origin="S3 Transport")
+        differences = []
+        try:
+            objects = {obj["Key"]: obj for obj in self._objects(dst)}
+            for relative, path, size in self._files(src):
+                name = relative or path.name
+                obj = objects.pop(self.object_key(dst, relative), None)
+                if obj is None:
+                    differences.append(f"'{name}' is missing")
+                    continue
+                if obj["Size"] != size:
+                    differences.append(f"'{name}' differs in size")
+                    continue
+                checksum = self.client.head_object(
+                    Bucket=self.bucket, Key=obj["Key"], ChecksumMode="ENABLED"
+                ).get("ChecksumSHA256")
+                if checksum != object_checksum(path, self.part_size):
+                    differences.append(f"'{name}' differs in checksum")
+            differences.extend(
+                f"unexpected object '{key}'" for key in sorted(objects)
+            )
+        # pylint: disable=broad-exception-caught
+        except Exception as exc_info:
+            log.log(
+                Context.ERROR,
+                body="Unable to verify transfer "
+                + f"({type(exc_info).__name__}: {exc_info}).",
+            )
+            return log
+        if not differences:
+            log.log(Context.INFO, body=f"Verified transfer of '{src}'.")
+            return log
+        for difference in differences[:10]:
+            log.log(
+                Context.ERROR, body=f"Mismatch after transfer: {difference}"
+            )
+        log.log(
+            Context.ERROR,
+            body=f"Verification of transfer of '{src}' failed "
+            + f"({len(differences)} differing item(s)).",
+        )
+        return log
+
+
+register_transport("s3", S3Transport.from_config)
@@ -0,0 +1,158 @@
+"""
+This module defines the `RemoteSemaphore` component of the Transfer
+Module-app.
+
+It limits the number of concurrent connections to a remote across all
+processes of a host by means of advisory file locks.
+"""
+
+from typing import Optional, Callable
+import os
+from pathlib import Path
+import fcntl
+import re
+from time import time, sleep
+
+
+class SemaphoreSlot:
+    """
+    Record class for an acquired slot of a `RemoteSemaphore`. The slot
+    is held until `release` is called (or the process exits).
+
+    Can be used as context manager.
+
+    Keyword arguments:
+    index -- index of the slot
+    fd -- file descriptor holding the lock; `None` for a dummy slot
+    """
+
+    def __init__(self, index: int, fd: Optional[int]) -> None:
+        self.index = index
+        self._fd = fd
+
+    @property
+    def held(self) -> bool:
+        """Returns `True` if the slot has not been released yet."""
+        return self._fd is not None
+
+    def release(self) -> None:
+        """Releases the slot (no-op if already released)."""
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "SemaphoreSlot":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.release()
+
+
+class RemoteSemaphore:
+    """
+    A `RemoteSemaphore` provides a counting semaphore for connections
+    to a single remote that is shared by all processes using the same
+    `directory`. Every slot corresponds to a lock-file; a slot is taken
+    while a process holds an exclusive `flock` on that file. Since
+    locks are bound to open file descriptions, slots are freed
+    automatically if the owning process dies.
+
+    Keyword arguments:
+    directory -- directory for lock-files (shared by all processes)
+    key -- identifier of the remote (e.g. 'user@host:port')
+    slots -- maximum number of concurrent connections; a value of 0
+             disables the limit
+    """
+
+    def __init__(self, directory: Path, key: str, slots: int) -> None:
+        self._directory = directory
+        self._key = re.sub(r"[^a-zA-Z0-9_.@-]", "_", key)
+        self._slots = slots
+
+    @property
+    def key(self) -> str:
+        """Returns the (file-name safe) identifier of the remote."""
+        return self._key
+
+    @property
+    def slots(self) -> int:
+        """Returns the maximum number of concurrent connections."""
+        return self._slots
+
+    def _slot_file(self, index: int) -> Path:
+        return self._directory / f"{self._key}.{index}.lock"
+
+    def try_acquire(
+        self, limit: Optional[int] = None
+    ) -> Optional[SemaphoreSlot]:
+        """
+        Attempts to acquire a slot without blocking. Returns a
+        `SemaphoreSlot` on success or `None` if all slots are taken.
+
+        If the semaphore is unlimited, a dummy slot is returned.
+
+        Keyword arguments:
+        limit -- only consider the first `limit` slots (e.g. to keep
+                 the remaining slots free for jobs of higher priority)
+                 (default None; all slots)
+        """
+        if self._slots <= 0:
+            return SemaphoreSlot(-1, None)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        for index in range(
+            self._slots if limit is None else min(limit, self._slots)
+        ):
+            fd = os.open(
+                self._slot_file(index), os.O_RDWR | os.O_CREAT, 0o666
+            )
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return SemaphoreSlot(index, fd)
+        return None
+
+    def acquire(
+        self,
+        timeout: Optional[float] = None,
+        interval: float = 1.0,
+        on_wait: Optional[Callable[[], None]] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[SemaphoreSlot]:
+        """
+        Blocks until a slot is available and returns the corresponding
+        `SemaphoreSlot`. Returns `None` if `timeout` is exceeded.
+
+        Waiting is implemented by polling with the given `interval`,
+        i.e., a waiting job does not hold any connection or other
+        resources.
+
+        Keyword arguments:
+        timeout -- maximum duration in seconds to wait for a slot
+                   (default None; wait indefinitely)
+        interval -- polling interval in seconds
+                    (default 1.0)
+        on_wait -- callback that is executed once if the first attempt
+                   to acquire a slot fails
+                   (default None)
+        limit -- only consider the first `limit` slots (see
+                 `try_acquire`)
+                 (default None; all slots)
+        """
+        slot = self.try_acquire(limit)
+        if slot is not None:
+            return slot
+        if on_wait is not None:
+            on_wait()
+        time0 = time()
+        while timeout is None or time() - time0 < timeout:
+            sleep(interval)
+            slot = self.try_acquire(limit)
+            if slot is not None:
+                return slot
+        return None
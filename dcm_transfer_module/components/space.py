@@ -0,0 +1,179 @@
+"""
+This module defines the `SpaceLedger` component of the Transfer
+Module-app.
+
+It keeps track of the storage space at a remote that has been reserved
+by concurrent transfers across all processes of a host (shared ledger
+file protected by an advisory file lock).
+"""
+
+from typing import Optional
+import os
+from pathlib import Path
+from contextlib import contextmanager
+from uuid import uuid4
+from time import time
+import fcntl
+import json
+
+
+def directory_size(path: Path) -> int:
+    """
+    Returns the total size in bytes of all regular files in `path`
+    (or the size of `path` itself if it is a file). Symbolic links are
+    not followed.
+
+    Keyword arguments:
+    path -- file or directory
+    """
+    if not path.is_dir():
+        return path.stat().st_size if path.is_file() else 0
+    total = 0
+    pending = [path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+class SpaceReservation:
+    """
+    Record class for a reservation in a `SpaceLedger`. The reservation
+    is held until `release` is called (or the owning process exits).
+
+    Can be used as context manager.
+
+    Keyword arguments:
+    ledger -- the `SpaceLedger` (`None` for a dummy reservation)
+    id_ -- identifier of the reservation
+    size -- number of reserved bytes
+    """
+
+    def __init__(
+        self, ledger: Optional["SpaceLedger"], id_: str, size: int
+    ) -> None:
+        self._ledger = ledger
+        self.id = id_
+        self.size = size
+
+    @property
+    def held(self) -> bool:
+        """Returns `True` if the reservation has not been released."""
+        return self._ledger is not None
+
+    def release(self) -> None:
+        """Releases the reservation (no-op if already released)."""
+        if self._ledger is None:
+            return
+        try:
+            self._ledger.release(self.id)
+        finally:
+            self._ledger = None
+
+    def __enter__(self) -> "SpaceReservation":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.release()
+
+
+class SpaceLedger:
+    """
+    A `SpaceLedger` records space reservations of concurrent transfers
+    to a single remote in a JSON-file that is shared by all processes
+    using the same `file`. Reservations of processes that no longer
+    exist are dropped automatically.
+
+    Reservations are conservative: the full size of a transfer remains
+    reserved while the transfer is running, although the space that is
+    already occupied by its data is reflected in the free space of the
+    remote as well.
+
+    Keyword arguments:
+    file -- path to the ledger file
+    """
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+
+    @property
+    def _lock_file(self) -> Path:
+        return self.file.with_name(self.file.name + ".lock")
+
+    @contextmanager
+    def _locked(self):
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_file, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _read(self) -> dict[str, dict]:
+        try:
+            entries = json.loads(self.file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {
+            id_: entry
+            for id_, entry in entries.items()
+            if self._alive(entry.get("pid", -1))
+        }
+
+    def _write(self, entries: dict[str, dict]) -> None:
+        tmp = self.file.with_name(f".{self.file.name}.{os.getpid()}")
+        tmp.write_text(json.dumps(entries), encoding="utf-8")
+        tmp.replace(self.file)
+
+    def reserved(self) -> int:
+        """Returns the total number of currently reserved bytes."""
+        with self._locked():
+            return sum(entry["size"] for entry in self._read().values())
+
+    def reserve(
+        self, size: int, available: int, reserve: int = 0
+    ) -> Optional[SpaceReservation]:
+        """
+        Reserves `size` bytes if the `available` space minus `reserve`
+        and all existing reservations suffices. Returns a
+        `SpaceReservation` on success or `None` otherwise.
+
+        Keyword arguments:
+        size -- number of bytes to reserve
+        available -- currently available space at the remote in bytes
+        reserve -- number of bytes that should remain free
+                   (default 0)
+        """
+        with self._locked():
+            entries = self._read()
+            reserved = sum(entry["size"] for entry in entries.values())
+            if available - reserve - reserved < size:
+                return None
+            id_ = str(uuid4())
+            entries[id_] = {"size": size, "pid": os.getpid(), "at": time()}
+            self._write(entries)
+        return SpaceReservation(self, id_, size)
+
+    def release(self, id_: str) -> None:
+        """
+        Releases the reservation `id_` (see `SpaceReservation.release`).
+        """
+        with self._locked():
+            entries = self._read()
+            if entries.pop(id_, None) is not None:
+                self._write(entries)
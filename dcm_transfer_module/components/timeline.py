@@ -0,0 +1,123 @@
+"""
+This module defines the `FileTimeline` component of the Transfer
+Module-app.
+"""
+
+from typing import Optional
+from array import array
+from pathlib import Path
+import json
+
+
+class FileTimeline:
+    """
+    A `FileTimeline` records the per-file timing of a transfer in a
+    compact, array-backed form. A file is started with `start`; it ends
+    when the next file is started or with `finish`.
+
+    The byte-offset of a file is the value of `offset` at the time the
+    file is started. It is supposed to be kept up to date with the
+    total number of transferred bytes (e.g. by the progress parser).
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self._names: list[str] = []
+        self._offsets = array("q")
+        self._times = array("d")
+        self._end: Optional[tuple[int, float]] = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def names(self) -> list[str]:
+        """Returns the list of file names in order of transfer."""
+        return self._names
+
+    def start(self, name: str, time: float) -> None:
+        """
+        Marks the start of the file `name` (and the end of the
+        previous file).
+
+        Keyword arguments:
+        name -- file name
+        time -- time in seconds since start of transfer
+        """
+        self._names.append(name)
+        self._offsets.append(self.offset)
+        self._times.append(time)
+        self._end = None
+
+    def finish(self, time: float) -> None:
+        """
+        Marks the end of the last file.
+
+        Keyword arguments:
+        time -- time in seconds since start of transfer
+        """
+        self._end = (self.offset, time)
+
+    def _boundaries(self, values: array, end: int | float) -> array:
+        result = array(values.typecode, values[1:])
+        result.append(end)
+        for i, value in enumerate(values):
+            # offsets restart with every transfer attempt
+            result[i] = max(result[i] - value, 0)
+        return result
+
+    @property
+    def sizes(self) -> array:
+        """Returns an array of file sizes in bytes."""
+        if not self._names:
+            return array("q")
+        return self._boundaries(
+            self._offsets,
+            self.offset if self._end is None else self._end[0],
+        )
+
+    @property
+    def durations(self) -> array:
+        """
+        Returns an array of durations in seconds. The duration of an
+        unfinished last file is reported as zero.
+        """
+        if not self._names:
+            return array("d")
+        return self._boundaries(
+            self._times,
+            self._times[-1] if self._end is None else self._end[1],
+        )
+
+    @property
+    def json(self) -> dict:
+        """
+        Returns a column-oriented JSON-representation of the timeline
+        (file names, start times, sizes, durations, and throughput in
+        bytes per second).
+        """
+        sizes = self.sizes
+        durations = self.durations
+        return {
+            "files": self._names,
+            "start": self._times.tolist(),
+            "size": sizes.tolist(),
+            "duration": durations.tolist(),
+            "throughput": [
+                size / duration if duration > 0 else None
+                for size, duration in zip(sizes, durations)
+            ],
+        }
+
+    def write(self, path: Path) -> None:
+        """
+        Writes the timeline to `path` (as compact JSON). Missing parent
+        directories are created.
+
+        Keyword arguments:
+        path -- output file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(self.json, separators=(",", ":")), encoding="utf-8"
+        )
@@ -0,0 +1,298 @@
+"""
+This module defines the `Tracer` and `Span` components of the Transfer
+Module-app.
+
+Spans are exported to a local file in JSON Lines-format where every
+line is an OTLP/JSON `ExportTraceServiceRequest` containing a single
+span. Span context is propagated between processes as W3C
+`traceparent`-string.
+"""
+
+from typing import Optional, Any
+import os
+from pathlib import Path
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from secrets import token_hex
+from time import time_ns
+import json
+import re
+
+
+_CURRENT_SPAN: ContextVar[Optional["Span"]] = ContextVar(
+    "dcm_transfer_module_span", default=None
+)
+_TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}")
+_DISABLED = nullcontext()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[tuple[str, str]]:
+    """
+    Returns tuple of trace- and span-id represented by the W3C
+    `traceparent`-string `value` or `None` if it cannot be parsed.
+
+    Keyword arguments:
+    value -- `traceparent`-string
+    """
+    if value is None:
+        return None
+    match = _TRACEPARENT.fullmatch(value.strip())
+    if match is None or match.group(1) == "0" * 32:
+        return None
+    return match.group(1), match.group(2)
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class Span:
+    """
+    Record class for a single span.
+
+    Keyword arguments:
+    name -- name of the span
+    trace_id -- id of the trace (32 hex digits)
+    parent_id -- id of the parent span (16 hex digits)
+                 (default None)
+    attributes -- span attributes
+                  (default None)
+    start -- start time in nanoseconds since epoch
+             (default None; uses current time)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        attributes: Optional[dict[str, Any]] = None,
+        start: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.start = time_ns() if start is None else start
+        self.end: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        """Returns the W3C `traceparent`-string of this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Sets the attribute `key` to `value`."""
+        self.attributes[key] = value
+
+    @property
+    def json(self) -> dict:
+        """Returns the OTLP/JSON-representation of this span."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            **(
+                {"parentSpanId": self.parent_id}
+                if self.parent_id is not None
+                else {}
+            ),
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(
+                self.end if self.end is not None else time_ns()
+            ),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": (
+                {"code": 1}
+                if self.error is None
+                else {"code": 2, "message": self.error}
+            ),
+        }
+
+
+class Tracer:
+    """
+    A `Tracer` creates spans and appends them to the export file at
+    `path` as soon as they end. A `Tracer` without `path` is disabled;
+    in that case, `span` returns a shared no-op context manager.
+
+    Spans that are created while another span is active (in the same
+    thread or task) become children of that span. Across processes,
+    the context has to be passed explicitly (see `traceparent`).
+
+    Keyword arguments:
+    path -- export file (appended; parent directories are created if
+            needed)
+            (default None; disabled)
+    service_name -- service name that is written to the span resource
+                    (default 'dcm-transfer-module')
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        service_name: str = "dcm-transfer-module",
+    ) -> None:
+        self.path = path
+        self.service_name = service_name
+
+    @property
+    def enabled(self) -> bool:
+        """Returns `True` if spans are exported."""
+        return self.path is not None
+
+    @property
+    def current(self) -> Optional[Span]:
+        """Returns the currently active span (if any)."""
+        return _CURRENT_SPAN.get()
+
+    def traceparent(self) -> Optional[str]:
+        """
+        Returns the `traceparent`-string of the currently active span
+        (or `None` if there is none).
+        """
+        span = _CURRENT_SPAN.get()
+        return None if span is None else span.traceparent
+
+    def _new_span(
+        self,
+        name: str,
+        attributes: Optional[dict[str, Any]],
+        parent: Optional[str],
+        start: Optional[int] = None,
+    ) -> Span:
+        context = parse_traceparent(parent)
+        if context is None and (current := _CURRENT_SPAN.get()):
+            context = (current.trace_id, current.span_id)
+        if context is None:
+            return Span(name, token_hex(16), None, attributes, start)
+        return Span(name, context[0], context[1], attributes, start)
+
+    def span(
+        self,
+        name: str,
+        attributes: Optional[dict[str, Any]] = None,
+        parent: Optional[str] = None,
+    ):
+        """
+        Returns a context manager that records the span `name` and
+        yields the `Span` (or `None` if the tracer is disabled).
+
+        Keyword arguments:
+        name -- name of the span
+        attributes -- span attributes
+                      (default None)
+        parent -- `traceparent`-string of the parent span; if omitted
+                  or invalid, the currently active span is used as
+                  parent (if any)
+                  (default None)
+        """
+        if self.path is None:
+            return _DISABLED
+        return self._span(name, attributes, parent)
+
+    @contextmanager
+    def _span(
+        self,
+        name: str,
+        attributes: Optional[dict[str, Any]],
+        parent: Optional[str],
+    ):
+        span = self._new_span(name, attributes, parent)
+        token = _CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except BaseException as exc_info:
+            span.error = f"{type(exc_info).__name__}: {exc_info}"
+            raise
+        finally:
+            _CURRENT_SPAN.reset(token)
+            span.end = time_ns()
+            self.export(span)
+
+    def record(
+        self,
+        name: str,
+        start: int,
+        end: int,
+        attributes: Optional[dict[str, Any]] = None,
+        parent: Optional[str] = None,
+    ) -> None:
+        """
+        Exports a span with given start and end (e.g. for durations
+        that are not bound to a single process like queueing). No-op if
+        the tracer is disabled.
+
+        Keyword arguments:
+        name -- name of the span
+        start -- start time in nanoseconds since epoch
+        end -- end time in nanoseconds since epoch
+        attributes -- span attributes
+                      (default None)
+        parent -- `traceparent`-string of the parent span
+                  (default None)
+        """
+        if self.path is None:
+            return
+        span = self._new_span(name, attributes, parent, start)
+        span.end = end
+        self.export(span)
+
+    def export(self, span: Span) -> None:
+        """
+        Appends `span` to the export file. Errors are ignored, i.e.,
+        tracing never affects the instrumented code.
+
+        Keyword arguments:
+        span -- finished span
+        """
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": _otlp_attributes(
+                                {"service.name": self.service_name}
+                            )
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": "dcm_transfer_module"},
+                                "spans": [span.json],
+                            }
+                        ],
+                    }
+                ]
+            },
+            separators=(",", ":"),
+        )
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # a single write with O_APPEND keeps lines of concurrent
+            # processes intact
+            fd = os.open(
+                self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+            try:
+                os.write(fd, (line + "\n").encode("utf-8"))
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
@@ -6,15 +6,164 @@ Its implementation is based on the `SSHClient` class, which provides a
 simple interface for command execution on a remote system via SSH.
 """
 
-from typing import Optional, TextIO
+from typing import Optional, TextIO, BinaryIO, Iterable, Callable
 import os
 from pathlib import Path
 import subprocess
+import signal
 import io
+import tarfile
+import shlex
+import zlib
+import hashlib
 from shutil import rmtree
+from collections import OrderedDict, deque
+from threading import Thread, Event
+from time import monotonic, sleep
 
 from dcm_common import Logger, LoggingContext as Context
 
+from dcm_transfer_module.components.tracing import Tracer
+from dcm_transfer_module.components.fanout import (
+    extract_stream, ArchiveDigests
+)
+
+
+def _sha256(path: Path) -> str:
+    """Returns the hex-digest of the SHA256-checksum of file `path`."""
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while data := file.read(1024 * 1024):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class _MeteredReader:
+    """
+    Readable file-like that limits reading from `file` to `rate` bytes
+    per second on average (0 for no limit) and passes all data on to
+    `on_data`.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        rate: int = 0,
+        on_data: Optional[Callable[[bytes], None]] = None,
+    ) -> None:
+        self.file = file
+        self.rate = rate
+        self.on_data = on_data
+        self._start = monotonic()
+        self._total = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.file.read(size)
+        if data and self.on_data is not None:
+            self.on_data(data)
+        if data and self.rate > 0:
+            self._total += len(data)
+            delay = self._total / self.rate - (monotonic() - self._start)
+            if delay > 0:
+                sleep(delay)
+        return data
+
+
+class OutputCapture:
+    """
+    Bounded capture of line-based process output (e.g., stderr).
+
+    Lines are deduplicated and counted. Only the `maxlen` most recently
+    seen distinct lines are retained (ring buffer), such that memory
+    usage does not depend on the amount of output.
+
+    Lines can be passed on while they arrive via `on_line`. To keep
+    this bounded as well, only lines that are not currently retained
+    are passed on and at most `maxlen` of them. New lines are queued
+    and `on_line` is only executed by `flush`, i.e., in the thread that
+    calls `flush` and not in the one that consumes the output.
+
+    Keyword arguments:
+    maxlen -- maximum number of distinct lines to retain
+              (default 100)
+    on_line -- callback that is executed with new lines (see `flush`)
+               (default None)
+    """
+
+    def __init__(
+        self,
+        maxlen: int = 100,
+        on_line: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.maxlen = maxlen
+        self.on_line = on_line
+        self._lines: OrderedDict[str, int] = OrderedDict()
+        self._pending: deque[str] = deque()
+        self._passed: set[str] = set()
+        self.total = 0
+        self.dropped = 0
+        self.passed = 0
+
+    def add(self, line: str) -> None:
+        """
+        Adds `line` to the capture. Empty lines are ignored.
+
+        Keyword arguments:
+        line -- line of output (trailing whitespace is stripped)
+        """
+        line = line.rstrip()
+        if not line:
+            return
+        self.total += 1
+        if line in self._lines:
+            self._lines[line] += 1
+            self._lines.move_to_end(line)
+            return
+        self._lines[line] = 1
+        if len(self._lines) > self.maxlen:
+            self.dropped += self._lines.popitem(last=False)[1]
+        if self.on_line is not None and self.passed < self.maxlen:
+            self.passed += 1
+            self._passed.add(line)
+            self._pending.append(line)
+
+    def flush(self) -> None:
+        """
+        Executes `on_line` with all lines that have been queued since
+        the last call.
+        """
+        while self._pending:
+            self.on_line(self._pending.popleft())
+
+    def consume(self, stream: Iterable[str]) -> None:
+        """
+        Adds all lines from `stream` to the capture as they arrive.
+
+        Keyword arguments:
+        stream -- iterable of lines (e.g., text-mode pipe of a process)
+        """
+        for line in stream:
+            self.add(line)
+
+    def items(self, passed: bool = True) -> list[tuple[str, int]]:
+        """
+        Returns a list of retained lines and their number of
+        occurrences in order of their last occurrence.
+
+        Keyword arguments:
+        passed -- whether to include lines that have been passed on via
+                  `on_line`
+                  (default True)
+        """
+        return [
+            (line, count)
+            for line, count in self._lines.items()
+            if passed or line not in self._passed
+        ]
+
+    def __len__(self) -> int:
+        return self.total
+
 
 class SSHClient:
     """
@@ -37,6 +186,10 @@ class SSHClient:
                   (default False)
     default_options -- default options used in a transfer-call
                        (default None; corresponds to [])
+    tracer -- `Tracer` for instrumentation of remote queries
+              (default None)
+    command -- ssh client executable (e.g. a stand-in for testing)
+               (default 'ssh')
     """
     def __init__(
         self,
@@ -47,6 +200,8 @@ class SSHClient:
         fingerprint: Optional[tuple[str, str]] = None,
         batch_mode: Optional[bool] = False,
         default_options: Optional[list[str]] = None,
+        tracer: Optional[Tracer] = None,
+        command: str = "ssh",
     ) -> None:
         self._host = host
         self._user = user
@@ -58,11 +213,13 @@ class SSHClient:
             default_options
             if default_options is not None else []
         )
+        self.tracer = tracer or Tracer()
+        self._command = command
 
     @property
     def command(self):
         """Returns a string with the ssh client command."""
-        return "ssh"
+        return self._command
 
     @property
     def identity(self) -> list[str]:
@@ -131,17 +288,16 @@ class SSHClient:
             return ""
         return str(self._user or "") + ("@" if self._user else "") + self._host
 
-    def query_remote(self, cmd: str) -> subprocess.CompletedProcess:
+    def remote_command(self, cmd: str) -> list[str]:
         """
-        Run a command on the remote host and return the process's
-        `subprocess.CompletedProcess`-instance.
+        Returns the ssh client call that runs `cmd` on the remote host.
 
         Keyword arguments:
         cmd -- the command to run on the remote host
         """
         if not self._host:
             raise RuntimeError("This action requires a host.")
-        _cmd = (
+        return (
             [self.command]
             + self.default_options
             + self.fingerprint()
@@ -151,9 +307,26 @@ class SSHClient:
             + [self.destination]
             + [cmd]
         )
-        return subprocess.run(
-            _cmd, capture_output=True, check=False, text=True
-        )
+
+    def query_remote(self, cmd: str) -> subprocess.CompletedProcess:
+        """
+        Run a command on the remote host and return the process's
+        `subprocess.CompletedProcess`-instance.
+
+        Keyword arguments:
+        cmd -- the command to run on the remote host
+        """
+        _cmd = self.remote_command(cmd)
+        with self.tracer.span(
+            "SSHClient.query_remote",
+            {"ssh.destination": self.destination, "ssh.command": cmd},
+        ) as span:
+            result = subprocess.run(
+                _cmd, capture_output=True, check=False, text=True
+            )
+            if span is not None:
+                span.set_attribute("process.exit_code", result.returncode)
+        return result
 
 
 class TransferManager:
@@ -168,25 +341,53 @@ class TransferManager:
                   (default None)
     default_options -- default options used in a transfer-call
                        (default None; corresponds to
-                       ["-a", "--info=progress2"])
+                       ["-a", "--info=progress2", "--stats"])
+    max_stderr_lines -- maximum number of distinct stderr-lines of a
+                        transfer that are retained for the log
+                        (default 100)
+    tracer -- `Tracer` for instrumentation of transfers
+              (default None)
+    command -- rsync executable (e.g. a stand-in for testing)
+               (default 'rsync')
+    poll_interval -- interval in seconds for polling the rsync process
+                     (default 0.1)
+    terminate_timeout -- time in seconds the rsync process group is
+                         given to exit after SIGTERM before it is
+                         killed
+                         (default 5.0)
     """
 
     def __init__(
         self,
         ssh_client: Optional[SSHClient] = None,
         default_options: Optional[list[str]] = None,
+        max_stderr_lines: int = 100,
+        tracer: Optional[Tracer] = None,
+        command: str = "rsync",
+        poll_interval: float = 0.1,
+        terminate_timeout: float = 5.0,
     ):
         self._ssh_client = ssh_client
         self.default_options = (
             default_options
             if default_options is not None
-            else ["-a", "--info=progress2"]
+            else ["-a", "--info=progress2", "--stats"]
         )
+        self.max_stderr_lines = max_stderr_lines
+        self.tracer = tracer or Tracer()
+        self._command = command
+        self.poll_interval = poll_interval
+        self.terminate_timeout = terminate_timeout
 
     @property
     def command(self):
         """Returns a string with the rsync client command."""
-        return "rsync"
+        return self._command
+
+    @property
+    def ssh_client(self) -> Optional[SSHClient]:
+        """Returns the `SSHClient` (`None` for local transfers)."""
+        return self._ssh_client
 
     def destination(self, dst: Path) -> str:
         """
@@ -217,6 +418,14 @@ class TransferManager:
             if self._ssh_client else []
         )
 
+    @property
+    def connection(self) -> list[str]:
+        """
+        Returns a list of arguments that configure the connection to
+        the remote in an rsync call (defaults to `shell`).
+        """
+        return self.shell
+
     def compression(
         self,
         use_compression: bool = False,
@@ -271,6 +480,35 @@ class TransferManager:
             f"[ -d '{dst}' ]"
         ).returncode == 0
 
+    def free_space(self, dst: Path) -> Optional[int]:
+        """
+        Returns the number of bytes that are available to unprivileged
+        users at `dst` in remote (or `None` if this cannot be
+        determined).
+
+        If an SSHClient is set, the free space is queried on the remote
+        host via `df`. Otherwise, `os.statvfs` is used locally.
+
+        Keyword arguments:
+        dst -- existing directory in remote
+        """
+        if not self._ssh_client:
+            try:
+                stat = os.statvfs(dst)
+            except OSError:
+                return None
+            return stat.f_bavail * stat.f_frsize
+        query = self._ssh_client.query_remote(
+            f"df -Pk {shlex.quote(str(dst))}"
+        )
+        if query.returncode != 0:
+            return None
+        try:
+            # POSIX-format: 'Filesystem 1024-blocks Used Available ..'
+            return int(query.stdout.strip().splitlines()[-1].split()[3]) * 1024
+        except (IndexError, ValueError):
+            return None
+
     def rm(self, target: Path) -> tuple[int, str, str]:
         """
         Attempts to force delete `target` in remote.
@@ -306,7 +544,9 @@ class TransferManager:
         mirror: bool = False,
         partial: bool = False,
         resume: bool = False,
-        bwlimit: int = 0
+        bwlimit: int = 0,
+        file_names: bool = False,
+        on_stderr: Optional[Callable[[str], None]] = None,
     ) -> Logger:
         """
         Performs a synchronous file transfer from `src` to `dst`.
@@ -333,10 +573,501 @@ class TransferManager:
                   (default False)
         bwlimit -- maximum transfer rate in units of 1024 bytes
                    (default 0 specifies no limit)
+        file_names -- whether to write names of transferred files into
+                      `progress_file` (`--info=name1`)
+                      (default False)
+        on_stderr -- callback that is executed in the calling thread
+                     with messages from rsync's stderr while the
+                     transfer is running (see `OutputCapture`); these
+                     messages are not repeated in the returned log
+                     (default None)
+        """
+        _cmd = self.build_command(
+            src,
+            dst,
+            transfer_timeout=transfer_timeout,
+            use_compression=use_compression,
+            compression_level=compression_level,
+            validate_checksums=validate_checksums,
+            mirror=mirror,
+            partial=partial,
+            resume=resume,
+            bwlimit=bwlimit,
+            file_names=file_names,
+        )
+
+        # Initialize log
+        log = Logger(default_origin="Transfer Manager")
+
+        if progress_file is None:
+            _stdout = subprocess.DEVNULL
+        elif isinstance(progress_file, Path):
+            _stdout = io.open(  # pylint: disable=consider-using-with
+                progress_file, "w", encoding="utf-8"
+            )
+        else:
+            _stdout = progress_file
+
+        log.log(
+            Context.EVENT,
+            body=f"Starting transfer of '{src}'."
+        )
+
+        # Run command and consume stderr while running
+        stderr = OutputCapture(self.max_stderr_lines, on_stderr)
+        try:
+            with self.tracer.span(
+                "TransferManager.transfer",
+                {
+                    "transfer.source": str(src),
+                    "transfer.destination": str(dst),
+                },
+            ) as span, subprocess.Popen(
+                _cmd,
+                stdout=_stdout,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors="replace",
+                # own process group to reach the remote shell as well
+                start_new_session=True,
+            ) as process:
+                reader = Thread(
+                    target=stderr.consume, args=(process.stderr,), daemon=True
+                )
+                reader.start()
+                try:
+                    returncode = self._wait(process, stderr)
+                except BaseException:
+                    # e.g. job has been aborted
+                    self.terminate(process)
+                    raise
+                finally:
+                    reader.join(self.terminate_timeout)
+                stderr.flush()
+                if span is not None:
+                    span.set_attribute("process.exit_code", returncode)
+        finally:
+            if isinstance(progress_file, Path):
+                _stdout.close()
+
+        self._log_result(log, stderr, returncode)
+        return log
+
+    def verify(
+        self, src: Path, dst: Path, max_differences: int = 10
+    ) -> Logger:
+        """
+        Compares `src` and `dst` based on checksums with a dry run of
+        rsync (`-n -c -i --delete`) and returns a log with the result.
+        Differences are logged as errors.
+
+        Keyword arguments:
+        src -- source file/directory of a previous transfer
+        dst -- target file/directory of a previous transfer
+        max_differences -- maximum number of differing items that are
+                           listed in the log
+                           (default 10)
         """
         _cmd = (
             [self.command]
-            + self.shell
+            + self.connection
+            + ["-a", "-n", "-c", "-i", "--delete"]
+            + [f"{src.resolve()}{os.sep if src.is_dir() else ''}"]
+            + [self.destination(dst)]
+        )
+        log = Logger(default_origin="Transfer Manager")
+        with self.tracer.span(
+            "TransferManager.verify",
+            {
+                "transfer.source": str(src),
+                "transfer.destination": str(dst),
+            },
+        ) as span:
+            result = subprocess.run(
+                _cmd, capture_output=True, check=False, text=True,
+                errors="replace",
+            )
+            if span is not None:
+                span.set_attribute("process.exit_code", result.returncode)
+        if result.returncode != 0:
+            capture = OutputCapture(self.max_stderr_lines)
+            capture.consume(result.stderr.splitlines())
+            self._log_output(log, capture, Context.ERROR)
+            log.log(
+                Context.ERROR,
+                body="Unable to verify transfer "
+                + f"(exit code {result.returncode}).",
+            )
+            return log
+        # itemized changes (ignore attribute-only changes of directories)
+        differences = [
+            line
+            for line in result.stdout.splitlines()
+            if line.strip() and not line.startswith(".d")
+        ]
+        if not differences:
+            log.log(
+                Context.INFO, body=f"Verified transfer of '{src}'."
+            )
+            return log
+        for line in differences[:max_differences]:
+            log.log(Context.ERROR, body=f"Mismatch after transfer: {line}")
+        log.log(
+            Context.ERROR,
+            body=f"Verification of transfer of '{src}' failed "
+            + f"({len(differences)} differing item(s)).",
+        )
+        return log
+
+    def receive(
+        self,
+        stream: BinaryIO,
+        dst: Path,
+        transfer_timeout: Optional[int] = None,
+        use_compression: bool = False,
+        compression_level: Optional[int] = None,
+        validate_checksums: bool = False,
+        mirror: bool = False,
+        partial: bool = False,
+        resume: bool = False,
+        bwlimit: int = 0,
+        file_names: bool = False,
+        on_stderr: Optional[Callable[[str], None]] = None,
+        chunk_size: int = 1024 * 1024,
+    ) -> Logger:
+        """
+        Extracts the tar-archive `stream` (see `FanOut`) into the
+        directory `dst` in remote and returns a log (errors indicate
+        failure).
+
+        If an SSHClient is set, the archive is piped into `tar` on the
+        remote host; the remote is terminated as soon as `stream` is
+        aborted (attribute `aborted`, see `FanOut`). Otherwise, it is
+        extracted locally.
+
+        The options of `transfer` are applied as far as they apply to
+        an archive that is always extracted completely, i.e.,
+        `partial`, `resume`, and `file_names` have no effect.
+
+        Keyword arguments:
+        stream -- readable binary stream
+        dst -- target directory
+        transfer_timeout -- time in seconds the remote may block the
+                            archive (or take to exit afterwards) before
+                            it is terminated
+                            (default None)
+        use_compression -- whether to gzip-compress the archive for the
+                           remote
+                           (default False)
+        compression_level -- compression level
+                             (default None; corresponds to 6)
+        validate_checksums -- whether to compare the SHA256-digests of
+                              the extracted files with the archive's
+                              (default False)
+        mirror -- whether to clear `dst` before the extraction
+                  (default False)
+        bwlimit -- maximum rate at which the archive is read in units of
+                   1024 bytes
+                   (default 0 specifies no limit)
+        on_stderr -- callback for messages from the remote's stderr
+                     (see `transfer`)
+                     (default None)
+        chunk_size -- size of chunks in bytes that are passed on to the
+                      remote
+                      (default 1 MiB)
+        """
+        # pylint: disable=unused-argument
+        log = Logger(default_origin="Transfer Manager")
+        log.log(Context.EVENT, body=f"Starting transfer into '{dst}'.")
+        digests = ArchiveDigests() if validate_checksums else None
+        reader = _MeteredReader(
+            stream,
+            bwlimit * 1024,
+            None if digests is None else digests.feed,
+        )
+        try:
+            if not self._ssh_client:
+                returncode = self._receive_local(log, reader, dst, mirror)
+            else:
+                returncode = self._receive_remote(
+                    log,
+                    reader,
+                    dst,
+                    transfer_timeout,
+                    self.compression(use_compression, compression_level),
+                    mirror,
+                    on_stderr,
+                    chunk_size,
+                    lambda: getattr(stream, "aborted", False),
+                )
+            if digests is not None and returncode == 0:
+                try:
+                    expected = digests.close()
+                except ValueError as exc_info:
+                    log.log(Context.ERROR, body=str(exc_info))
+                    returncode = 1
+                else:
+                    if not self._validate(log, dst, expected):
+                        returncode = 1
+        finally:
+            if digests is not None:
+                digests.abort()
+        log.log(
+            Context.EVENT,
+            body=(
+                "Transfer complete."
+                if returncode == 0
+                else "Error encountered during transfer."
+            ),
+        )
+        return log
+
+    @staticmethod
+    def _receive_local(
+        log: Logger,
+        stream: BinaryIO,
+        dst: Path,
+        mirror: bool,
+    ) -> int:
+        """
+        Extracts `stream` into the local directory `dst` (see
+        `receive`) and returns an exit code.
+        """
+        try:
+            if mirror and dst.is_dir():
+                rmtree(dst)
+            extract_stream(stream, dst)
+        except (OSError, ValueError, tarfile.TarError) as exc_info:
+            log.log(
+                Context.ERROR,
+                body=f"Unable to extract into '{dst}': {exc_info}",
+            )
+            return 1
+        return 0
+
+    def _receive_remote(
+        self,
+        log: Logger,
+        stream: BinaryIO,
+        dst: Path,
+        timeout: Optional[int],
+        compression: list[str],
+        mirror: bool,
+        on_stderr: Optional[Callable[[str], None]],
+        chunk_size: int,
+        aborted: Callable[[], bool],
+    ) -> int:
+        """
+        Pipes `stream` into `tar` on the remote host (see `receive`) and
+        returns the exit code. The remote is terminated if it blocks
+        `stream` for longer than `timeout` or if `aborted` returns
+        `True`.
+        """
+        target = shlex.quote(str(dst))
+        command = (
+            (f"rm -rf {target} && " if mirror else "")
+            + f"mkdir -p {target} && "
+            + f"tar -x{'z' if compression else ''}f - -C {target}"
+        )
+        compressor = None
+        if compression:
+            compressor = zlib.compressobj(
+                int(compression[-1]) if len(compression) > 1 else 6,
+                wbits=31,  # gzip
+            )
+        stderr = OutputCapture(self.max_stderr_lines, on_stderr)
+        # time since which the remote is being waited for
+        blocked: list[Optional[float]] = [None]
+        timed_out = Event()
+
+        def watchdog(process: subprocess.Popen):
+            while process.poll() is None:
+                since = blocked[0]
+                if (
+                    timeout
+                    and since is not None
+                    and monotonic() - since > timeout
+                ):
+                    timed_out.set()
+                    self.terminate(process)
+                    return
+                if aborted():
+                    self.terminate(process)
+                    return
+                sleep(self.poll_interval)
+
+        with self.tracer.span(
+            "TransferManager.receive", {"transfer.destination": str(dst)}
+        ) as span, subprocess.Popen(
+            self._ssh_client.remote_command(command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            # own process group to reach the remote shell as well
+            start_new_session=True,
+        ) as process:
+            threads = [
+                Thread(
+                    target=stderr.consume,
+                    args=(
+                        io.TextIOWrapper(
+                            process.stderr, encoding="utf-8", errors="replace"
+                        ),
+                    ),
+                    daemon=True,
+                ),
+                Thread(target=watchdog, args=(process,), daemon=True),
+            ]
+            for thread in threads:
+                thread.start()
+
+            def send(data: bytes) -> None:
+                blocked[0] = monotonic()
+                process.stdin.write(data)
+                process.stdin.flush()
+                blocked[0] = None
+
+            try:
+                try:
+                    while chunk := stream.read(chunk_size):
+                        send(
+                            chunk
+                            if compressor is None
+                            else compressor.compress(chunk)
+                        )
+                    if compressor is not None:
+                        send(compressor.flush())
+                except BrokenPipeError:
+                    # remote has exited, see exit code
+                    pass
+                finally:
+                    blocked[0] = monotonic()
+                    try:
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                returncode = self._wait(process, stderr)
+            except BaseException:
+                # e.g. source is not available anymore or job aborted
+                self.terminate(process)
+                raise
+            finally:
+                for thread in threads:
+                    thread.join(self.terminate_timeout)
+            stderr.flush()
+            if span is not None:
+                span.set_attribute("process.exit_code", returncode)
+        if timed_out.is_set():
+            log.log(
+                Context.ERROR,
+                body=f"Remote has not responded for {timeout}s, the "
+                + "transfer has been terminated.",
+            )
+        elif aborted():
+            log.log(
+                Context.ERROR,
+                body="Reading the source has been aborted, the transfer "
+                + "has been terminated.",
+            )
+        elif returncode != 0 and not stderr.items(passed=False):
+            log.log(
+                Context.ERROR,
+                body=f"Remote exited with exit code {returncode}.",
+            )
+        self._log_output(
+            log, stderr, Context.WARNING if returncode == 0 else Context.ERROR
+        )
+        return returncode
+
+    def _digests(self, log: Logger, dst: Path) -> Optional[dict[str, str]]:
+        """
+        Returns the SHA256-digests of the files in `dst` (or `None` if
+        they are not available).
+        """
+        if not self._ssh_client:
+            return {
+                path.relative_to(dst).as_posix(): _sha256(path)
+                for path in dst.glob("**/*")
+                if path.is_file() and not path.is_symlink()
+            }
+        result = self._ssh_client.query_remote(
+            f"cd {shlex.quote(str(dst))} && "
+            + "find . -type f -exec sha256sum {} +"
+        )
+        if result.returncode != 0:
+            log.log(
+                Context.ERROR,
+                body=f"Unable to compute checksums in '{dst}' "
+                + f"(exit code {result.returncode}): "
+                + result.stderr.strip(),
+            )
+            return None
+        digests = {}
+        for line in result.stdout.splitlines():
+            digest, _, name = line.partition("  ")
+            digests[name.removeprefix("./")] = digest
+        return digests
+
+    def _validate(
+        self,
+        log: Logger,
+        dst: Path,
+        expected: dict[str, str],
+        max_differences: int = 10,
+    ) -> bool:
+        """
+        Compares the `expected` digests of files with the digests of
+        the files in `dst` and logs mismatches as errors. Returns `True`
+        if all files match.
+        """
+        actual = self._digests(log, dst)
+        if actual is None:
+            return False
+        mismatches = sorted(
+            name
+            for name, digest in expected.items()
+            if actual.get(name) != digest
+        )
+        if not mismatches:
+            log.log(
+                Context.INFO,
+                body=f"Validated checksums of {len(expected)} file(s) in "
+                + f"'{dst}'.",
+            )
+            return True
+        for name in mismatches[:max_differences]:
+            log.log(
+                Context.ERROR,
+                body=f"Checksum mismatch after transfer: '{name}'",
+            )
+        log.log(
+            Context.ERROR,
+            body=f"Validation of checksums in '{dst}' failed "
+            + f"({len(mismatches)} differing file(s)).",
+        )
+        return False
+
+    def build_command(
+        self,
+        src: Path,
+        dst: Path,
+        transfer_timeout: Optional[int] = None,
+        use_compression: bool = False,
+        compression_level: Optional[int] = None,
+        validate_checksums: bool = False,
+        mirror: bool = False,
+        partial: bool = False,
+        resume: bool = False,
+        bwlimit: int = 0,
+        file_names: bool = False,
+    ) -> list[str]:
+        """
+        Returns the rsync command for a transfer from `src` to `dst`
+        (see `transfer` for details on the keyword arguments).
+        """
+        return (
+            [self.command]
+            + self.connection
             + self.compression(
                 use_compression, compression_level
             )
@@ -347,6 +1078,7 @@ class TransferManager:
             + (["--partial"] if partial else [])
             + (["--append"] if resume else [])
             + ["--bwlimit=" + str(bwlimit)]
+            + (["--info=name1"] if file_names else [])
             + self.default_options
             # os.sep to ensure trailing slash for directories
             # if omitted and destination dir already exists, rsync
@@ -356,42 +1088,23 @@ class TransferManager:
             + [self.destination(dst)]
         )
 
-        # Initialize log
-        log = Logger(default_origin="Transfer Manager")
-
-        if progress_file is None:
-            _stdout = subprocess.DEVNULL
-        elif isinstance(progress_file, Path):
-            _stdout = io.open(  # pylint: disable=consider-using-with
-                progress_file, "w", encoding="utf-8"
+    def _log_result(
+        self, log: Logger, stderr: OutputCapture, returncode: int
+    ) -> None:
+        """Writes the captured `stderr` and the result into `log`."""
+        if returncode != 0 and not stderr.items(passed=False):
+            # messages (if any) have already been passed on
+            log.log(
+                Context.ERROR,
+                body=f"rsync exited with exit code {returncode}.",
             )
-        else:
-            _stdout = progress_file
-
-        log.log(
-            Context.EVENT,
-            body=f"Starting transfer of '{src}'."
+        self._log_output(
+            log,
+            stderr,
+            Context.WARNING if returncode == 0 else Context.ERROR,
         )
 
-        # Run command
-        result = subprocess.run(
-            _cmd,
-            check=False,
-            stdout=_stdout,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-
-        # Write the stderr in the log
-        if result.stderr != "":
-            for line in result.stderr.strip().split("\n"):
-                log.log(
-                    (Context.WARNING if result.returncode == 0
-                        else Context.ERROR),
-                    body=line
-                )
-
-        if result.returncode == 0:
+        if returncode == 0:
             log.log(
                 Context.EVENT,
                 body="Transfer complete."
@@ -402,4 +1115,63 @@ class TransferManager:
                 body="Error encountered during transfer."
             )
 
-        return log
+    def _wait(
+        self,
+        process: subprocess.Popen,
+        capture: Optional[OutputCapture] = None,
+    ) -> int:
+        """
+        Waits for `process` to exit and returns its exit code. New lines
+        in `capture` are passed on in the meantime (see
+        `OutputCapture.flush`).
+        """
+        while True:
+            if capture is not None:
+                capture.flush()
+            try:
+                return process.wait(timeout=self.poll_interval)
+            except subprocess.TimeoutExpired:
+                pass
+
+    def terminate(self, process: subprocess.Popen) -> None:
+        """
+        Terminates the process group of `process` (rsync and remote
+        shell): SIGTERM first, SIGKILL after `terminate_timeout`.
+
+        Keyword arguments:
+        process -- process that has been started in a new session
+        """
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        try:
+            process.wait(timeout=self.terminate_timeout)
+        except subprocess.TimeoutExpired:
+            pass
+        try:
+            # remaining members of the group (if any)
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.wait()
+
+    @staticmethod
+    def _log_output(
+        log: Logger, capture: OutputCapture, context: Context
+    ) -> None:
+        """
+        Writes the contents of `capture` into `log` using `context`.
+        Lines that have already been passed on are omitted.
+        """
+        for line, count in capture.items(passed=False):
+            log.log(
+                context,
+                body=line + (f" (repeated {count} times)" if count > 1 else "")
+            )
+        if capture.dropped > 0:
+            log.log(
+                context,
+                body=f"{capture.dropped} more message(s) omitted "
+                + f"({capture.total} in total)."
+            )
@@ -0,0 +1,353 @@
+"""
+This module defines the `Transport`-interface for transport backends
+of the Transfer Module-app as well as a registry of the available
+backends.
+
+A backend implements all operations that a transfer-job performs on
+the remote: a preflight (connection test and preparation of the
+destination), existence check, removal, free space query, the actual
+transfer (with progress), receiving a streamed archive (see `FanOut`;
+optional), and verification. The progress written by
+a backend is expected in the format of `rsync --info=progress2` (see
+`RsyncParser`).
+"""
+
+from typing import Optional, Any, Callable, TextIO, BinaryIO
+import abc
+from pathlib import Path
+
+from dcm_common import Logger
+
+from dcm_transfer_module.components.transfer import (
+    SSHClient, TransferManager
+)
+from dcm_transfer_module.components.tracing import Tracer
+
+
+class Transport(metaclass=abc.ABCMeta):
+    """
+    Interface for transport backends.
+
+    The options of `transfer` are hints; backends ignore options that
+    do not apply to them.
+    """
+
+    @property
+    @abc.abstractmethod
+    def key(self) -> str:
+        """
+        Returns an identifier of the remote (used, e.g., for limiting
+        the number of concurrent connections across processes).
+        """
+        raise NotImplementedError(
+            f"Class '{self.__class__.__name__}' does not define property "
+            + "'key'."
+        )
+
+    @property
+    def remote(self) -> bool:
+        """
+        Returns `True` if the backend connects to a remote (enables
+        connection tests and health monitoring).
+        """
+        return True
+
+    @property
+    def description(self) -> str:
+        """Returns a human-readable description of the remote."""
+        return self.key
+
+    @property
+    def streaming(self) -> bool:
+        """
+        Returns `True` if the backend supports `receive`, i.e., writing
+        a streamed archive into the remote without staging it locally
+        (required for replicas).
+        """
+        return False
+
+    @abc.abstractmethod
+    def preflight(self, destination: Path) -> tuple[bool, str]:
+        """
+        Tests the connection to the remote and prepares `destination`
+        (if needed). Returns a tuple of success and a message.
+
+        Keyword arguments:
+        destination -- base directory for transfers in the remote
+        """
+        raise NotImplementedError(
+            f"Class '{self.__class__.__name__}' does not define method "
+            + "'preflight'."
+        )
+
+    @abc.abstractmethod
+    def exists(self, dst: Path) -> bool:
+        """Returns `True` if the target `dst` exists in the remote."""
+        raise NotImplementedError(
+            f"Class '{self.__class__.__name__}' does not define method "
+            + "'exists'."
+        )
+
+    @abc.abstractmethod
+    def remove(self, dst: Path) -> tuple[int, str, str]:
+        """
+        Removes the target `dst` in the remote. Returns a tuple of exit
+        code, stdout, and stderr.
+        """
+        raise NotImplementedError(
+            f"Class '{self.__class__.__name__}' does not define method "
+            + "'remove'."
+        )
+
+    def free_space(self, destination: Path) -> Optional[int]:
+        """
+        Returns the available space in bytes at `destination` in the
+        remote or `None` if not supported.
+        """
+        return None
+
+    @abc.abstractmethod
+    def transfer(
+        self,
+        src: Path,
+        dst: Path,
+        progress_file: Optional[TextIO | Path] = None,
+        **options: Any,
+    ) -> Logger:
+        """
+        Performs a synchronous transfer from `src` to `dst` and returns
+        a log (errors indicate failure).
+
+        Keyword arguments:
+        src -- source file/directory for transfer
+        dst -- target file/directory for transfer
+        progress_file -- output target to write progress information to
+                         (default None)
+        options -- transfer options; supported keys are
+                   `timeout`, `compression`, `compression_level`,
+                   `checksums`, `mirror`, `resume`, `bwlimit`,
+                   `parallelism`, `file_names`, and `on_stderr`
+                   (callback for diagnostic messages while the
+                   transfer is running); backends ignore options they
+                   do not support
+        """
+        raise NotImplementedError(
+            f"Class '{self.__class__.__name__}' does not define method "
+            + "'transfer'."
+        )
+
+    def receive(self, stream: BinaryIO, dst: Path, **options: Any) -> Logger:
+        """
+        Writes the contents of the tar-archive `stream` (see `FanOut`)
+        into `dst` and returns a log (errors indicate failure). Only
+        supported by `streaming` backends.
+
+        Keyword arguments:
+        stream -- readable binary stream
+        dst -- target directory
+        options -- transfer options (see `transfer`)
+        """
+        raise NotImplementedError(
+            f"Class '{self.__class__.__name__}' does not support method "
+            + "'receive'."
+        )
+
+    @abc.abstractmethod
+    def verify(self, src: Path, dst: Path) -> Logger:
+        """
+        Compares `src` with the transferred `dst` and returns a log
+        (errors indicate differences).
+        """
+        raise NotImplementedError(
+            f"Class '{self.__class__.__name__}' does not define method "
+            + "'verify'."
+        )
+
+
+class RsyncTransport(Transport):
+    """
+    Transport backend based on rsync (over ssh if the `TransferManager`
+    has an `SSHClient`, otherwise locally).
+
+    Keyword arguments:
+    transfer_manager -- `TransferManager` performing the transfers
+    key -- identifier of the remote
+           (default None; uses 'local' or the ssh destination)
+    """
+
+    def __init__(
+        self, transfer_manager: TransferManager, key: Optional[str] = None
+    ) -> None:
+        self.transfer_manager = transfer_manager
+        self.ssh_client = transfer_manager.ssh_client
+        if key is None:
+            key = (
+                "local"
+                if self.ssh_client is None
+                else self.ssh_client.destination
+            )
+        self._key = key
+
+    @classmethod
+    def from_config(
+        cls, config, tracer: Optional[Tracer] = None
+    ) -> "RsyncTransport":
+        """
+        Returns an `RsyncTransport` that is configured according to
+        `config` (see `AppConfig`).
+        """
+        ssh_client = (
+            None
+            if config.LOCAL_TRANSFER
+            else SSHClient(
+                host=config.SSH_HOSTNAME,
+                user=config.SSH_USERNAME,
+                port=config.SSH_PORT,
+                identity_file=config.SSH_IDENTITY_FILE.resolve(),
+                fingerprint=(
+                    (
+                        config.SSH_HOST_PUBLIC_KEY_ALGORITHM,
+                        config.SSH_HOST_PUBLIC_KEY,
+                    )
+                    if config.SSH_HOST_PUBLIC_KEY is not None
+                    else None
+                ),
+                batch_mode=config.SSH_BATCH_MODE,
+                default_options=(
+                    config.SSH_CLIENT_DEFAULT_OPTIONS
+                    + config.SSH_CLIENT_OPTIONS
+                ),
+                tracer=tracer,
+                command=config.SSH_COMMAND,
+            )
+        )
+        return cls(
+            TransferManager(
+                ssh_client,
+                default_options=(
+                    config.TRANSFER_DEFAULT_OPTIONS + config.TRANSFER_OPTIONS
+                ),
+                max_stderr_lines=config.TRANSFER_STDERR_BUFFER,
+                tracer=tracer,
+                command=config.RSYNC_COMMAND,
+                terminate_timeout=config.TRANSFER_TERMINATE_TIMEOUT,
+            ),
+            key=(
+                "local"
+                if ssh_client is None
+                else f"{ssh_client.destination}:{config.SSH_PORT}"
+            ),
+        )
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def remote(self) -> bool:
+        return self.ssh_client is not None
+
+    @property
+    def description(self) -> str:
+        return "local" if self.ssh_client is None else (
+            self.ssh_client.destination
+        )
+
+    @property
+    def streaming(self) -> bool:
+        return True
+
+    def preflight(self, destination: Path) -> tuple[bool, str]:
+        if self.ssh_client is None:
+            destination.mkdir(parents=True, exist_ok=True)
+            return True, ""
+        query = self.ssh_client.query_remote("echo 'ok'")
+        return query.returncode == 0, query.stderr
+
+    def exists(self, dst: Path) -> bool:
+        return self.transfer_manager.dir_exists(dst)
+
+    def remove(self, dst: Path) -> tuple[int, str, str]:
+        return self.transfer_manager.rm(dst)
+
+    def free_space(self, destination: Path) -> Optional[int]:
+        return self.transfer_manager.free_space(destination)
+
+    @staticmethod
+    def _options(
+        timeout: Optional[int] = None,
+        compression: bool = False,
+        compression_level: Optional[int] = None,
+        checksums: bool = False,
+        mirror: bool = False,
+        resume: bool = False,
+        bwlimit: int = 0,
+        file_names: bool = False,
+        on_stderr: Optional[Callable[[str], None]] = None,
+        **_,
+    ) -> dict[str, Any]:
+        """Maps transfer options onto `TransferManager.transfer`."""
+        return {
+            "transfer_timeout": timeout,
+            "use_compression": compression,
+            "compression_level": compression_level,
+            "validate_checksums": checksums,
+            "mirror": mirror,
+            "partial": resume,
+            "resume": resume,
+            "bwlimit": bwlimit,
+            "file_names": file_names,
+            "on_stderr": on_stderr,
+        }
+
+    def transfer(
+        self,
+        src: Path,
+        dst: Path,
+        progress_file: Optional[TextIO | Path] = None,
+        **options: Any,
+    ) -> Logger:
+        return self.transfer_manager.transfer(
+            src, dst, progress_file=progress_file, **self._options(**options)
+        )
+
+    def receive(self, stream: BinaryIO, dst: Path, **options: Any) -> Logger:
+        return self.transfer_manager.receive(
+            stream, dst, **self._options(**options)
+        )
+
+    def verify(self, src: Path, dst: Path) -> Logger:
+        return self.transfer_manager.verify(src, dst)
+
+
+_TRANSPORTS: dict[str, Callable[..., Transport]] = {}
+
+
+def register_transport(
+    name: str, factory: Callable[..., Transport]
+) -> None:
+    """
+    Registers a transport backend under `name`. The factory is called
+    with the app's configuration and a `Tracer` (keyword `tracer`).
+
+    Keyword arguments:
+    name -- identifier of the backend (value of `TRANSFER_TRANSPORT`)
+    factory -- callable returning a `Transport`
+    """
+    _TRANSPORTS[name] = factory
+
+
+def get_transport(name: str) -> Callable[..., Transport]:
+    """
+    Returns the factory of the transport backend `name`. Raises a
+    `ValueError` if the backend is unknown.
+    """
+    if name not in _TRANSPORTS:
+        raise ValueError(
+            f"Unknown transport '{name}' (available: "
+            + f"{', '.join(sorted(_TRANSPORTS))})."
+        )
+    return _TRANSPORTS[name]
+
+
+register_transport("rsync", RsyncTransport.from_config)
@@ -1,8 +1,11 @@
 """Configuration module for the 'Transfer Module'-app."""
 
+from typing import Optional, Callable
 import os
 from pathlib import Path
+import tempfile
 from importlib.metadata import version
+from shutil import which
 import subprocess
 import json
 
@@ -11,12 +14,139 @@ from dcm_common.services import FSConfig, OrchestratedAppConfig
 import dcm_transfer_module_api
 
 
+class _LazyDocument:
+    """
+    Descriptor for a YAML-document that is loaded on first access (from
+    the path given by the attribute `path_attribute` of the owner).
+    """
+
+    def __init__(self, path_attribute: str) -> None:
+        self.path_attribute = path_attribute
+        self._documents: dict[Path, dict] = {}
+
+    def __get__(self, instance, owner) -> dict:
+        path = getattr(owner, self.path_attribute)
+        if path not in self._documents:
+            self._documents[path] = yaml.load(
+                path.read_text(encoding="utf-8"), Loader=yaml.SafeLoader
+            )
+        return self._documents[path]
+
+
+def _cached(
+    cache: Optional[Path],
+    key: str,
+    file: Optional[str | Path],
+    compute: Callable[[], str],
+) -> str:
+    """
+    Returns the result of `compute` which is cached in the JSON-file
+    `cache` under `key` until the modification time or size of `file`
+    changes. Errors while accessing the cache are ignored and so is a
+    cache that is not owned by the current user or that is writable by
+    others.
+
+    Keyword arguments:
+    cache -- path to cache file (`None` disables caching)
+    key -- cache key
+    file -- file the result depends on (`None` disables caching)
+    compute -- callable that computes the result
+    """
+    if cache is None or file is None:
+        return compute()
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return compute()
+    fingerprint = f"{Path(file).resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    entries = _read_cache(cache)
+    entry = entries.get(key)
+    if isinstance(entry, dict) and entry.get("fingerprint") == fingerprint:
+        return entry["value"]
+    value = compute()
+    entries[key] = {"fingerprint": fingerprint, "value": value}
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        # replace atomically to support concurrent processes (the
+        # temporary file is created exclusively with mode 0o600)
+        fd, tmp = tempfile.mkstemp(
+            prefix=f".{cache.name}.", dir=cache.parent
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+            os.replace(tmp, cache)
+        except OSError:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+    return value
+
+
+def _read_cache(cache: Path) -> dict:
+    """
+    Returns the entries of the cache file `cache` (or an empty `dict`
+    if it cannot be read or is not trustworthy, see `_cached`).
+    """
+    try:
+        with open(cache, "rb") as file:
+            stat = os.fstat(file.fileno())
+            if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+                return {}
+            entries = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _software_version(cmd: list[str], stream: str) -> str:
+    """
+    Returns first line of the output `stream` ('stdout' or 'stderr')
+    of `cmd` or '?' if the command fails.
+    """
+    try:
+        return getattr(
+            subprocess.run(cmd, capture_output=True, text=True, check=True),
+            stream,
+        ).strip().split("\n")[0]
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return "?"
+
+
+class ConfigOverlay:
+    """
+    Read-only view of `config` in which the attributes given in
+    `overrides` are replaced (used for the configuration of replicas).
+    Overrides of `Path`-attributes are converted into `Path`s.
+
+    Keyword arguments:
+    config -- base configuration
+    overrides -- replaced attributes by name
+    """
+
+    def __init__(self, config, overrides: dict) -> None:
+        self._config = config
+        self._overrides = overrides
+
+    def __getattr__(self, name: str):
+        if name not in self._overrides:
+            return getattr(self._config, name)
+        value = self._overrides[name]
+        if value is not None and isinstance(
+            getattr(self._config, name, None), Path
+        ):
+            return Path(value)
+        return value
+
+
 class AppConfig(FSConfig, OrchestratedAppConfig):
     """
     Configuration for the 'Transfer Module'-app.
     """
 
     # ------ TRANSFER ------
+    TRANSFER_TRANSPORT = os.environ.get("TRANSFER_TRANSPORT") or "rsync"
     LOCAL_TRANSFER = (int(os.environ.get("LOCAL_TRANSFER") or 0)) == 1
     SSH_HOSTNAME = os.environ.get("SSH_HOSTNAME") or "localhost"
     SSH_PORT = int(os.environ.get("SSH_PORT") or 22)
@@ -28,6 +158,24 @@ class AppConfig(FSConfig, OrchestratedAppConfig):
     SSH_IDENTITY_FILE = Path(
         os.environ.get("SSH_IDENTITY_FILE") or "~/.ssh/id_rsa"
     )
+    SSH_COMMAND = os.environ.get("SSH_COMMAND") or "ssh"
+    RSYNC_COMMAND = os.environ.get("RSYNC_COMMAND") or "rsync"
+    RSYNC_DAEMON_HOST = os.environ.get("RSYNC_DAEMON_HOST") or "localhost"
+    RSYNC_DAEMON_PORT = int(os.environ.get("RSYNC_DAEMON_PORT") or 873)
+    RSYNC_DAEMON_MODULE = os.environ.get("RSYNC_DAEMON_MODULE") or "dcm"
+    RSYNC_DAEMON_USER = os.environ.get("RSYNC_DAEMON_USER")
+    RSYNC_DAEMON_PASSWORD_FILE = (
+        Path(os.environ["RSYNC_DAEMON_PASSWORD_FILE"])
+        if "RSYNC_DAEMON_PASSWORD_FILE" in os.environ else None
+    )
+    S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL")
+    S3_REGION = os.environ.get("S3_REGION")
+    S3_BUCKET = os.environ.get("S3_BUCKET") or "dcm"
+    S3_ACCESS_KEY_ID = os.environ.get("S3_ACCESS_KEY_ID")
+    S3_SECRET_ACCESS_KEY = os.environ.get("S3_SECRET_ACCESS_KEY")
+    S3_ADDRESSING_STYLE = os.environ.get("S3_ADDRESSING_STYLE") or "path"
+    S3_PART_SIZE = int(os.environ.get("S3_PART_SIZE") or 8 * 1024 * 1024)
+    S3_MAX_CONCURRENCY = int(os.environ.get("S3_MAX_CONCURRENCY") or 8)
     REMOTE_DESTINATION = Path(
         os.environ.get("REMOTE_DESTINATION") or "/remote_storage"
     )
@@ -38,29 +186,149 @@ class AppConfig(FSConfig, OrchestratedAppConfig):
         os.environ.get("COMPRESSION_LEVEL") or 6
     )
     VALIDATE_CHECKSUMS = (int(os.environ.get("VALIDATE_CHECKSUMS") or 0)) == 1
+    TRANSFER_VERIFY = (int(os.environ.get("TRANSFER_VERIFY") or 0)) == 1
     TRANSFER_RETRIES = int(os.environ.get("TRANSFER_RETRIES") or 3)
     TRANSFER_RETRY_INTERVAL = int(
         os.environ.get("TRANSFER_RETRY_INTERVAL") or 360
     )
+    TRANSFER_ABORT_CLEANUP = (
+        os.environ.get("TRANSFER_ABORT_CLEANUP") or "keep"
+    )
+    TRANSFER_TERMINATE_TIMEOUT = float(
+        os.environ.get("TRANSFER_TERMINATE_TIMEOUT") or 5
+    )
     SSH_CLIENT_DEFAULT_OPTIONS = []
     SSH_CLIENT_OPTIONS = (
         json.loads(os.environ["SSH_CLIENT_OPTIONS"])
         if "SSH_CLIENT_OPTIONS" in os.environ else []
     )
-    TRANSFER_DEFAULT_OPTIONS = ["-a", "--info=progress2"]
+    TRANSFER_DEFAULT_OPTIONS = ["-a", "--info=progress2", "--stats"]
     TRANSFER_OPTIONS = (
         json.loads(os.environ["TRANSFER_OPTIONS"])
         if "TRANSFER_OPTIONS" in os.environ else []
     )
-    BW_LIMIT = 0
+    BW_LIMIT = int(os.environ.get("BW_LIMIT") or 0)
+    TRANSFER_STDERR_BUFFER = int(
+        os.environ.get("TRANSFER_STDERR_BUFFER") or 100
+    )
+    PROGRESS_PUSH_INTERVAL = float(
+        os.environ.get("PROGRESS_PUSH_INTERVAL") or 1
+    )
+    PROGRESS_PUSH_DELTA = int(os.environ.get("PROGRESS_PUSH_DELTA") or 1)
+    TRANSFER_FILE_TIMELINE = (
+        int(os.environ.get("TRANSFER_FILE_TIMELINE") or 0)
+    ) == 1
+    TRANSFER_TIMELINE_DIRECTORY = Path(
+        os.environ.get("TRANSFER_TIMELINE_DIRECTORY") or "timelines"
+    )
+
+    # ------ REQUEST OPTIONS ------
+    # limits for the per-request `TransferOptions`
+    REQUEST_MAX_COMPRESSION_LEVEL = int(
+        os.environ.get("REQUEST_MAX_COMPRESSION_LEVEL") or 9
+    )
+    REQUEST_MAX_BANDWIDTH_LIMIT = int(
+        os.environ.get("REQUEST_MAX_BANDWIDTH_LIMIT") or 0
+    )
+    REQUEST_MAX_PARALLELISM = int(
+        os.environ.get("REQUEST_MAX_PARALLELISM") or 8
+    )
+    REQUEST_MAX_RETRIES = int(os.environ.get("REQUEST_MAX_RETRIES") or 10)
+    REQUEST_VERIFY_MODES = (
+        json.loads(os.environ["REQUEST_VERIFY_MODES"])
+        if "REQUEST_VERIFY_MODES" in os.environ
+        else ["none", "checksums", "verify", "full"]
+    )
+    REQUEST_MAX_PRIORITY = os.environ.get("REQUEST_MAX_PRIORITY") or "normal"
+    TRANSFER_PRIORITY_SLOTS = (
+        json.loads(os.environ["TRANSFER_PRIORITY_SLOTS"])
+        if "TRANSFER_PRIORITY_SLOTS" in os.environ else {}
+    )
+
+    # ------ REPLICATION ------
+    TRANSFER_REPLICAS = (
+        json.loads(os.environ["TRANSFER_REPLICAS"])
+        if "TRANSFER_REPLICAS" in os.environ else []
+    )
+    TRANSFER_FANOUT_CHUNK_SIZE = int(
+        os.environ.get("TRANSFER_FANOUT_CHUNK_SIZE") or 1024 * 1024
+    )
+    TRANSFER_FANOUT_BUFFER = int(
+        os.environ.get("TRANSFER_FANOUT_BUFFER") or 16
+    )
+    TRANSFER_FANOUT_STALL_TIMEOUT = float(
+        os.environ.get("TRANSFER_FANOUT_STALL_TIMEOUT") or 300
+    )
+
+    # ------ CONCURRENCY ------
+    TRANSFER_MAX_CONNECTIONS = int(
+        os.environ.get("TRANSFER_MAX_CONNECTIONS") or 0
+    )
+    TRANSFER_LOCK_DIRECTORY = Path(
+        os.environ.get("TRANSFER_LOCK_DIRECTORY")
+        or Path(tempfile.gettempdir()) / "dcm-transfer-module"
+    )
+    TRANSFER_SLOT_INTERVAL = float(
+        os.environ.get("TRANSFER_SLOT_INTERVAL") or 1
+    )
+    TRANSFER_SLOT_TIMEOUT = (
+        float(os.environ["TRANSFER_SLOT_TIMEOUT"])
+        if "TRANSFER_SLOT_TIMEOUT" in os.environ else None
+    )
+    TRANSFER_SPACE_CHECK = (
+        int(os.environ.get("TRANSFER_SPACE_CHECK") or 0)
+    ) == 1
+    TRANSFER_SPACE_RESERVE = int(
+        os.environ.get("TRANSFER_SPACE_RESERVE") or 0
+    )
+    TRANSFER_SPACE_LEDGER = (
+        int(os.environ.get("TRANSFER_SPACE_LEDGER") or 0)
+    ) == 1
+
+    # ------ REMOTE HEALTH ------
+    REMOTE_HEALTH_INTERVAL = float(
+        os.environ.get("REMOTE_HEALTH_INTERVAL") or 0
+    )
+    REMOTE_HEALTH_WINDOW = int(os.environ.get("REMOTE_HEALTH_WINDOW") or 10)
+    REMOTE_HEALTH_FAILURE_THRESHOLD = int(
+        os.environ.get("REMOTE_HEALTH_FAILURE_THRESHOLD") or 3
+    )
+    REMOTE_HEALTH_WAIT = float(os.environ.get("REMOTE_HEALTH_WAIT") or 0)
+    REMOTE_HEALTH_READINESS = (
+        int(os.environ.get("REMOTE_HEALTH_READINESS") or 1)
+    ) == 1
+
+    # ------ METRICS ------
+    EXPOSE_METRICS = (int(os.environ.get("EXPOSE_METRICS") or 0)) == 1
+    METRICS_DATABASE = Path(
+        os.environ.get("METRICS_DATABASE")
+        or Path(tempfile.gettempdir()) / "dcm-transfer-module" / "metrics.db"
+    )
+
+    # ------ TRACING ------
+    TRACING_EXPORT_FILE = (
+        Path(os.environ["TRACING_EXPORT_FILE"])
+        if "TRACING_EXPORT_FILE" in os.environ else None
+    )
+
+    # ------ PROFILING ------
+    ALLOW_PROFILING = (int(os.environ.get("ALLOW_PROFILING") or 0)) == 1
+    PROFILING_DIRECTORY = Path(
+        os.environ.get("PROFILING_DIRECTORY") or "profiles"
+    )
 
     # ------ IDENTIFY ------
     # generate self-description
     API_DOCUMENT = \
         Path(dcm_transfer_module_api.__file__).parent / "openapi.yaml"
-    API = yaml.load(
-        API_DOCUMENT.read_text(encoding="utf-8"),
-        Loader=yaml.SafeLoader
+    # loaded on first access; not in upper case in order to not be
+    # loaded by `flask.Config.from_object`
+    api = _LazyDocument("API_DOCUMENT")
+    IDENTITY_CACHE = (int(os.environ.get("IDENTITY_CACHE") or 1)) == 1
+    IDENTITY_CACHE_FILE = Path(
+        os.environ.get("IDENTITY_CACHE_FILE")
+        or Path(tempfile.gettempdir()) / "dcm-transfer-module"
+        / "identity.json"
     )
 
     def set_identity(self) -> None:
@@ -70,29 +338,33 @@ class AppConfig(FSConfig, OrchestratedAppConfig):
         )
 
         # version
-        self.CONTAINER_SELF_DESCRIPTION["version"]["api"] = (
-            self.API["info"]["version"]
+        # values that require parsing the API document or running
+        # subprocesses are cached across processes (see `_cached`)
+        cache = self.IDENTITY_CACHE_FILE if self.IDENTITY_CACHE else None
+        self.CONTAINER_SELF_DESCRIPTION["version"]["api"] = _cached(
+            cache,
+            "api",
+            self.API_DOCUMENT,
+            lambda: str(self.api["info"]["version"]),
         )
         self.CONTAINER_SELF_DESCRIPTION["version"]["app"] = version(
             "dcm-transfer-module"
         )
-        try:
-            self.CONTAINER_SELF_DESCRIPTION["version"]["software"]["ssh"] = (
-                subprocess.run(
-                    ["ssh", "-V"], capture_output=True, text=True, check=True
-                ).stderr.strip()
-            )
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            self.CONTAINER_SELF_DESCRIPTION["version"]["software"]["ssh"] = "?"
-        try:
-            self.CONTAINER_SELF_DESCRIPTION["version"]["software"]["rsync"] = (
-                subprocess.run(
-                    ["rsync", "--version"], capture_output=True, text=True,
-                    check=True
-                ).stdout.split("\n")[0]
-            )
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            self.CONTAINER_SELF_DESCRIPTION["version"]["software"]["rsync"] = "?"
+        software = self.CONTAINER_SELF_DESCRIPTION["version"]["software"]
+        software["ssh"] = _cached(
+            cache,
+            "ssh",
+            which(self.SSH_COMMAND),
+            lambda: _software_version([self.SSH_COMMAND, "-V"], "stderr"),
+        )
+        software["rsync"] = _cached(
+            cache,
+            "rsync",
+            which(self.RSYNC_COMMAND),
+            lambda: _software_version(
+                [self.RSYNC_COMMAND, "--version"], "stdout"
+            ),
+        )
 
         # configuration
         settings = self.CONTAINER_SELF_DESCRIPTION["configuration"]["settings"]
@@ -1,16 +1,46 @@
 """Input handlers for the 'DCM Transfer Module'-app."""
 
+from typing import Optional
 from pathlib import Path
 
-from data_plumber_http import Property, Object, Url
+from data_plumber_http import Property, Object, Boolean, Integer, String, Url
 from dcm_common.services import TargetPath, UUID
 
-from dcm_transfer_module.models import Target, TransferConfig
+from dcm_transfer_module.models import Target, TransferConfig, TransferOptions
+from dcm_transfer_module.models.transfer_options import (
+    VERIFY_MODES, PRIORITIES
+)
 
 
-def get_transfer_handler(cwd: Path):
+def get_transfer_handler(
+    cwd: Path,
+    max_compression_level: int = 9,
+    max_bandwidth_limit: int = 0,
+    max_parallelism: int = 8,
+    max_retries: int = 10,
+    verify_modes: Optional[list[str]] = None,
+    priorities: Optional[list[str]] = None,
+):
     """
     Returns parameterized handler
+
+    Keyword arguments:
+    cwd -- working directory for target paths
+    max_compression_level -- highest compression level that may be
+                             requested
+                             (default 9)
+    max_bandwidth_limit -- highest bandwidth limit (in units of 1024
+                           bytes per second) that may be requested; if
+                           positive, requests cannot disable the limit
+                           (default 0 specifies no restriction)
+    max_parallelism -- highest parallelism that may be requested
+                       (default 8)
+    max_retries -- highest number of retries that may be requested
+                   (default 10)
+    verify_modes -- verification modes that may be requested
+                    (default None; all of `VERIFY_MODES`)
+    priorities -- priorities that may be requested
+                  (default None; all of `PRIORITIES`)
     """
     return Object(
         properties={
@@ -27,9 +57,53 @@ def get_transfer_handler(cwd: Path):
                         },
                         accept_only=["path"]
                     ),
+                    Property("profile"): Boolean(),
+                    Property("options"): Object(
+                        model=TransferOptions,
+                        properties={
+                            Property("compression"): Boolean(),
+                            Property(
+                                "compressionLevel", name="compression_level"
+                            ): Integer(
+                                min_value_inclusive=0,
+                                max_value_inclusive=max_compression_level,
+                            ),
+                            Property("verify"): String(
+                                enum=list(verify_modes or VERIFY_MODES)
+                            ),
+                            Property(
+                                "bandwidthLimit", name="bandwidth_limit"
+                            ): Integer(
+                                min_value_inclusive=(
+                                    1 if max_bandwidth_limit > 0 else 0
+                                ),
+                                max_value_inclusive=(
+                                    max_bandwidth_limit
+                                    if max_bandwidth_limit > 0
+                                    else None
+                                ),
+                            ),
+                            Property("parallelism"): Integer(
+                                min_value_inclusive=1,
+                                max_value_inclusive=max_parallelism,
+                            ),
+                            Property("retries"): Integer(
+                                min_value_inclusive=0,
+                                max_value_inclusive=max_retries,
+                            ),
+                            Property("priority"): String(
+                                enum=list(priorities or PRIORITIES)
+                            ),
+                        },
+                        accept_only=[
+                            "compression", "compressionLevel", "verify",
+                            "bandwidthLimit", "parallelism", "retries",
+                            "priority",
+                        ]
+                    ),
                 },
                 accept_only=[
-                    "target",
+                    "target", "profile", "options",
                 ]
             ),
             Property("token"): UUID(),
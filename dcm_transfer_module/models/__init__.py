@@ -1,8 +1,15 @@
+from .destination_result import DestinationResult
 from .report import Report
 from .target import Target
 from .transfer_config import TransferConfig
+from .transfer_metrics import TransferMetrics
+from .transfer_options import TransferOptions
+from .transfer_phase import TransferPhase
 from .transfer_result import TransferResult
+from .transfer_stats import TransferStats
 
 __all__ = [
-    "Report", "Target", "TransferConfig", "TransferResult",
+    "DestinationResult", "Report", "Target", "TransferConfig",
+    "TransferMetrics", "TransferOptions", "TransferPhase", "TransferResult",
+    "TransferStats",
 ]
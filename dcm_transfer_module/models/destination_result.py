@@ -0,0 +1,32 @@
+"""
+DestinationResult data-model definition
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+
+from dcm_common.models import DataModel
+
+
+@dataclass
+class DestinationResult(DataModel):
+    """
+    DestinationResult `DataModel`
+
+    Keyword arguments:
+    name -- name of the destination ('primary' or the name of a replica
+            in `TRANSFER_REPLICAS`)
+    path -- path of the SIP in the destination
+    remote -- description of the remote
+              (default None)
+    success -- success of the transfer into this destination
+               (default None)
+    attempts -- number of transfer attempts into this destination
+                (default None)
+    """
+
+    name: str
+    path: str
+    remote: Optional[str] = None
+    success: Optional[bool] = None
+    attempts: Optional[int] = None
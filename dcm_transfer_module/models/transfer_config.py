@@ -2,11 +2,13 @@
 TransferConfig data-model definition
 """
 
+from typing import Optional
 from dataclasses import dataclass
 
 from dcm_common.models import DataModel
 
 from dcm_transfer_module.models.target import Target
+from dcm_transfer_module.models.transfer_options import TransferOptions
 
 
 @dataclass
@@ -16,6 +18,12 @@ class TransferConfig(DataModel):
 
     Keyword arguments:
     target -- `Target`-object pointing to SIP to be transferred
+    profile -- whether to profile the job (requires `ALLOW_PROFILING`)
+               (default False)
+    options -- per-request tuning of the transfer
+               (default None)
     """
 
     target: Target
+    profile: bool = False
+    options: Optional[TransferOptions] = None
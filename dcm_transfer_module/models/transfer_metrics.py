@@ -0,0 +1,40 @@
+"""
+TransferMetrics data-model definition
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+
+from dcm_common.models import DataModel
+
+
+@dataclass
+class TransferMetrics(DataModel):
+    """
+    TransferMetrics `DataModel`
+
+    Keyword arguments:
+    bytes -- number of transferred bytes
+             (default None)
+    bytes_per_second -- current transfer rate in bytes per second
+                        (default None)
+    elapsed -- time since start of transfer in seconds
+               (default None)
+    eta -- estimated remaining time in seconds
+           (default None)
+    files_done -- number of files that have been checked
+                  (default None)
+    files_total -- total number of files (may grow while rsync scans
+                   the source incrementally)
+                   (default None)
+    files_transferred -- number of files that have been transferred
+                         (default None)
+    """
+
+    bytes: Optional[int] = None
+    bytes_per_second: Optional[float] = None
+    elapsed: Optional[float] = None
+    eta: Optional[float] = None
+    files_done: Optional[int] = None
+    files_total: Optional[int] = None
+    files_transferred: Optional[int] = None
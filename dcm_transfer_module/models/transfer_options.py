@@ -0,0 +1,54 @@
+"""
+TransferOptions data-model definition
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+
+from dcm_common.models import DataModel
+
+
+# supported values for `TransferOptions.verify`
+VERIFY_MODES = ("none", "checksums", "verify", "full")
+# supported values for `TransferOptions.priority` in ascending order
+PRIORITIES = ("low", "normal", "high")
+
+
+@dataclass
+class TransferOptions(DataModel):
+    """
+    TransferOptions `DataModel`
+
+    Per-request tuning of a transfer; options that are not set fall
+    back to the configuration of the service.
+
+    Keyword arguments:
+    compression -- whether to use compression during transfer
+                   (default None)
+    compression_level -- level of compression
+                         (default None)
+    verify -- verification mode (one of `VERIFY_MODES`):
+              'none' (no validation), 'checksums' (validate checksums
+              during transfer), 'verify' (verify result after
+              transfer), or 'full' (both)
+              (default None)
+    bandwidth_limit -- maximum transfer rate in units of 1024 bytes per
+                       second (0 specifies no limit)
+                       (default None)
+    parallelism -- number of concurrent requests (only used by backends
+                   that support concurrent uploads)
+                   (default None)
+    retries -- number of retries for failed transfers
+               (default None)
+    priority -- priority of the job when waiting for a connection slot
+                (one of `PRIORITIES`)
+                (default None)
+    """
+
+    compression: Optional[bool] = None
+    compression_level: Optional[int] = None
+    verify: Optional[str] = None
+    bandwidth_limit: Optional[int] = None
+    parallelism: Optional[int] = None
+    retries: Optional[int] = None
+    priority: Optional[str] = None
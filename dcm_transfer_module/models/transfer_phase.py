@@ -0,0 +1,28 @@
+"""
+TransferPhase data-model definition
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+
+from dcm_common.models import DataModel
+
+
+@dataclass
+class TransferPhase(DataModel):
+    """
+    TransferPhase `DataModel`
+
+    Keyword arguments:
+    name -- name of the phase (one of 'slot', 'connection_test',
+            'destination_check', 'deletion', 'channel_setup',
+            'transfer_attempt', 'retry_wait', 'cleanup', 'callback')
+    duration -- duration of the phase in seconds
+    attempt -- index of the transfer attempt (only for phases that are
+               repeated on retry)
+               (default None)
+    """
+
+    name: str
+    duration: float
+    attempt: Optional[int] = None
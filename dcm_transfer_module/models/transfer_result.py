@@ -7,6 +7,13 @@ from dataclasses import dataclass
 
 from dcm_common.models import DataModel
 
+from dcm_transfer_module.models.destination_result import (
+    DestinationResult
+)
+from dcm_transfer_module.models.transfer_metrics import TransferMetrics
+from dcm_transfer_module.models.transfer_phase import TransferPhase
+from dcm_transfer_module.models.transfer_stats import TransferStats
+
 
 @dataclass
 class TransferResult(DataModel):
@@ -15,6 +22,29 @@ class TransferResult(DataModel):
 
     Keyword arguments:
     success -- overall success of the job
+    metrics -- numeric transfer metrics
+               (default None)
+    timeline -- path to the per-file timeline of the transfer relative
+                to `FS_MOUNT_POINT` (only if enabled)
+                (default None)
+    stats -- summary of the (last) transfer attempt as reported by
+             rsync
+             (default None)
+    phases -- durations of the individual phases of the job in order
+              of execution
+              (default None)
+    profile -- path to the profile (pstats) of the job relative to
+               `FS_MOUNT_POINT` (only if requested)
+               (default None)
+    destinations -- results of the individual destinations (only if
+                    replicas are configured)
+                    (default None)
     """
 
     success: Optional[bool] = None
+    metrics: Optional[TransferMetrics] = None
+    timeline: Optional[str] = None
+    stats: Optional[TransferStats] = None
+    phases: Optional[list[TransferPhase]] = None
+    profile: Optional[str] = None
+    destinations: Optional[list[DestinationResult]] = None
@@ -0,0 +1,58 @@
+"""
+TransferStats data-model definition
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+
+from dcm_common.models import DataModel
+
+
+@dataclass
+class TransferStats(DataModel):
+    """
+    TransferStats `DataModel` (summary reported by `rsync --stats`)
+
+    Keyword arguments:
+    files -- number of files in the source (including directories)
+             (default None)
+    files_transferred -- number of regular files that have been
+                         transferred
+                         (default None)
+    total_size -- total size of all files in bytes
+                  (default None)
+    total_transferred_size -- total size of transferred files in bytes
+                              (default None)
+    literal_data -- number of bytes that had to be sent literally
+                    (default None)
+    matched_data -- number of bytes that have been matched on the
+                    receiving side (delta transfer)
+                    (default None)
+    file_list_size -- size of the file list in bytes
+                      (default None)
+    file_list_generation_time -- time for generating the file list in
+                                 seconds
+                                 (default None)
+    file_list_transfer_time -- time for sending the file list in
+                               seconds
+                               (default None)
+    bytes_sent -- total number of bytes sent by rsync
+                  (default None)
+    bytes_received -- total number of bytes received by rsync
+                      (default None)
+    speedup -- ratio of total size and bytes sent/received
+               (default None)
+    """
+
+    files: Optional[int] = None
+    files_transferred: Optional[int] = None
+    total_size: Optional[int] = None
+    total_transferred_size: Optional[int] = None
+    literal_data: Optional[int] = None
+    matched_data: Optional[int] = None
+    file_list_size: Optional[int] = None
+    file_list_generation_time: Optional[float] = None
+    file_list_transfer_time: Optional[float] = None
+    bytes_sent: Optional[int] = None
+    bytes_received: Optional[int] = None
+    speedup: Optional[float] = None
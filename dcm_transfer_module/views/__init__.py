@@ -1,5 +1,6 @@
 from .transfer import TransferView
+from .metrics import MetricsView
 
 __all__ = [
-    "TransferView",
+    "TransferView", "MetricsView",
 ]
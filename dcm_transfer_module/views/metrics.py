@@ -0,0 +1,123 @@
+"""
+Metrics View-class definition
+"""
+
+from flask import Blueprint, Response
+from dcm_common import services
+
+from dcm_transfer_module.config import AppConfig
+from dcm_transfer_module.components import Metric, MetricsStore
+
+
+_DURATION_BUCKETS = (
+    0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600, 14400
+)
+_THROUGHPUT_BUCKETS = tuple(4**i * 1024 for i in range(11))
+
+JOBS_SUBMITTED = Metric(
+    "dcm_transfer_jobs_submitted_total",
+    "counter",
+    "Number of transfer jobs that have been submitted.",
+)
+JOBS_STARTED = Metric(
+    "dcm_transfer_jobs_started_total",
+    "counter",
+    "Number of transfer jobs that have been started by a worker.",
+)
+JOBS_FINISHED = Metric(
+    "dcm_transfer_jobs_total",
+    "counter",
+    "Number of finished transfer jobs by result.",
+)
+FAILURES = Metric(
+    "dcm_transfer_failures_total",
+    "counter",
+    "Number of failed transfer jobs by failure class.",
+)
+RETRIES = Metric(
+    "dcm_transfer_retries_total",
+    "counter",
+    "Number of repeated transfer attempts.",
+)
+BYTES = Metric(
+    "dcm_transfer_bytes_total",
+    "counter",
+    "Number of bytes transferred by successful jobs.",
+)
+JOB_DURATION = Metric(
+    "dcm_transfer_job_duration_seconds",
+    "histogram",
+    "Duration of transfer jobs (from start to callback).",
+    _DURATION_BUCKETS,
+)
+PHASE_DURATION = Metric(
+    "dcm_transfer_phase_duration_seconds",
+    "histogram",
+    "Duration of the individual phases of transfer jobs.",
+    _DURATION_BUCKETS,
+)
+THROUGHPUT = Metric(
+    "dcm_transfer_throughput_bytes_per_second",
+    "histogram",
+    "Effective throughput of the successful transfer attempt of a job.",
+    _THROUGHPUT_BUCKETS,
+)
+ACTIVE_TRANSFERS = Metric(
+    "dcm_transfer_active_transfers",
+    "gauge",
+    "Number of transfer jobs that are currently being processed.",
+)
+QUEUE_DEPTH = Metric(
+    "dcm_transfer_queue_depth",
+    "gauge",
+    "Number of submitted transfer jobs that have not been started yet "
+    + "(jobs that are aborted while queued are not accounted for).",
+)
+METRICS = (
+    JOBS_SUBMITTED,
+    JOBS_STARTED,
+    JOBS_FINISHED,
+    FAILURES,
+    RETRIES,
+    BYTES,
+    JOB_DURATION,
+    PHASE_DURATION,
+    THROUGHPUT,
+    ACTIVE_TRANSFERS,
+    QUEUE_DEPTH,
+)
+
+
+class MetricsView(services.View):
+    """
+    View-class for the '/metrics'-endpoint (Prometheus text exposition
+    format).
+    """
+
+    NAME = "metrics"
+
+    def __init__(self, config: AppConfig, *args, **kwargs) -> None:
+        super().__init__(config, *args, **kwargs)
+        self.store = MetricsStore(config.METRICS_DATABASE)
+
+    def render(self) -> str:
+        """Returns the current metrics in text exposition format."""
+        samples = self.store.samples()
+        samples[QUEUE_DEPTH.name] = {
+            "": max(
+                0,
+                sum(samples.get(JOBS_SUBMITTED.name, {}).values())
+                - sum(samples.get(JOBS_STARTED.name, {}).values()),
+            )
+        }
+        return self.store.render(METRICS, samples)
+
+    def configure_bp(self, bp: Blueprint, *args, **kwargs) -> None:
+        @bp.route("/metrics", methods=["GET"])
+        def metrics():
+            """Get current metrics."""
+            return Response(
+                self.render(),
+                content_type="text/plain; version=0.0.4; charset=utf-8",
+                status=200,
+            )
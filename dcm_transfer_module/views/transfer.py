@@ -2,12 +2,11 @@
 Transfer View-class definition
 """
 
-from typing import Optional
+from typing import Optional, TextIO, Callable
 import os
 from pathlib import Path
-import tempfile
-import io
-from time import sleep
+import cProfile
+from time import sleep, time_ns, monotonic
 from uuid import uuid4
 
 from flask import Blueprint, jsonify, Response, request
@@ -16,14 +15,92 @@ from dcm_common import LoggingContext as Context
 from dcm_common.orchestra import JobConfig, JobContext, JobInfo
 from dcm_common import services
 
-from dcm_transfer_module.config import AppConfig
+from dcm_transfer_module.config import AppConfig, ConfigOverlay
 from dcm_transfer_module.handlers import get_transfer_handler
-from dcm_transfer_module.models import TransferConfig, Report
+from dcm_transfer_module.models import (
+    DestinationResult,
+    TransferConfig,
+    TransferOptions,
+    TransferMetrics,
+    TransferPhase,
+    TransferResult,
+    TransferStats,
+    Report,
+)
+from dcm_transfer_module.models.transfer_options import (
+    VERIFY_MODES, PRIORITIES
+)
 from dcm_transfer_module.components import (
     RsyncParser,
-    SSHClient,
-    TransferManager,
+    RsyncProgress,
+    RsyncStats,
+    ProgressChannel,
+    FileTimeline,
+    RemoteSemaphore,
+    SemaphoreSlot,
+    PhaseTimer,
+    MetricsStore,
+    Tracer,
+    RemoteHealthMonitor,
+    SpaceLedger,
+    SpaceReservation,
+    directory_size,
+    Transport,
+    get_transport,
+    FanOut,
 )
+from dcm_transfer_module.views import metrics
+
+
+def _sleep(duration: float, interval: float = 0.1) -> None:
+    """
+    Sleeps for `duration` seconds; an abort of the job takes effect
+    within `interval`.
+    """
+    end = monotonic() + duration
+    while (remaining := end - monotonic()) > 0:
+        sleep(min(interval, remaining))
+
+
+class _JobSlot:
+    """
+    Connection slot of a job. The slot is taken with `acquire` and held
+    until it is released explicitly (e.g. for a retry wait) or the
+    context is left.
+
+    Keyword arguments:
+    acquire -- returns a new `SemaphoreSlot` or `None` if no slot is
+               available
+    """
+
+    def __init__(
+        self, acquire: Callable[[], Optional[SemaphoreSlot]]
+    ) -> None:
+        self._acquire = acquire
+        self._slot: Optional[SemaphoreSlot] = None
+
+    @property
+    def held(self) -> bool:
+        """Returns `True` if a slot is currently held."""
+        return self._slot is not None
+
+    def acquire(self) -> bool:
+        """Acquires a slot and returns `True` on success."""
+        self.release()
+        self._slot = self._acquire()
+        return self._slot is not None
+
+    def release(self) -> None:
+        """Releases the slot (no-op if no slot is held)."""
+        if self._slot is not None:
+            self._slot.release()
+            self._slot = None
+
+    def __enter__(self) -> "_JobSlot":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.release()
 
 
 class TransferView(services.OrchestratedView):
@@ -42,51 +119,157 @@ class TransferView(services.OrchestratedView):
                 "Either none or both of `SSH_HOST_PUBLIC_KEY` and "
                 "`SSH_HOST_PUBLIC_KEY_ALGORITHM` must be set in config."
             )
+        if self.config.REQUEST_MAX_PRIORITY not in PRIORITIES:
+            raise RuntimeError(
+                "Bad `REQUEST_MAX_PRIORITY` "
+                + f"'{self.config.REQUEST_MAX_PRIORITY}', expected one of "
+                + f"{PRIORITIES}."
+            )
+        if not self.config.REQUEST_VERIFY_MODES or any(
+            mode not in VERIFY_MODES
+            for mode in self.config.REQUEST_VERIFY_MODES
+        ):
+            raise RuntimeError(
+                "Bad `REQUEST_VERIFY_MODES` "
+                + f"{self.config.REQUEST_VERIFY_MODES}, expected a non-empty "
+                + f"subset of {VERIFY_MODES}."
+            )
+        if any(
+            priority not in PRIORITIES
+            or not isinstance(slots, int)
+            or slots < 1
+            for priority, slots in self.config.TRANSFER_PRIORITY_SLOTS.items()
+        ):
+            raise RuntimeError(
+                "Bad `TRANSFER_PRIORITY_SLOTS` "
+                + f"{self.config.TRANSFER_PRIORITY_SLOTS}, expected positive "
+                + f"numbers of slots for priorities of {PRIORITIES}."
+            )
         self.parser = RsyncParser()
-        self.ssh_client = (
+        self.tracer = Tracer(self.config.TRACING_EXPORT_FILE)
+        try:
+            self.transport: Transport = get_transport(
+                self.config.TRANSFER_TRANSPORT
+            )(self.config, tracer=self.tracer)
+        except ValueError as exc_info:
+            raise RuntimeError(str(exc_info)) from exc_info
+        self.replicas = self._load_replicas()
+        # replicas are written from a single stream (see `FanOut`)
+        for name, transport in (
+            [("primary", self.transport)]
+            + [(name, transport) for name, transport, _ in self.replicas]
+            if self.replicas
+            else []
+        ):
+            if not transport.streaming:
+                raise RuntimeError(
+                    f"Bad destination '{name}' for `TRANSFER_REPLICAS`: "
+                    + f"transport '{transport.description}' does not "
+                    + "support streamed transfers."
+                )
+        self.semaphore = RemoteSemaphore(
+            self.config.TRANSFER_LOCK_DIRECTORY,
+            self.transport.key,
+            self.config.TRANSFER_MAX_CONNECTIONS,
+        )
+        self.ledger = (
+            SpaceLedger(
+                self.config.TRANSFER_LOCK_DIRECTORY
+                / f"{self.semaphore.key}.space.json"
+            )
+            if self.config.TRANSFER_SPACE_LEDGER
+            else None
+        )
+        self.health = (
             None
-            if self.config.LOCAL_TRANSFER
-            else SSHClient(
-                host=self.config.SSH_HOSTNAME,
-                user=self.config.SSH_USERNAME,
-                port=self.config.SSH_PORT,
-                identity_file=self.config.SSH_IDENTITY_FILE.resolve(),
-                fingerprint=(
-                    (
-                        self.config.SSH_HOST_PUBLIC_KEY_ALGORITHM,
-                        self.config.SSH_HOST_PUBLIC_KEY,
-                    )
-                    if self.config.SSH_HOST_PUBLIC_KEY is not None
-                    else None
-                ),
-                batch_mode=self.config.SSH_BATCH_MODE,
-                default_options=(
-                    self.config.SSH_CLIENT_DEFAULT_OPTIONS
-                    + self.config.SSH_CLIENT_OPTIONS
-                ),
+            if not self.transport.remote
+            or self.config.REMOTE_HEALTH_INTERVAL <= 0
+            else RemoteHealthMonitor(
+                self._check_remote,
+                self.config.TRANSFER_LOCK_DIRECTORY
+                / f"{self.semaphore.key}.health.json",
+                interval=self.config.REMOTE_HEALTH_INTERVAL,
+                window=self.config.REMOTE_HEALTH_WINDOW,
+                failure_threshold=self.config.REMOTE_HEALTH_FAILURE_THRESHOLD,
             )
         )
-        self.transfer_manager = TransferManager(
-            self.ssh_client,
-            default_options=(
-                self.config.TRANSFER_DEFAULT_OPTIONS
-                + self.config.TRANSFER_OPTIONS
-            ),
+        self.metrics = (
+            MetricsStore(self.config.METRICS_DATABASE, strict=False)
+            if self.config.EXPOSE_METRICS
+            else None
         )
 
+    def _load_replicas(self) -> list[tuple[str, Transport, Path]]:
+        """
+        Returns name, transport, and destination of the replicas in
+        `TRANSFER_REPLICAS`. Every replica is given as an object with a
+        unique 'name' and the config-attributes that differ from the
+        primary destination.
+        """
+        replicas = []
+        for replica in self.config.TRANSFER_REPLICAS:
+            name = replica.get("name") if isinstance(replica, dict) else None
+            if (
+                not isinstance(name, str)
+                or name in ("", "primary")
+                or name in (other[0] for other in replicas)
+            ):
+                raise RuntimeError(
+                    f"Bad replica '{replica}' in `TRANSFER_REPLICAS`: "
+                    + "replicas require a unique 'name' (other than "
+                    + "'primary')."
+                )
+            config = ConfigOverlay(
+                self.config,
+                {
+                    key: value
+                    for key, value in replica.items()
+                    if key != "name"
+                },
+            )
+            try:
+                transport = get_transport(config.TRANSFER_TRANSPORT)(
+                    config, tracer=self.tracer
+                )
+            except ValueError as exc_info:
+                raise RuntimeError(
+                    f"Bad replica '{name}' in `TRANSFER_REPLICAS`: {exc_info}"
+                ) from exc_info
+            replicas.append((name, transport, config.REMOTE_DESTINATION))
+        return replicas
+
+    def _check_remote(self) -> tuple[bool, str]:
+        """Health check for the remote (see `RemoteHealthMonitor`)."""
+        return self.transport.preflight(self.config.REMOTE_DESTINATION)
+
     def register_job_types(self):
         self.config.worker_pool.register_job_type(
             self.NAME, self.transfer, Report
         )
 
     def configure_bp(self, bp: Blueprint, *args, **kwargs) -> None:
+        # per-request options are limited by config
+        transfer_handler = get_transfer_handler(
+            self.config.FS_MOUNT_POINT,
+            max_compression_level=self.config.REQUEST_MAX_COMPRESSION_LEVEL,
+            max_bandwidth_limit=self.config.REQUEST_MAX_BANDWIDTH_LIMIT,
+            max_parallelism=self.config.REQUEST_MAX_PARALLELISM,
+            max_retries=self.config.REQUEST_MAX_RETRIES,
+            verify_modes=self.config.REQUEST_VERIFY_MODES,
+            priorities=list(
+                PRIORITIES[
+                    : PRIORITIES.index(self.config.REQUEST_MAX_PRIORITY) + 1
+                ]
+            ),
+        )
+
         @bp.route("/transfer", methods=["POST"])
         @flask_handler(  # unknown query
             handler=services.no_args_handler,
             json=flask_args,
         )
         @flask_handler(  # process transfer
-            handler=get_transfer_handler(self.config.FS_MOUNT_POINT),
+            handler=transfer_handler,
             json=flask_json,
         )
         def transfer(
@@ -95,204 +278,957 @@ class TransferView(services.OrchestratedView):
             callback_url: Optional[str] = None,
         ):
             """Submit SIP for transfer to remote system."""
-            try:
-                token = self.config.controller.queue_push(
-                    token or str(uuid4()),
-                    JobInfo(
-                        JobConfig(
-                            self.NAME,
-                            original_body=request.json,
-                            request_body={
-                                "transfer": transfer.json,
-                                "callback_url": callback_url,
-                            },
-                        ),
-                        report=Report(
-                            host=request.host_url, args=request.json
-                        ),
-                    ),
-                )
-            # pylint: disable=broad-exception-caught
-            except Exception as exc_info:
-                return Response(
-                    f"Submission rejected: {exc_info}",
-                    mimetype="text/plain",
-                    status=500,
-                )
+            with self.tracer.span(
+                "POST /transfer", parent=request.headers.get("traceparent")
+            ) as span:
+                request_body = {
+                    "transfer": transfer.json,
+                    "callback_url": callback_url,
+                }
+                if span is not None:
+                    # propagate span context into worker
+                    request_body["trace"] = {
+                        "traceparent": span.traceparent,
+                        "submitted": time_ns(),
+                    }
+                try:
+                    with self.tracer.span("queue_push"):
+                        token = self.config.controller.queue_push(
+                            token or str(uuid4()),
+                            JobInfo(
+                                JobConfig(
+                                    self.NAME,
+                                    original_body=request.json,
+                                    request_body=request_body,
+                                ),
+                                report=Report(
+                                    host=request.host_url, args=request.json
+                                ),
+                            ),
+                        )
+                # pylint: disable=broad-exception-caught
+                except Exception as exc_info:
+                    return Response(
+                        f"Submission rejected: {exc_info}",
+                        mimetype="text/plain",
+                        status=500,
+                    )
 
-            return jsonify(token.json), 201
+                if span is not None:
+                    span.set_attribute("token", token.value)
+                if self.metrics is not None:
+                    self.metrics.inc(metrics.JOBS_SUBMITTED)
+                return jsonify(token.json), 201
 
         self._register_abort_job(bp, "/transfer")
 
     def transfer(self, context: JobContext, info: JobInfo):
         """Job instructions for the '/transfer' endpoint."""
+        info.report.log.set_default_origin("Transfer Module")
+        trace = info.config.request_body.get("trace")
+        parent = None
+        if trace is not None:
+            parent = trace["traceparent"]
+            self.tracer.record(
+                "queue", trace["submitted"], time_ns(), parent=parent
+            )
+        with self.tracer.span("TransferView.transfer", parent=parent):
+            if info.config.request_body["transfer"].get("profile", False):
+                self._run_job_profiled(context, info)
+            else:
+                self._run_job(context, info)
+
+    def _run_job_profiled(self, context: JobContext, info: JobInfo) -> None:
+        """
+        Runs the job with the deterministic profiler (`cProfile`) and
+        writes the profile in pstats-format (only if `ALLOW_PROFILING`).
+        """
+        if not self.config.ALLOW_PROFILING:
+            info.report.log.log(
+                Context.WARNING,
+                body="Profiling has been requested but is not enabled.",
+            )
+            self._run_job(context, info)
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as exc_info:
+            # another profiler is already active in this process
+            info.report.log.log(
+                Context.WARNING, body=f"Unable to profile job: {exc_info}"
+            )
+            self._run_job(context, info)
+            return
+        profile_file = (
+            self.config.PROFILING_DIRECTORY
+            / f"{info.report.token.value}.pstats"
+        )
+        info.report.data.profile = str(profile_file)
+        try:
+            self._run_job(context, info)
+        finally:
+            profiler.disable()
+            profile_file = self.config.FS_MOUNT_POINT / profile_file
+            profile_file.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(profile_file)
+
+    def _run_job(self, context: JobContext, info: JobInfo) -> None:
+        """Runs the job and makes the callback."""
         os.chdir(self.config.FS_MOUNT_POINT)
         transfer_config = TransferConfig.from_json(
             info.config.request_body["transfer"]
         )
-        info.report.log.set_default_origin("Transfer Module")
-
-        # set progress info
-        info.report.progress.verbose = "testing SSH-connection to remote" + (
-            ""
-            if self.config.LOCAL_TRANSFER
-            else f" at '{self.ssh_client.destination}'"
-        )
-        context.push()
+        settings = self._transfer_settings(transfer_config)
 
-        # check connection to remote
-        if not self.config.LOCAL_TRANSFER:
-            query = self.ssh_client.query_remote("echo 'ok'")
-            if query.returncode != 0:
-                # abort job
-                info.report.data.success = False
-                info.report.log.log(
-                    Context.ERROR,
-                    body="Unable to establish connection to remote ("
-                    + query.stderr.replace("\n", "")
-                    + "). Aborting..",
+        if self.metrics is not None:
+            self.metrics.inc(metrics.JOBS_STARTED)
+            self.metrics.add(metrics.ACTIVE_TRANSFERS, 1)
+        try:
+            with PhaseTimer(
+                on_record=lambda name, attempt, duration: self._record_phase(
+                    info.report.data, name, attempt, duration
                 )
-                context.push()
+            ) as timer:
+                # wait while remote is known to be unavailable
+                available = True
+                if self.health is not None:
+                    timer.start("remote_health")
+                    available = self._await_remote(context, info)
+                    if not available:
+                        timer.fail()
+                if available:
+                    # a connection slot (admission control) is held from
+                    # the first connection to the remote until the
+                    # transfer is finished
+                    with _JobSlot(
+                        lambda: self._acquire_slot(
+                            context, info, settings["priority"]
+                        )
+                    ) as slot:
+                        timer.start("slot")
+                        if slot.acquire():
+                            self._transfer(
+                                context, info, transfer_config, timer,
+                                settings, slot
+                            )
+                        else:
+                            timer.fail()
+
                 # make callback; rely on _run_callback to push progress-update
                 info.report.progress.complete()
+                timer.start("callback")
                 self._run_callback(
                     context, info, info.config.request_body.get("callback_url")
                 )
-                return
+        finally:
+            if self.metrics is not None:
+                self.metrics.add(metrics.ACTIVE_TRANSFERS, -1)
+        context.push()
 
-        # if ran locally, create output directory
-        if self.config.LOCAL_TRANSFER:
-            self.config.REMOTE_DESTINATION.mkdir(parents=True, exist_ok=True)
+        if self.metrics is not None:
+            self._record_metrics(info.report.data, timer)
 
-        # Check for existence of output in destination
-        target_dst = (
-            self.config.REMOTE_DESTINATION / transfer_config.target.path.name
+    def _acquire_slot(
+        self, context: JobContext, info: JobInfo, priority: str = "normal"
+    ) -> Optional[SemaphoreSlot]:
+        """
+        Returns a `SemaphoreSlot` for the configured remote or `None` if
+        no slot became available within `TRANSFER_SLOT_TIMEOUT`. The
+        slots that are available to a job depend on its `priority` (see
+        `TRANSFER_PRIORITY_SLOTS`).
+        """
+        limit = self.config.TRANSFER_PRIORITY_SLOTS.get(priority)
+
+        def on_wait():
+            info.report.progress.verbose = "waiting for a free connection slot"
+            info.report.log.log(
+                Context.INFO,
+                body="Maximum number of concurrent connections ("
+                + str(
+                    self.semaphore.slots
+                    if limit is None
+                    else min(limit, self.semaphore.slots)
+                )
+                + (f" for priority '{priority}'" if limit is not None else "")
+                + ") reached, waiting..",
+            )
+            context.push()
+
+        slot = self.semaphore.acquire(
+            timeout=self.config.TRANSFER_SLOT_TIMEOUT,
+            interval=self.config.TRANSFER_SLOT_INTERVAL,
+            on_wait=on_wait,
+            limit=limit,
         )
-        info.report.progress.verbose = (
-            f"checking availability of target destination '{target_dst}'"
+        if slot is None:
+            info.report.data.success = False
+            info.report.log.log(
+                Context.ERROR,
+                body="Unable to acquire a connection slot within "
+                + f"{self.config.TRANSFER_SLOT_TIMEOUT}s. Aborting..",
+            )
+            context.push()
+        return slot
+
+    def _await_remote(self, context: JobContext, info: JobInfo) -> bool:
+        """
+        Returns `True` if the circuit breaker of the remote's health
+        monitor is closed (or the state is unknown) within
+        `REMOTE_HEALTH_WAIT`. Otherwise, the job is marked as failed.
+        """
+        def on_wait(state: dict):
+            info.report.progress.verbose = (
+                "waiting for remote to become available"
+            )
+            info.report.log.log(
+                Context.INFO,
+                body="Remote is currently unavailable ("
+                + str(state.get("message"))
+                + "), waiting..",
+            )
+            context.push()
+
+        if self.health.wait(
+            self.config.REMOTE_HEALTH_WAIT,
+            interval=min(1, self.config.REMOTE_HEALTH_INTERVAL),
+            on_wait=on_wait if self.config.REMOTE_HEALTH_WAIT > 0 else None,
+        ):
+            return True
+        info.report.data.success = False
+        info.report.log.log(
+            Context.ERROR,
+            body="Remote is unavailable ("
+            + str(self.health.status().get("message"))
+            + "). Aborting..",
         )
         context.push()
-        if self.transfer_manager.dir_exists(target_dst):
-            if not self.config.OVERWRITE_EXISTING:
-                # stop transfer if the target directory is present
-                info.report.data.success = False
+        return False
+
+    @staticmethod
+    def _update_metrics(
+        result: TransferResult, progress: RsyncProgress, elapsed: float
+    ) -> None:
+        """
+        Updates `result.metrics` with the numeric values of `progress`;
+        values that are not available in `progress` are retained.
+        """
+        if result.metrics is None:
+            result.metrics = TransferMetrics()
+        result.metrics.elapsed = elapsed
+        for name in (
+            "bytes", "bytes_per_second", "eta", "files_done", "files_total"
+        ):
+            if (value := getattr(progress, name)) is not None:
+                setattr(result.metrics, name, value)
+        if progress.xfr is not None:
+            result.metrics.files_transferred = progress.xfr
+
+    @staticmethod
+    def _record_phase(
+        result: TransferResult,
+        name: str,
+        attempt: Optional[int],
+        duration: float,
+    ) -> None:
+        """Appends a `TransferPhase` to `result.phases`."""
+        if result.phases is None:
+            result.phases = []
+        result.phases.append(TransferPhase(name, duration, attempt))
+
+    # failure class by the phase in which a job has been stopped
+    _FAILURE_CLASSES = {
+        "remote_health": "remote_unavailable",
+        "slot": "slot_timeout",
+        "connection_test": "connection",
+        "destination_check": "destination_exists",
+        "deletion": "deletion",
+        "space_check": "insufficient_space",
+        "verification": "verification",
+    }
+
+    def _record_metrics(
+        self, result: TransferResult, timer: PhaseTimer
+    ) -> None:
+        """Records the outcome of a finished job in `self.metrics`."""
+        for name, _, duration in timer.phases:
+            self.metrics.observe(
+                metrics.PHASE_DURATION, duration, {"phase": name}
+            )
+        self.metrics.observe(
+            metrics.JOB_DURATION,
+            sum(duration for _, _, duration in timer.phases),
+        )
+        attempts = [
+            duration
+            for name, _, duration in timer.phases
+            if name == "transfer_attempt"
+        ]
+        if len(attempts) > 1:
+            self.metrics.inc(metrics.RETRIES, len(attempts) - 1)
+
+        if not result.success:
+            self.metrics.inc(
+                metrics.JOBS_FINISHED, labels={"result": "failure"}
+            )
+            self.metrics.inc(
+                metrics.FAILURES,
+                labels={
+                    "class": self._FAILURE_CLASSES.get(
+                        timer.failed_phase, "transfer"
+                    )
+                },
+            )
+            return
+        self.metrics.inc(metrics.JOBS_FINISHED, labels={"result": "success"})
+        transferred = None
+        if result.stats is not None:
+            transferred = result.stats.total_transferred_size
+        if transferred is None and result.metrics is not None:
+            transferred = result.metrics.bytes
+        if transferred is None:
+            return
+        self.metrics.inc(metrics.BYTES, transferred)
+        if attempts and attempts[-1] > 0:
+            self.metrics.observe(
+                metrics.THROUGHPUT, transferred / attempts[-1]
+            )
+
+    def _transfer_settings(self, transfer_config: TransferConfig) -> dict:
+        """
+        Returns the effective settings of a job, i.e., the per-request
+        `TransferOptions` with fallback to the configuration. The
+        result contains the options that are passed to the transport
+        ('options') as well as 'retries', 'verify', and 'priority'.
+        """
+        options = transfer_config.options or TransferOptions()
+        # the default is subject to the same limit as requests
+        bwlimit = self.config.BW_LIMIT
+        if self.config.REQUEST_MAX_BANDWIDTH_LIMIT > 0 and (
+            bwlimit <= 0 or bwlimit > self.config.REQUEST_MAX_BANDWIDTH_LIMIT
+        ):
+            bwlimit = self.config.REQUEST_MAX_BANDWIDTH_LIMIT
+        retries = (
+            self.config.TRANSFER_RETRIES
+            if options.retries is None
+            else options.retries
+        )
+        return {
+            "options": {
+                "timeout": self.config.TRANSFER_TIMEOUT,
+                "compression": (
+                    self.config.USE_COMPRESSION
+                    if options.compression is None
+                    else options.compression
+                ),
+                "compression_level": (
+                    self.config.COMPRESSION_LEVEL
+                    if options.compression_level is None
+                    else options.compression_level
+                ),
+                "checksums": (
+                    self.config.VALIDATE_CHECKSUMS
+                    if options.verify is None
+                    else options.verify in ("checksums", "full")
+                ),
+                "mirror": True,
+                "resume": retries > 0,
+                "bwlimit": (
+                    bwlimit
+                    if options.bandwidth_limit is None
+                    else options.bandwidth_limit
+                ),
+                "parallelism": options.parallelism,
+            },
+            "retries": retries,
+            "verify": (
+                self.config.TRANSFER_VERIFY
+                if options.verify is None
+                else options.verify in ("verify", "full")
+            ),
+            "priority": options.priority or "normal",
+        }
+
+    @staticmethod
+    def _report_stderr(info: JobInfo, push: Callable, line: str) -> None:
+        """
+        Adds a message from the stderr of a running transfer to
+        `info.report` and calls `push` (executed in the job's thread,
+        see `TransferManager.transfer`).
+        """
+        info.report.log.log(
+            Context.INFO,
+            origin="Transfer Manager",
+            body=f"Transfer reported: {line}",
+        )
+        push()
+
+    def _attempt_transfers(
+        self,
+        context: JobContext,
+        info: JobInfo,
+        transfer_config: TransferConfig,
+        timer: PhaseTimer,
+        target_dst: Path,
+        progress_file: TextIO,
+        file_names: bool,
+        settings: dict,
+        slot: _JobSlot,
+    ) -> None:
+        """
+        Runs the transfer (including retries) of the SIP into
+        `target_dst` with `settings` (see `_transfer_settings`); the
+        result is merged into `info.report`. The connection `slot` is
+        held during every attempt.
+
+        Progress is written to `progress_file` (including the names of
+        the transferred files if `file_names`).
+        """
+        for retry in range(1 + settings["retries"]):
+            # attempt transfer
+            timer.start("transfer_attempt", retry)
+            kwargs = {
+                "src": transfer_config.target.path,
+                "dst": target_dst,
+                **settings["options"],
+                "file_names": file_names,
+            }
+            tm_log = self.transport.transfer(
+                progress_file=progress_file,
+                on_stderr=lambda line: self._report_stderr(
+                    info, context.push, line
+                ),
+                **kwargs,
+            )
+            # eval results and merge into main log
+            info.report.log.merge(tm_log)
+            context.push()
+
+            if Context.ERROR not in tm_log:
+                break
+            if retry < settings["retries"]:
                 info.report.log.log(
-                    Context.ERROR,
-                    body="SIP transfer cannot be executed. "
-                    + f"The target destination '{target_dst}' already exists.",
+                    Context.EVENT,
+                    body="SIP transfer attempt failed, retrying in "
+                    + f"{self.config.TRANSFER_RETRY_INTERVAL}s..",
                 )
                 context.push()
-                # make callback; rely on _run_callback to push progress-update
-                info.report.progress.complete()
-                self._run_callback(
-                    context, info, info.config.request_body.get("callback_url")
+                if not self._retry_wait(context, info, timer, slot, retry):
+                    return
+        else:
+            # all attempts have failed
+            timer.fail()
+
+    def _retry_wait(
+        self,
+        context: JobContext,
+        info: JobInfo,
+        timer: PhaseTimer,
+        slot: _JobSlot,
+        retry: int,
+    ) -> bool:
+        """
+        Waits `TRANSFER_RETRY_INTERVAL` after the failed attempt `retry`
+        without holding the connection `slot`. Returns `True` if the
+        slot has been acquired again afterwards.
+        """
+        slot.release()
+        timer.start("retry_wait", retry)
+        _sleep(self.config.TRANSFER_RETRY_INTERVAL)
+        timer.start("slot", retry + 1)
+        if not slot.acquire():
+            timer.fail()
+            return False
+        return True
+
+    def _attempt_fanout(
+        self,
+        context: JobContext,
+        info: JobInfo,
+        transfer_config: TransferConfig,
+        timer: PhaseTimer,
+        destinations: list[tuple[str, Transport, Path]],
+        progress_file: Optional[TextIO],
+        settings: dict,
+        slot: _JobSlot,
+    ) -> None:
+        """
+        Runs the transfer (including retries) of the SIP into all
+        `destinations` (name, transport, and target) with `settings`
+        (see `_transfer_settings`) while reading the SIP only once per
+        attempt (see `FanOut`); results are merged into `info.report`.
+        Retries only include the destinations that have failed. The
+        connection `slot` is held during every attempt.
+        """
+        results = {
+            result.name: result for result in info.report.data.destinations
+        }
+        # receivers that stall are aborted after the stall timeout
+        # (plus the time a chunk takes at the bandwidth limit)
+        timeout = self.config.TRANSFER_FANOUT_STALL_TIMEOUT or None
+        if timeout is not None and settings["options"]["bwlimit"]:
+            timeout += self.config.TRANSFER_FANOUT_CHUNK_SIZE / (
+                settings["options"]["bwlimit"] * 1024
+            )
+        fanout = FanOut(
+            chunk_size=self.config.TRANSFER_FANOUT_CHUNK_SIZE,
+            buffer_size=self.config.TRANSFER_FANOUT_BUFFER,
+            timeout=timeout,
+        )
+        pending = destinations
+        for retry in range(1 + settings["retries"]):
+            # attempt transfer
+            timer.start("transfer_attempt", retry)
+            kwargs = settings["options"]
+            logs = fanout.run(
+                transfer_config.target.path,
+                {
+                    name: (
+                        lambda stream, transport=transport, dst=dst: (
+                            transport.receive(stream, dst, **kwargs)
+                        )
+                    )
+                    for name, transport, dst in pending
+                },
+                progress_file,
+            )
+            # eval results and merge into main log
+            for name, _, dst in pending:
+                results[name].attempts = retry + 1
+                results[name].success = Context.ERROR not in logs[name]
+                info.report.log.merge(logs[name])
+                info.report.log.log(
+                    Context.EVENT,
+                    body=f"Transfer into destination '{name}' ('{dst}') "
+                    + ("succeeded." if results[name].success else "failed."),
                 )
-                return
-            rm_status, _, rm_stderr = self.transfer_manager.rm(target_dst)
-            if rm_status != 0:
-                # stop transfer if the target directory is present and
-                # cannot be deleted
-                info.report.data.success = False
+            context.push()
+
+            pending = [
+                destination
+                for destination in pending
+                if not results[destination[0]].success
+            ]
+            if not pending:
+                break
+            if retry < settings["retries"]:
                 info.report.log.log(
-                    Context.ERROR,
-                    origin="Transfer Manager",
-                    body=f"Conflicting transfer destination '{target_dst}'. "
-                    + "Problem encountered while trying to delete: "
-                    + f"{rm_stderr}",
+                    Context.EVENT,
+                    body="SIP transfer attempt failed for "
+                    + ", ".join(f"'{name}'" for name, _, _ in pending)
+                    + ", retrying in "
+                    + f"{self.config.TRANSFER_RETRY_INTERVAL}s..",
                 )
                 context.push()
-                # make callback; rely on _run_callback to push progress-update
-                info.report.progress.complete()
-                self._run_callback(
-                    context, info, info.config.request_body.get("callback_url")
+                if not self._retry_wait(context, info, timer, slot, retry):
+                    return
+        else:
+            # all attempts have failed
+            timer.fail()
+
+    def _cleanup_aborted(
+        self, destinations: list[tuple[str, Transport, Path]]
+    ) -> None:
+        """
+        Removes the partially transferred targets of `destinations`
+        (name, transport, and target) after an abort if requested by
+        `TRANSFER_ABORT_CLEANUP`.
+        """
+        if self.config.TRANSFER_ABORT_CLEANUP != "delete":
+            return
+        for _, transport, target_dst in destinations:
+            try:
+                transport.remove(target_dst)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                # do not mask the original exception
+                pass
+
+    def _transfer(
+        self,
+        context: JobContext,
+        info: JobInfo,
+        transfer_config: TransferConfig,
+        timer: PhaseTimer,
+        settings: dict,
+        slot: _JobSlot,
+    ) -> None:
+        """
+        Performs the actual transfer-job with `settings` (see
+        `_transfer_settings`); results are written to `info.report` and
+        durations of the individual phases are recorded with `timer`.
+
+        The connection `slot` has to be held; it is only released while
+        waiting for a retry.
+        """
+        # the primary destination is followed by the replicas (if any)
+        destinations = [
+            (
+                "primary",
+                self.transport,
+                self.config.REMOTE_DESTINATION
+                / transfer_config.target.path.name,
+            )
+        ] + [
+            (name, transport, destination / transfer_config.target.path.name)
+            for name, transport, destination in self.replicas
+        ]
+        if self.replicas:
+            info.report.data.destinations = [
+                DestinationResult(
+                    name,
+                    str(target_dst),
+                    transport.description,
+                    attempts=0,
                 )
+                for name, transport, target_dst in destinations
+            ]
+        # a replica that cannot be prepared is skipped such that the
+        # other destinations are still written (the job fails
+        # nonetheless, see `_run_transfer`); the primary destination is
+        # required
+        prepared = []
+        for index, (name, transport, target_dst) in enumerate(
+            destinations
+        ):
+            if self._prepare_destination(
+                context,
+                info,
+                timer,
+                transport,
+                target_dst,
+                "" if not self.replicas else f" ('{name}')",
+                required=index == 0,
+            ):
+                prepared.append((name, transport, target_dst))
+                continue
+            if self.replicas:
+                info.report.data.destinations[index].success = False
+            if index == 0:
                 return
-            # warn and continue
-            info.report.log.log(
-                Context.WARNING,
-                body=f"Conflicting transfer destination '{target_dst}' has "
-                + "been deleted.",
+        destinations = prepared
+
+        # check for sufficient space in destination
+        reservation = None
+        if self.config.TRANSFER_SPACE_CHECK:
+            timer.start("space_check")
+            reservation = self._check_space(
+                context, info, transfer_config
             )
-            context.push()
+            if reservation is None:
+                timer.fail()
+                return
+
+        try:
+            self._run_transfer(
+                context, info, transfer_config, timer, destinations,
+                settings, slot
+            )
+        finally:
+            if reservation is not None:
+                reservation.release()
+
+    def _prepare_destination(
+        self,
+        context: JobContext,
+        info: JobInfo,
+        timer: PhaseTimer,
+        transport: Transport,
+        target_dst: Path,
+        label: str = "",
+        required: bool = True,
+    ) -> bool:
+        """
+        Tests the connection to the remote of `transport`, prepares the
+        destination, and handles an existing `target_dst` (see
+        `OVERWRITE_EXISTING`). Returns `False` if the destination is
+        not available; the problem is logged as error (i.e., the job
+        fails in any case) but only a `required` destination stops the
+        job.
 
+        Keyword arguments:
+        context -- job context
+        info -- job info
+        timer -- phase timer
+        transport -- transport of the destination
+        target_dst -- target of the SIP in the destination
+        label -- suffix that identifies the destination in log messages
+                 (default "")
+        required -- whether the job cannot continue without this
+                    destination (otherwise it is skipped)
+                    (default True)
+        """
         # set progress info
-        info.report.progress.verbose = (
-            f"preparing transfer of SIP '{transfer_config.target.path}'"
+        info.report.progress.verbose = "testing connection to remote" + (
+            f" at '{transport.description}'" if transport.remote else ""
         )
         context.push()
 
-        # create fifo
-        fifo = Path(tempfile.mkdtemp()) / info.report.token.value
-        os.mkfifo(fifo)
-
-        # register parser and open fifo
-        self.parser.listen(fifo, info.report.progress, context.push)
-        progress_file = io.open(  # pylint: disable=consider-using-with
-            fifo, "w", encoding="utf-8"
+        # check connection to remote (if ran locally, only create output
+        # directory)
+        timer.start(
+            "connection_test" if transport.remote else "destination_check"
         )
+        ok, message = transport.preflight(target_dst.parent)
+        if not ok:
+            # abort job (or skip destination)
+            if required:
+                info.report.data.success = False
+            info.report.log.log(
+                Context.ERROR,
+                body=f"Unable to establish connection to remote{label} ("
+                + message.replace("\n", "")
+                + (
+                    "). Aborting.."
+                    if required
+                    else "). Skipping destination.."
+                ),
+            )
+            context.push()
+            timer.fail()
+            return False
+        if transport.remote:
+            timer.start("destination_check")
 
-        # start transfer
+        # Check for existence of output in destination
         info.report.progress.verbose = (
-            f"transferring SIP '{transfer_config.target.path}'"
+            f"checking availability of target destination '{target_dst}'"
         )
+        context.push()
+        if not transport.exists(target_dst):
+            return True
+        if not self.config.OVERWRITE_EXISTING:
+            # stop transfer if the target directory is present
+            if required:
+                info.report.data.success = False
+            info.report.log.log(
+                Context.ERROR,
+                body="SIP transfer cannot be executed. "
+                + f"The target destination '{target_dst}'{label} already "
+                + "exists.",
+            )
+            context.push()
+            timer.fail()
+            return False
+        timer.start("deletion")
+        rm_status, _, rm_stderr = transport.remove(target_dst)
+        if rm_status != 0:
+            # stop transfer if the target directory is present and
+            # cannot be deleted
+            if required:
+                info.report.data.success = False
+            info.report.log.log(
+                Context.ERROR,
+                origin="Transfer Manager",
+                body=f"Conflicting transfer destination '{target_dst}'"
+                + f"{label}. Problem encountered while trying to delete: "
+                + f"{rm_stderr}",
+            )
+            context.push()
+            timer.fail()
+            return False
+        # warn and continue
         info.report.log.log(
-            Context.EVENT,
-            body=f"Attempting transfer of SIP '{transfer_config.target.path}'.",
+            Context.WARNING,
+            body=f"Conflicting transfer destination '{target_dst}'{label} "
+            + "has been deleted.",
         )
         context.push()
-        for retry in range(1 + self.config.TRANSFER_RETRIES):
-            # attempt transfer
-            tm_log = self.transfer_manager.transfer(
-                src=transfer_config.target.path,
-                dst=target_dst,
-                transfer_timeout=self.config.TRANSFER_TIMEOUT,
-                progress_file=progress_file,
-                use_compression=self.config.USE_COMPRESSION,
-                compression_level=self.config.COMPRESSION_LEVEL,
-                validate_checksums=self.config.VALIDATE_CHECKSUMS,
-                mirror=True,
-                partial=self.config.TRANSFER_RETRIES > 0,
-                resume=self.config.TRANSFER_RETRIES > 0,
-                bwlimit=self.config.BW_LIMIT,
+        return True
+
+    def _check_space(
+        self,
+        context: JobContext,
+        info: JobInfo,
+        transfer_config: TransferConfig,
+    ) -> Optional[SpaceReservation]:
+        """
+        Returns a `SpaceReservation` if the remote provides sufficient
+        space for the SIP (including `TRANSFER_SPACE_RESERVE` and the
+        reservations of concurrent jobs if `TRANSFER_SPACE_LEDGER`).
+        Otherwise, the job is marked as failed and `None` is returned.
+
+        If the available space cannot be determined, a warning is
+        logged and a dummy reservation is returned.
+        """
+        info.report.progress.verbose = (
+            "checking available space in destination "
+            + f"'{self.config.REMOTE_DESTINATION}'"
+        )
+        context.push()
+        required = directory_size(transfer_config.target.path)
+        available = self.transport.free_space(
+            self.config.REMOTE_DESTINATION
+        )
+        if available is None:
+            info.report.log.log(
+                Context.WARNING,
+                body="Unable to determine available space in destination "
+                + f"'{self.config.REMOTE_DESTINATION}', continuing..",
             )
-            # eval results and merge into main log
-            info.report.log.merge(tm_log)
             context.push()
-
-            if Context.ERROR not in tm_log:
-                break
-            if retry < self.config.TRANSFER_RETRIES:
-                info.report.log.log(
-                    Context.EVENT,
-                    body="SIP transfer attempt failed, "
-                    + f"retrying in {self.config.TRANSFER_RETRY_INTERVAL}s..",
+            return SpaceReservation(None, "", required)
+        if self.ledger is not None:
+            reservation = self.ledger.reserve(
+                required, available, self.config.TRANSFER_SPACE_RESERVE
+            )
+        elif available - self.config.TRANSFER_SPACE_RESERVE >= required:
+            reservation = SpaceReservation(None, "", required)
+        else:
+            reservation = None
+        if reservation is None:
+            info.report.data.success = False
+            info.report.log.log(
+                Context.ERROR,
+                body="Insufficient space in destination "
+                + f"'{self.config.REMOTE_DESTINATION}' (required: "
+                + f"{required} bytes, available: {available} bytes, "
+                + f"reserve: {self.config.TRANSFER_SPACE_RESERVE} bytes"
+                + (
+                    ""
+                    if self.ledger is None
+                    else ", including reservations of concurrent jobs"
                 )
-                context.push()
-                sleep(self.config.TRANSFER_RETRY_INTERVAL)
+                + "). Aborting..",
+            )
+            context.push()
+        return reservation
+
+    def _verify(
+        self,
+        context: JobContext,
+        info: JobInfo,
+        transfer_config: TransferConfig,
+        timer: PhaseTimer,
+        destinations: list[tuple[str, Transport, Path]],
+    ) -> None:
+        """
+        Verifies the SIP in `destinations` (name, transport, and
+        target); results are merged into `info.report`.
+        """
+        timer.start("verification")
+        info.report.progress.verbose = "verifying transfer"
+        context.push()
+        results = {
+            result.name: result
+            for result in info.report.data.destinations or []
+        }
+        for name, transport, target_dst in destinations:
+            if self.replicas:
+                result = results[name]
+                if not result.success:
+                    continue
+            log = transport.verify(transfer_config.target.path, target_dst)
+            info.report.log.merge(log)
+            if Context.ERROR in log:
+                timer.fail()
+                if self.replicas:
+                    result.success = False
+        context.push()
+
+    def _run_transfer(
+        self,
+        context: JobContext,
+        info: JobInfo,
+        transfer_config: TransferConfig,
+        timer: PhaseTimer,
+        destinations: list[tuple[str, Transport, Path]],
+        settings: dict,
+        slot: _JobSlot,
+    ) -> None:
+        """
+        Transfers the SIP into `destinations` (name, transport, and
+        target; the first is the primary destination) while holding the
+        connection `slot` and evaluates the result (see `_transfer`).
+        """
+        # set progress info
+        info.report.progress.verbose = (
+            f"preparing transfer of SIP '{transfer_config.target.path}'"
+        )
+        context.push()
+
+        # open progress channel and start transfer
+        timer.start("channel_setup")
+        timeline = (
+            FileTimeline() if self.config.TRANSFER_FILE_TIMELINE else None
+        )
+        stats = RsyncStats()
+        with ProgressChannel(
+            info.report.progress,
+            context.push,
+            self.parser,
+            push_interval=self.config.PROGRESS_PUSH_INTERVAL,
+            push_delta=self.config.PROGRESS_PUSH_DELTA,
+            on_update=lambda parsed, elapsed: self._update_metrics(
+                info.report.data, parsed, elapsed
+            ),
+            timeline=timeline,
+            stats=stats,
+        ) as progress_file:
+            info.report.progress.verbose = (
+                f"transferring SIP '{transfer_config.target.path}'"
+            )
+            info.report.log.log(
+                Context.EVENT,
+                body="Attempting transfer of SIP "
+                + f"'{transfer_config.target.path}'.",
+            )
+            context.push()
+            try:
+                if self.replicas:
+                    self._attempt_fanout(
+                        context, info, transfer_config, timer, destinations,
+                        progress_file, settings, slot
+                    )
+                else:
+                    self._attempt_transfers(
+                        context, info, transfer_config, timer,
+                        destinations[0][2], progress_file,
+                        timeline is not None, settings, slot
+                    )
+            except SystemExit:
+                # the orchestra aborts a job by raising SystemExit in the
+                # job's thread (rsync is already terminated)
+                self._cleanup_aborted(destinations)
+                raise
+            timer.start("cleanup")
 
         info.report.progress.verbose = "cleaning up"
+        if stats.values:
+            info.report.data.stats = TransferStats(**stats.values)
         context.push()
 
-        # close fifo
-        progress_file.close()
+        # write per-file timeline
+        if timeline is not None:
+            timeline_file = (
+                self.config.TRANSFER_TIMELINE_DIRECTORY
+                / f"{info.report.token.value}.json"
+            )
+            timeline.write(timeline_file)
+            info.report.data.timeline = str(timeline_file)
+            context.push()
+
+        # verify result
+        if settings["verify"] and (
+            self.replicas or Context.ERROR not in info.report.log
+        ):
+            # the slot is not held if it could not be acquired again
+            # after a retry wait
+            if not slot.held:
+                timer.start("slot")
+                if not slot.acquire():
+                    timer.fail()
+            if slot.held:
+                self._verify(
+                    context, info, transfer_config, timer, destinations
+                )
 
         # evaluate results
         if Context.ERROR not in info.report.log:
             info.report.data.success = True
             info.report.log.log(Context.INFO, body="SIP transfer complete.")
             context.push()
-            # make callback; rely on _run_callback to push progress-update
-            info.report.progress.complete()
-            self._run_callback(
-                context, info, info.config.request_body.get("callback_url")
-            )
             return
         info.report.data.success = False
         info.report.log.log(Context.ERROR, body="SIP transfer failed.")
         context.push()
-
-        # make callback; rely on _run_callback to push progress-update
-        info.report.progress.complete()
-        self._run_callback(
-            context, info, info.config.request_body.get("callback_url")
-        )
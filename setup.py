@@ -22,6 +22,7 @@ setup(
     ],
     extras_require={
         "cors": ["Flask-CORS==4"],
+        "s3": ["boto3==1.*"],
     },
     setuptools_git_versioning={
           "enabled": True,
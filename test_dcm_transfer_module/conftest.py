@@ -1,5 +1,7 @@
 from pathlib import Path
 from shutil import rmtree
+from uuid import uuid4
+import os
 
 import pytest
 from dcm_common.services.tests import (
@@ -49,6 +51,48 @@ def _fixtures():
     return Path("test_dcm_transfer_module/fixtures/")
 
 
+@pytest.fixture(name="temp_dir")
+def _temp_dir(file_storage):
+    """Returns a new, not yet existing path in `file_storage`."""
+    return file_storage / str(uuid4())
+
+
+@pytest.fixture(name="src")
+def _src(temp_dir):
+    """
+    Returns a small directory tree with a nested, a multi-part, and an
+    empty file.
+    """
+    (temp_dir / "data").mkdir(parents=True)
+    (temp_dir / "small").write_bytes(b"small")
+    (temp_dir / "data" / "large").write_bytes(bytes(range(256)) * 10)
+    (temp_dir / "data" / "empty").write_bytes(b"")
+    return temp_dir
+
+
+@pytest.fixture(scope="session", name="fake_ssh")
+def _fake_ssh():
+    """Returns command of the ssh-stand-in (see `benchmarks/fake`)."""
+    return str(Path("benchmarks/fake/ssh").resolve())
+
+
+@pytest.fixture(scope="session", name="fake_rsync")
+def _fake_rsync():
+    """Returns command of the rsync-stand-in (see `benchmarks/fake`)."""
+    return str(Path("benchmarks/fake/rsync").resolve())
+
+
+@pytest.fixture(name="restore_cwd")
+def _restore_cwd():
+    """
+    Restores the working directory after tests that run the view
+    directly (the job changes into `FS_MOUNT_POINT`).
+    """
+    cwd = Path.cwd().resolve()
+    yield cwd
+    os.chdir(cwd)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def prepare_key_fixtures(fixtures):
     """Sets correct file access permissions for ssh-key fixtures."""
@@ -105,6 +149,27 @@ def _testing_config_remote(testing_config, remote_storage_server):
     return TestingConfig
 
 
+@pytest.fixture(name="testing_config_fake")
+def _testing_config_fake(
+    testing_config, file_storage, fake_ssh, fake_rsync, monkeypatch, tmp_path
+):
+    """
+    Returns test-config for transfer to a stand-in remote (see
+    `benchmarks/fake`)
+    """
+    monkeypatch.setenv("FAKE_STATE_DIRECTORY", str(tmp_path / "fake"))
+
+    class TestingConfig(testing_config):
+        LOCAL_TRANSFER = False
+        SSH_COMMAND = fake_ssh
+        RSYNC_COMMAND = fake_rsync
+        REMOTE_DESTINATION = file_storage.resolve() / "remote_fake"
+        TRANSFER_LOCK_DIRECTORY = tmp_path / "locks"
+
+    TestingConfig.REMOTE_DESTINATION.mkdir(parents=True, exist_ok=True)
+    return TestingConfig
+
+
 @pytest.fixture(name="test_sip")
 def _test_sip(file_storage):
     """Create a test-SIP and returns path relative to `file_storage`."""
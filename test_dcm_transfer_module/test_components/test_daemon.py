@@ -0,0 +1,203 @@
+"""RsyncDaemonManager/-Transport-component test-module."""
+
+from pathlib import Path
+from uuid import uuid4
+import os
+import shutil
+import socket
+import subprocess
+from time import sleep
+
+import pytest
+from dcm_common import LoggingContext as Context
+
+from dcm_transfer_module.components import (
+    RsyncDaemonManager,
+    RsyncDaemonTransport,
+    get_transport,
+)
+
+
+@pytest.fixture(name="rsync_daemon")
+def _rsync_daemon(tmp_path: Path):
+    """
+    Runs an rsync daemon on localhost with the modules 'dcm' and
+    'secure' (user 'dcm', password 'secret') and returns its address
+    and the root directory of both modules.
+    """
+    if shutil.which("rsync") is None:
+        pytest.skip("rsync is not available")
+    root = tmp_path / "module"
+    root.mkdir()
+    secrets = tmp_path / "rsyncd.secrets"
+    secrets.write_text("dcm:secret\n", encoding="utf-8")
+    secrets.chmod(0o600)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = tmp_path / "rsyncd.conf"
+    # the daemon drops privileges (to 'nobody') if run as root
+    ids = f"uid = {os.getuid()}\ngid = {os.getgid()}\n"
+    config.write_text(
+        "use chroot = no\n"
+        + (ids if os.getuid() == 0 else "")
+        + f"[dcm]\npath = {root}\nread only = no\n"
+        + f"[secure]\npath = {root}\nread only = no\n"
+        + f"auth users = dcm\nsecrets file = {secrets}\n",
+        encoding="utf-8",
+    )
+    with subprocess.Popen(
+        [
+            "rsync",
+            "--daemon",
+            "--no-detach",
+            "--address=127.0.0.1",
+            f"--port={port}",
+            f"--config={config}",
+            f"--log-file={tmp_path / 'rsyncd.log'}",
+        ]
+    ) as daemon:
+        try:
+            for _ in range(50):
+                try:
+                    socket.create_connection(("127.0.0.1", port)).close()
+                    break
+                except OSError:
+                    sleep(0.1)
+            else:
+                pytest.skip("rsync daemon did not start")
+            yield f"127.0.0.1:{port}", root
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+@pytest.fixture(name="transport")
+def _transport(rsync_daemon):
+    return RsyncDaemonTransport(
+        RsyncDaemonManager(f"rsync://{rsync_daemon[0]}/dcm")
+    )
+
+
+def test_rsync_daemon_transport(
+    transport: RsyncDaemonTransport, rsync_daemon, file_storage: Path
+):
+    """Test operations of `RsyncDaemonTransport`."""
+    module_root = rsync_daemon[1]
+    assert get_transport("rsync-daemon") == RsyncDaemonTransport.from_config
+    assert transport.key == f"rsync://{rsync_daemon[0]}/dcm"
+    assert transport.remote
+    assert transport.free_space(Path("/")) is None
+    assert not transport.streaming
+
+    destination = Path("/remote_storage")
+    assert transport.preflight(destination) == (True, "")
+    assert (module_root / "remote_storage").is_dir()
+
+    src = file_storage / str(uuid4())
+    src.mkdir()
+    (src / "file").write_bytes(b"data")
+    dst = destination / src.name
+    assert not transport.exists(dst)
+    log = transport.transfer(src, dst, mirror=True, resume=True)
+    assert Context.ERROR not in log
+    assert transport.exists(dst)
+    assert not transport.exists(dst / "file")
+    assert transport.daemon_manager.file_exists(dst / "file")
+    assert (
+        module_root / "remote_storage" / src.name / "file"
+    ).read_bytes() == b"data"
+
+    assert Context.ERROR not in transport.verify(src, dst)
+
+    # removal only affects target
+    other = module_root / "remote_storage" / "other"
+    other.mkdir()
+    assert transport.remove(dst)[0] == 0
+    assert not transport.exists(dst)
+    assert other.is_dir()
+
+
+@pytest.mark.parametrize(
+    ("name", "patterns"),
+    [
+        ("a", ["/a", "/a/***"]),
+        ("a\\b", ["/a\\b", "/a\\\\b/***"]),
+        ("a*", ["/a\\*", "/a\\*/***"]),
+        ("a?", ["/a\\?", "/a\\?/***"]),
+        ("[a]", ["/\\[a]", "/\\[a]/***"]),
+        ("a\\*", ["/a\\\\\\*", "/a\\\\\\*/***"]),
+    ],
+    ids=["plain", "backslash", "star", "question", "bracket", "escaped"],
+)
+def test_rsync_daemon_manager_rm_patterns(name, patterns, monkeypatch):
+    """Test that `RsyncDaemonManager.rm` escapes the target's name."""
+    manager = RsyncDaemonManager("rsync://localhost/dcm")
+    args = []
+    monkeypatch.setattr(
+        manager,
+        "_run",
+        lambda _args: args.extend(_args)
+        or subprocess.CompletedProcess(_args, 0, "", ""),
+    )
+    assert manager.rm(Path("/remote_storage") / name)[0] == 0
+    assert [
+        arg.removeprefix("--include=")
+        for arg in args
+        if arg.startswith("--include=")
+    ] == patterns
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["a*", "a?", "[a]", "a\\*"],
+    ids=["star", "question", "bracket", "escaped"],
+)
+def test_rsync_daemon_transport_remove_wildcards(
+    name, transport: RsyncDaemonTransport, rsync_daemon
+):
+    """
+    Test that removal of targets with wildcards in their names only
+    affects the target.
+    """
+    module_root = rsync_daemon[1]
+    (module_root / name).mkdir()
+    (module_root / name / "file").touch()
+    for other in ("a", "ab", "a\\b"):
+        (module_root / other).mkdir()
+    assert transport.remove(Path("/") / name)[0] == 0
+    assert not (module_root / name).exists()
+    assert sorted(path.name for path in module_root.iterdir()) == sorted(
+        ["a", "ab", "a\\b"]
+    )
+
+
+def test_rsync_daemon_transport_unknown_module(rsync_daemon):
+    """Test preflight of `RsyncDaemonTransport` for unknown module."""
+    transport = RsyncDaemonTransport(
+        RsyncDaemonManager(f"rsync://{rsync_daemon[0]}/unknown")
+    )
+    ok, message = transport.preflight(Path("/remote_storage"))
+    assert not ok
+    assert "Unknown module" in message
+
+
+def test_rsync_daemon_transport_auth(rsync_daemon, file_storage: Path):
+    """Test authentication at the daemon with a password file."""
+    password_file = file_storage / str(uuid4())
+    password_file.write_text("secret\n", encoding="utf-8")
+    password_file.chmod(0o600)
+
+    transport = RsyncDaemonTransport(
+        RsyncDaemonManager(
+            f"rsync://dcm@{rsync_daemon[0]}/secure",
+            password_file=password_file,
+        )
+    )
+    assert transport.preflight(Path("/remote_storage")) == (True, "")
+    assert (rsync_daemon[1] / "remote_storage").is_dir()
+
+    password_file.write_text("wrong\n", encoding="utf-8")
+    ok, message = transport.preflight(Path("/remote_storage"))
+    assert not ok
+    assert "auth failed" in message
@@ -0,0 +1,254 @@
+"""FanOut-component test-module."""
+
+from pathlib import Path
+from uuid import uuid4
+from io import BytesIO, StringIO
+from time import time, sleep
+from threading import Event
+import tarfile
+
+import pytest
+from dcm_common import Logger, LoggingContext as Context
+
+from dcm_transfer_module.components import (
+    FanOut,
+    RsyncParser,
+    RsyncTransport,
+    TransferManager,
+    SSHClient,
+    extract_stream,
+    directory_size,
+)
+
+
+def assert_equal_trees(a: Path, b: Path):
+    """Asserts that the directories `a` and `b` have equal contents."""
+    assert sorted(p.relative_to(a) for p in a.glob("**/*")) == sorted(
+        p.relative_to(b) for p in b.glob("**/*")
+    )
+    for path in a.glob("**/*"):
+        if path.is_file():
+            assert (b / path.relative_to(a)).read_bytes() == (
+                path.read_bytes()
+            )
+
+
+def test_fanout(src: Path, file_storage: Path):
+    """Test streaming a directory into multiple destinations."""
+    (src / "data" / "nested").mkdir()
+    (src / "link").symlink_to("small")
+    transport = RsyncTransport(TransferManager())
+    dsts = {
+        name: file_storage / str(uuid4()) / "sip"
+        for name in ("a", "b", "c")
+    }
+    progress = StringIO()
+    logs = FanOut(chunk_size=1024, buffer_size=2).run(
+        src,
+        {
+            name: lambda stream, dst=dst: transport.receive(stream, dst)
+            for name, dst in dsts.items()
+        },
+        progress,
+    )
+    assert sorted(logs) == sorted(dsts)
+    for name, dst in dsts.items():
+        assert Context.ERROR not in logs[name]
+        assert_equal_trees(src, dst)
+        assert (dst / "link").is_symlink()
+
+    # source is read only once
+    final = progress.getvalue().replace("\r", "\n").splitlines()[-1]
+    parsed = RsyncParser().parse(final)
+    assert parsed.bytes == directory_size(src)
+    assert parsed.percent == 100
+
+
+def test_fanout_failing_receiver(src: Path, file_storage: Path):
+    """Test that a failing receiver does not affect the others."""
+    transport = RsyncTransport(TransferManager())
+    dst = file_storage / str(uuid4()) / "sip"
+
+    def fail(stream):
+        stream.read(10)
+        raise OSError("Disk full.")
+
+    def fail_log(_):
+        log = Logger()
+        log.log(Context.ERROR, body="Remote unavailable.")
+        return log
+
+    logs = FanOut(chunk_size=1024, buffer_size=1).run(
+        src,
+        {
+            "ok": lambda stream: transport.receive(stream, dst),
+            "fail": fail,
+            "fail-log": fail_log,
+        },
+    )
+    assert Context.ERROR not in logs["ok"]
+    assert_equal_trees(src, dst)
+    assert "Disk full." in logs["fail"].json["ERROR"][0]["body"]
+    assert Context.ERROR in logs["fail-log"]
+
+
+def test_fanout_stalled_receiver(src: Path, file_storage: Path):
+    """Test that a stalled receiver does not hold back the others."""
+    transport = RsyncTransport(TransferManager())
+    dst = file_storage / str(uuid4()) / "sip"
+    (src / "data" / "huge").write_bytes(b"\0" * 64 * 1024)
+    stopped = Event()
+
+    def stall(stream):
+        stream.read(10)
+        while not stream.aborted:
+            sleep(0.01)
+        stopped.set()
+        return Logger()
+
+    time0 = time()
+    logs = FanOut(chunk_size=1024, buffer_size=1, timeout=0.5).run(
+        src,
+        {
+            "ok": lambda stream: transport.receive(stream, dst),
+            "stall": stall,
+        },
+    )
+    assert time() - time0 < 5
+    # the aborted receiver is not left behind
+    assert stopped.is_set()
+    assert Context.ERROR not in logs["ok"]
+    assert_equal_trees(src, dst)
+    assert "has not accepted data" in logs["stall"].json["ERROR"][0]["body"]
+
+
+def test_fanout_missing_source(file_storage: Path):
+    """Test that a source that cannot be read fails all receivers."""
+    transport = RsyncTransport(TransferManager())
+    logs = FanOut().run(
+        file_storage / str(uuid4()),
+        {
+            name: lambda stream: transport.receive(
+                stream, file_storage / str(uuid4())
+            )
+            for name in ("a", "b")
+        },
+    )
+    assert all(Context.ERROR in log for log in logs.values())
+
+
+def test_receive_ssh(
+    src: Path, file_storage: Path, fake_ssh, monkeypatch, tmp_path
+):
+    """Test `TransferManager.receive` via ssh."""
+    monkeypatch.setenv("FAKE_STATE_DIRECTORY", str(tmp_path))
+    dst = file_storage / str(uuid4()) / "sip"
+    transport = RsyncTransport(
+        TransferManager(SSHClient(host="localhost", command=fake_ssh))
+    )
+    log = FanOut().run(
+        src, {"ssh": lambda stream: transport.receive(stream, dst)}
+    )["ssh"]
+    assert Context.ERROR not in log
+    assert_equal_trees(src, dst)
+
+
+@pytest.mark.parametrize("remote", [True, False], ids=["ssh", "local"])
+def test_receive_options(
+    remote, src: Path, file_storage: Path, fake_ssh, monkeypatch, tmp_path
+):
+    """Test `TransferManager.receive` with transfer options."""
+    monkeypatch.setenv("FAKE_STATE_DIRECTORY", str(tmp_path))
+    dst = file_storage / str(uuid4()) / "sip"
+    (dst / "data").mkdir(parents=True)
+    (dst / "data" / "stale").write_bytes(b"stale")
+    transport = RsyncTransport(
+        TransferManager(
+            SSHClient(host="localhost", command=fake_ssh) if remote else None
+        )
+    )
+    log = FanOut().run(
+        src,
+        {
+            "dst": lambda stream: transport.receive(
+                stream,
+                dst,
+                timeout=10,
+                compression=True,
+                compression_level=9,
+                checksums=True,
+                mirror=True,
+            )
+        },
+    )["dst"]
+    assert Context.ERROR not in log
+    assert any(
+        "Validated checksums" in msg["body"] for msg in log.json["INFO"]
+    )
+    assert_equal_trees(src, dst)
+
+
+def test_receive_ssh_stalled(src: Path, file_storage: Path, tmp_path):
+    """
+    Test that `TransferManager.receive` terminates a remote that does
+    not accept data within the transfer timeout.
+    """
+    ssh = tmp_path / "ssh"
+    ssh.write_text("#!/bin/sh\nsleep 30\n", encoding="utf-8")
+    ssh.chmod(0o755)
+    (src / "data" / "huge").write_bytes(b"\0" * 1024 * 1024)
+    transport = RsyncTransport(
+        TransferManager(SSHClient(host="localhost", command=str(ssh)))
+    )
+    dst = file_storage / str(uuid4())
+    time0 = time()
+    log = FanOut().run(
+        src,
+        {"ssh": lambda stream: transport.receive(stream, dst, timeout=1)},
+    )["ssh"]
+    assert time() - time0 < 10
+    assert Context.ERROR in log
+    assert any(
+        "has not responded for 1s" in msg["body"]
+        for msg in log.json["ERROR"]
+    )
+
+
+def test_receive_ssh_aborted(src: Path, file_storage: Path, tmp_path):
+    """
+    Test that `TransferManager.receive` terminates a remote that blocks
+    the archive once the stream has been aborted (without a transfer
+    timeout).
+    """
+    ssh = tmp_path / "ssh"
+    ssh.write_text("#!/bin/sh\nsleep 30\n", encoding="utf-8")
+    ssh.chmod(0o755)
+    (src / "data" / "huge").write_bytes(b"\0" * 1024 * 1024)
+    transport = RsyncTransport(
+        TransferManager(SSHClient(host="localhost", command=str(ssh)))
+    )
+    dst = file_storage / str(uuid4())
+    time0 = time()
+    log = FanOut(chunk_size=1024, buffer_size=1, timeout=0.5).run(
+        src, {"ssh": lambda stream: transport.receive(stream, dst)}
+    )["ssh"]
+    assert time() - time0 < 10
+    assert any(
+        "source has been aborted" in msg["body"]
+        for msg in log.json["ERROR"]
+    )
+
+
+@pytest.mark.parametrize(
+    "name", ["../outside", "/absolute"], ids=["parent", "absolute"]
+)
+def test_extract_stream_bad_path(name, file_storage: Path):
+    """Test that `extract_stream` rejects paths outside of target."""
+    archive = BytesIO()
+    with tarfile.open(fileobj=archive, mode="w|") as tar:
+        info = tarfile.TarInfo(name)
+        info.size = 4
+        tar.addfile(info, BytesIO(b"data"))
+    archive.seek(0)
+    with pytest.raises(ValueError):
+        extract_stream(archive, file_storage / str(uuid4()))
@@ -0,0 +1,127 @@
+"""RemoteHealthMonitor-component test-module."""
+
+from threading import Timer
+from time import sleep
+import json
+
+import pytest
+
+from dcm_transfer_module.components import RemoteHealthMonitor
+
+
+@pytest.fixture(name="state_file")
+def _state_file(temp_dir):
+    return temp_dir / "remote.health.json"
+
+
+def scripted_check(results: list[bool]):
+    """Returns check that yields `results` (last result is repeated)."""
+    def check():
+        result = results.pop(0) if len(results) > 1 else results[0]
+        return result, "" if result else "Connection refused"
+    return check
+
+
+def test_remote_health_monitor_circuit_breaker(state_file):
+    """Test opening and closing of the circuit breaker."""
+    monitor = RemoteHealthMonitor(
+        scripted_check([True, False, False, False, True]),
+        state_file,
+        failure_threshold=2,
+    )
+    assert monitor.run_check()["state"] == "closed"
+    state = monitor.run_check()
+    assert state["state"] == "closed"
+    assert state["consecutive_failures"] == 1
+    assert state["message"] == "Connection refused"
+    state = monitor.run_check()
+    assert state["state"] == "open"
+    assert state["opened"] is not None
+    opened = state["opened"]
+    assert monitor.run_check()["opened"] == opened
+    state = monitor.run_check()
+    assert state["state"] == "closed"
+    assert state["opened"] is None
+    assert state["success_rate"] == 2 / 5
+    assert state["mean_latency"] is not None
+
+    # state is shared via file
+    assert json.loads(state_file.read_text(encoding="utf-8")) == state
+
+
+def test_remote_health_monitor_check_error(state_file):
+    """Test `RemoteHealthMonitor` with check that raises an error."""
+    def check():
+        raise RuntimeError("bad check")
+
+    monitor = RemoteHealthMonitor(check, state_file, failure_threshold=1)
+    state = monitor.run_check()
+    assert state["state"] == "open"
+    assert state["message"] == "RuntimeError: bad check"
+
+
+def test_remote_health_monitor_single_checker(state_file):
+    """
+    Test that only one of multiple monitors for the same remote runs
+    checks.
+    """
+    calls = {"a": 0, "b": 0}
+
+    def get_check(name):
+        def check():
+            calls[name] += 1
+            return True, ""
+        return check
+
+    monitor_a = RemoteHealthMonitor(get_check("a"), state_file, 0.01)
+    monitor_b = RemoteHealthMonitor(get_check("b"), state_file, 0.01)
+    monitor_a.start()
+    sleep(0.05)
+    assert monitor_b.status()["state"] == "closed"
+    sleep(0.05)
+    assert calls["a"] > 0
+    assert calls["b"] == 0
+
+    # other monitor takes over
+    monitor_a.stop()
+    sleep(0.05)
+    monitor_b.stop()
+    assert calls["b"] > 0
+
+
+def test_remote_health_monitor_stale(state_file):
+    """Test that outdated state is reported as unknown (hanging check)."""
+    calls = []
+
+    def check():
+        if calls:
+            sleep(0.1)
+        calls.append(None)
+        return False, ""
+
+    monitor = RemoteHealthMonitor(
+        check, state_file, 10, failure_threshold=1, stale_after=0.01
+    )
+    assert monitor.run_check()["state"] == "open"
+    sleep(0.02)
+    assert monitor.status()["state"] == "unknown"
+    assert not monitor.is_open()
+    monitor.stop()
+
+
+def test_remote_health_monitor_wait(state_file):
+    """Test method `wait` of `RemoteHealthMonitor`."""
+    results = [False]
+    monitor = RemoteHealthMonitor(
+        lambda: (results[0], ""), state_file, 0.01, failure_threshold=1
+    )
+    monitor.run_check()
+    waited = []
+    assert not monitor.wait(0.05, 0.01, on_wait=waited.append)
+    assert len(waited) == 1
+    assert waited[0]["state"] == "open"
+
+    # remote becomes available while waiting
+    Timer(0.05, lambda: results.__setitem__(0, True)).start()
+    assert monitor.wait(1, 0.01)
+    monitor.stop()
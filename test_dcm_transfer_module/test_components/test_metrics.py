@@ -0,0 +1,91 @@
+"""Metrics-component test-module."""
+
+import multiprocessing
+import sqlite3
+
+import pytest
+
+from dcm_transfer_module.components import Metric, MetricsStore
+
+
+COUNTER = Metric("counter_total", "counter", "Some counter.")
+GAUGE = Metric("gauge", "gauge", "Some gauge.")
+HISTOGRAM = Metric("histogram", "histogram", "Some histogram.", (1, 10))
+
+
+@pytest.fixture(name="store")
+def _store(temp_dir):
+    return MetricsStore(temp_dir / "metrics.db")
+
+
+def test_metric_bad_definition():
+    """Test validation of `Metric`-definitions."""
+    with pytest.raises(ValueError):
+        Metric("a", "summary", "")
+    with pytest.raises(ValueError):
+        Metric("a", "histogram", "")
+
+
+def test_metrics_store_counter(store):
+    """Test counters in `MetricsStore`."""
+    store.inc(COUNTER)
+    store.inc(COUNTER, 2)
+    store.inc(COUNTER, labels={"class": 'a"b'})
+    assert store.samples() == {
+        "counter_total": {"": 3, 'class="a\\"b"': 1}
+    }
+
+
+def test_metrics_store_histogram(store):
+    """Test histograms in `MetricsStore`."""
+    store.observe(HISTOGRAM, 0.5, {"phase": "a"})
+    store.observe(HISTOGRAM, 5, {"phase": "a"})
+    store.observe(HISTOGRAM, 50, {"phase": "a"})
+    assert store.render([HISTOGRAM]).splitlines() == [
+        "# HELP histogram Some histogram.",
+        "# TYPE histogram histogram",
+        'histogram_bucket{phase="a",le="1"} 1',
+        'histogram_bucket{phase="a",le="10"} 2',
+        'histogram_bucket{phase="a",le="+Inf"} 3',
+        'histogram_sum{phase="a"} 55.5',
+        'histogram_count{phase="a"} 3',
+    ]
+
+
+def _add_to_gauge(path, value, done):
+    MetricsStore(path).add(GAUGE, value)
+    MetricsStore(path).inc(COUNTER, value)
+    done.set()
+
+
+def test_metrics_store_multiprocess(store):
+    """Test aggregation of samples across processes."""
+    store.add(GAUGE, 1)
+    done = multiprocessing.Event()
+    p = multiprocessing.Process(
+        target=_add_to_gauge, args=(store.path, 2, done)
+    )
+    p.start()
+    assert done.wait(5)
+    p.join()
+    store.inc(COUNTER)
+
+    # gauges of terminated processes are dropped, counters are retained
+    assert store.samples() == {"gauge": {"": 1}, "counter_total": {"": 3}}
+    assert store.render([COUNTER, GAUGE]).splitlines() == [
+        "# HELP counter_total Some counter.",
+        "# TYPE counter_total counter",
+        "counter_total 3",
+        "# HELP gauge Some gauge.",
+        "# TYPE gauge gauge",
+        "gauge 1",
+    ]
+
+
+def test_metrics_store_not_strict(file_storage):
+    """Test `MetricsStore` with `strict=False`."""
+    (file_storage / "metrics.db").mkdir(exist_ok=True)
+    store = MetricsStore(file_storage / "metrics.db", strict=False)
+    store.inc(COUNTER)
+    with pytest.raises(sqlite3.OperationalError):
+        store.samples()
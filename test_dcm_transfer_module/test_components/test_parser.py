@@ -1,15 +1,28 @@
 """ProgressParser-component test-module."""
 
 import os
+from pathlib import Path
 from time import sleep
 from uuid import uuid4
 import io
+import subprocess
 
 import pytest
 from dcm_common.orchestra.models import Progress
 
-from dcm_transfer_module.components.parser \
-    import RegexParser, RsyncProgress, RsyncParser
+from dcm_transfer_module.components.parser import (
+    RegexParser,
+    RsyncProgress,
+    RsyncParser,
+    ProgressChannel,
+    PushThrottle,
+    ProgressRecordReader,
+    RsyncStats,
+    FileTimeline,
+    parse_size,
+    parse_rate,
+    parse_duration,
+)
 
 
 def test_regex_parser_simple_match():
@@ -112,7 +125,7 @@ def test_rsync_parser_parse(
 def test_rsync_parser_listen(
     file_storage, progress_status, progress_string_format
 ):
-    """Test method listen of RsyncParser."""
+    """Test method listen of RsyncParser with named pipe."""
     # setup fifo and Progress-object
     fifo_path = file_storage / str(uuid4())
     os.mkfifo(fifo_path)
@@ -120,8 +133,8 @@ def test_rsync_parser_listen(
 
     # run parser continuously
     parser = RsyncParser()
-    parser.listen(fifo_path, progress)
-    assert parser.listening
+    thread = parser.listen(fifo_path, progress)
+    assert thread.is_alive()
 
     # open fifo and perform test
     with io.open(fifo_path, "w", encoding="utf-8") as fifo:
@@ -135,6 +148,431 @@ def test_rsync_parser_listen(
         assert progress.numeric == progress_status.percent
         assert progress.verbose != "start"
 
-    sleep(0.01)
     # closed fifo (should terminate Thread on other end)
-    assert not parser.listening
+    thread.join(1)
+    assert not thread.is_alive()
+
+
+def test_rsync_parser_consume_skips_unknown(
+    progress_status, progress_string_format
+):
+    """Test method consume of RsyncParser with non-progress lines."""
+    progress = Progress(verbose="start", numeric=0)
+    pushes = []
+    RsyncParser().consume(
+        io.StringIO(
+            "sending incremental file list\n"
+            + progress_string_format.format(**progress_status)
+            + "\n\n"
+        ),
+        progress,
+        lambda: pushes.append(progress.numeric),
+    )
+    assert pushes == [progress_status.percent]
+
+
+def test_progress_channel(progress_status, progress_string_format):
+    """Test `ProgressChannel`."""
+    progress = Progress(verbose="start", numeric=0)
+    pushes = []
+    channel = ProgressChannel(progress, lambda: pushes.append(True))
+
+    writer = channel.open()
+    assert channel.writer is writer
+    with pytest.raises(RuntimeError):
+        channel.open()
+    writer.write(progress_string_format.format(**progress_status) + "\r")
+    channel.close()
+
+    assert channel.writer is None
+    assert writer.closed
+    assert progress.numeric == progress_status.percent
+    assert len(pushes) == 1
+
+
+def test_progress_channel_concurrent(progress_string_format):
+    """Test multiple concurrent `ProgressChannel`s sharing a parser."""
+    parser = RsyncParser()
+    progresses = [Progress(verbose="start", numeric=0) for _ in range(10)]
+    channels = [ProgressChannel(p, parser=parser) for p in progresses]
+    writers = [channel.open() for channel in channels]
+    for i, writer in enumerate(writers):
+        writer.write(
+            progress_string_format.format(
+                **RsyncProgress(volume="1", percent=i, rate="1kB/s", xfr=1)
+            )
+            + "\n"
+        )
+    for channel in channels:
+        channel.close()
+    assert [p.numeric for p in progresses] == list(range(10))
+
+
+def test_progress_channel_subprocess():
+    """Test `ProgressChannel` as stdout of a subprocess."""
+    progress = Progress(verbose="start", numeric=0)
+    with ProgressChannel(progress) as writer:
+        subprocess.run(
+            [
+                "printf",
+                "      1.00K  50%%    1.00kB/s    0:00:01\\r"
+                + "      2.00K 100%%    1.00kB/s    0:00:02 "
+                + "(xfr#1, to-chk=0/1)\\n",
+            ],
+            stdout=writer,
+            check=True,
+        )
+    assert progress.numeric == 100
+
+
+def test_push_throttle_delta():
+    """Test `PushThrottle` with minimum delta."""
+    pushes = []
+    throttle = PushThrottle(lambda: pushes.append(True), min_delta=5)
+    assert throttle(0)  # first update
+    assert not throttle(1)
+    assert throttle.pending
+    assert not throttle(4)
+    assert throttle(5)
+    assert not throttle.pending
+    assert not throttle(6)
+    assert throttle(100)  # completion
+    assert not throttle(100)
+    assert throttle.flush()
+    assert not throttle.flush()
+    assert len(pushes) == 4
+
+
+def test_push_throttle_interval():
+    """Test `PushThrottle` with minimum interval."""
+    pushes = []
+    throttle = PushThrottle(lambda: pushes.append(True), min_interval=0.05)
+    assert throttle(0)
+    assert not throttle(10)
+    sleep(0.05)
+    assert throttle(11)
+    assert len(pushes) == 2
+
+
+def test_rsync_parser_consume_throttled(progress_string_format):
+    """Test method consume of RsyncParser with throttled pushes."""
+    progress = Progress(verbose="start", numeric=0)
+    pushes = []
+    RsyncParser().consume(
+        io.StringIO(
+            "".join(
+                progress_string_format.format(
+                    **RsyncProgress(volume="1", percent=i, rate="1kB/s")
+                )
+                + "\r"
+                for i in range(100)
+            ),
+            newline=None,
+        ),
+        progress,
+        lambda: pushes.append(progress.numeric),
+        push_interval=3600,
+    )
+    # first and final state
+    assert pushes == [0, 99]
+
+
+@pytest.fixture(name="progress_recording")
+def _progress_recording():
+    """Recorded output of `rsync --info=progress2`."""
+    return Path("benchmarks/data/rsync_progress2.txt").read_bytes()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 13, 4096, 10**7])
+def test_progress_record_reader(progress_recording, chunk_size):
+    """Test `ProgressRecordReader` with different chunk sizes."""
+    reader = ProgressRecordReader()
+    records = []
+    for i in range(0, len(progress_recording), chunk_size):
+        record = reader.feed(progress_recording[i:i + chunk_size])
+        if record is not None:
+            records.append(record)
+    assert reader.flush() is None
+    assert records[-1].strip().startswith("524,288,000 100%")
+    # every chunk yields at most one record
+    assert len(records) <= len(progress_recording) / chunk_size + 1
+
+
+def test_progress_record_reader_skips_non_progress():
+    """Test that `ProgressRecordReader` skips newer non-progress lines."""
+    reader = ProgressRecordReader()
+    assert (
+        reader.feed(b"  1 10% 1kB/s 0:00:01\r  2 20% 1kB/s")
+        == "  1 10% 1kB/s 0:00:01"
+    )
+    assert (
+        reader.feed(b" 0:00:02\rfile list\n\n")
+        == "  2 20% 1kB/s 0:00:02"
+    )
+    assert reader.feed(b"  3 30% 1kB/s 0:00:03") is None
+    assert reader.flush() == "  3 30% 1kB/s 0:00:03"
+
+
+def test_rsync_parser_consume_fd(progress_recording, file_storage):
+    """Test method consume_fd of RsyncParser."""
+    recording = file_storage / str(uuid4())
+    recording.write_bytes(progress_recording)
+    read_fd = os.open(recording, os.O_RDONLY)
+    progress = Progress(verbose="start", numeric=0)
+    pushes = []
+    try:
+        RsyncParser().consume_fd(
+            read_fd, progress, lambda: pushes.append(progress.numeric)
+        )
+    finally:
+        os.close(read_fd)
+    assert progress.numeric == 100
+    assert progress.verbose == "syncing files, 100% @ 97.84MB/s"
+    assert pushes[-1] == 100
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1,234,567", 1234567),
+        ("1.234.567", 1234567),
+        ("0", 0),
+        ("1.50K", 1536),
+        ("1,50K", 1536),
+        ("2.00G", 2 * 1024**3),
+        ("?", None),
+    ],
+)
+def test_parse_size(value, expected):
+    """Test function `parse_size`."""
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("100B/s", 100),
+        ("1.50kB/s", 1536),
+        ("1,50kB/s", 1536),
+        ("2.00MB/s", 2 * 1024**2),
+        ("?", None),
+    ],
+)
+def test_parse_rate(value, expected):
+    """Test function `parse_rate`."""
+    assert parse_rate(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("0:00:12", 12), ("1:02:03", 3723), ("??:??:??", None)],
+)
+def test_parse_duration(value, expected):
+    """Test function `parse_duration`."""
+    assert parse_duration(value) == expected
+
+
+def test_rsync_progress_numeric_in_progress():
+    """Test numeric properties of an in-progress `RsyncProgress`."""
+    progress = RsyncParser().parse("  1,048,576  25%    1.00MB/s    0:00:03")
+    assert progress.bytes == 1048576
+    assert progress.bytes_per_second == 1048576
+    assert progress.eta == 3
+    assert progress.files_done is None
+    assert progress.files_total is None
+
+
+def test_rsync_progress_numeric_xfr():
+    """Test numeric properties of an `RsyncProgress` with `xfr`-info."""
+    progress = RsyncParser().parse(
+        "  1,048,576  25%    1.00MB/s    0:00:01 (xfr#2, ir-chk=6/10)"
+    )
+    assert progress.eta == 3  # derived from rate
+    assert progress.files_done == 4
+    assert progress.files_total == 10
+
+
+def test_progress_record_reader_feed_all():
+    """Test method `feed_all` of `ProgressRecordReader`."""
+    reader = ProgressRecordReader()
+    assert reader.feed_all(b"a\n  1 10% 1kB/s 0:00:01\r  2 2") == [
+        "a", "  1 10% 1kB/s 0:00:01"
+    ]
+    assert reader.feed_all(b"0% 1kB/s 0:00:02\rb\n\nc") == [
+        "  2 20% 1kB/s 0:00:02", "b"
+    ]
+    assert reader.flush_all() == ["c"]
+    assert reader.flush_all() == []
+
+
+def test_rsync_parser_consume_fd_timeline(file_storage):
+    """Test method consume_fd of RsyncParser with timeline."""
+    recording = file_storage / str(uuid4())
+    recording.write_bytes(
+        b"./\n"
+        + b"a.txt\n"
+        + b"          0   0%    0.00kB/s    0:00:00\r"
+        + b"      1,024  50%    1.00kB/s    0:00:01 (xfr#1, to-chk=1/3)\n"
+        + b"dir/\n"
+        + b"dir/b.txt\n"
+        + b"      2,048 100%    1.00kB/s    0:00:02 (xfr#2, to-chk=0/3)\n"
+    )
+    read_fd = os.open(recording, os.O_RDONLY)
+    progress = Progress(verbose="start", numeric=0)
+    timeline = FileTimeline()
+    try:
+        RsyncParser().consume_fd(
+            read_fd, progress, lambda: None, timeline=timeline
+        )
+    finally:
+        os.close(read_fd)
+    assert progress.numeric == 100
+    assert timeline.names == ["a.txt", "dir/b.txt"]
+    assert timeline.sizes.tolist() == [1024, 1024]
+
+
+def test_rsync_parser_consume_fd_timeline_messages(file_storage):
+    """
+    Test method consume_fd of RsyncParser with timeline for output that
+    contains messages next to the file names.
+    """
+    recording = file_storage / str(uuid4())
+    recording.write_bytes(
+        b"sending incremental file list\n"
+        + b"created directory /remote/sip\n"
+        + b"deleting old.txt\n"
+        + b"cannot delete non-empty directory: old\n"
+        + b"./\n"
+        + b"a.txt\n"
+        + b"      1,024  50%    1.00kB/s    0:00:01 (xfr#1, to-chk=2/3)\n"
+        + b"rsync: [sender] send_files failed to open \"/sip/x\": "
+        + b"Permission denied (13)\n"
+        + b"file has vanished: \"/sip/y\"\n"
+        + b"link -> a.txt\n"
+        + b"      2,048 100%    1.00kB/s    0:00:02 (xfr#2, to-chk=0/3)\n"
+        + b"\n"
+        + b"sent 2,187 bytes  received 57 bytes  4,488.00 bytes/sec\n"
+        + b"total size is 2,048  speedup is 0.91\n"
+        + b"rsync warning: some files vanished before they could be "
+        + b"transferred (code 24) at main.c(1338) [sender=3.2.7]\n"
+    )
+    read_fd = os.open(recording, os.O_RDONLY)
+    timeline = FileTimeline()
+    try:
+        RsyncParser().consume_fd(
+            read_fd,
+            Progress(verbose="start", numeric=0),
+            lambda: None,
+            timeline=timeline,
+        )
+    finally:
+        os.close(read_fd)
+    assert timeline.names == ["a.txt", "link"]
+
+
+RSYNC_STATS = b"""
+Number of files: 3 (reg: 2, dir: 1)
+Number of created files: 2 (reg: 2)
+Number of deleted files: 0
+Number of regular files transferred: 2
+Total file size: 2,048 bytes
+Total transferred file size: 2,048 bytes
+Literal data: 2,048 bytes
+Matched data: 0 bytes
+File list size: 81
+File list generation time: 0.001 seconds
+File list transfer time: 0.000 seconds
+Total bytes sent: 2,187
+Total bytes received: 57
+
+sent 2,187 bytes  received 57 bytes  4,488.00 bytes/sec
+total size is 2,048  speedup is 0.91
+"""
+RSYNC_STATS_VALUES = {
+    "files": 3,
+    "files_transferred": 2,
+    "total_size": 2048,
+    "total_transferred_size": 2048,
+    "literal_data": 2048,
+    "matched_data": 0,
+    "file_list_size": 81,
+    "file_list_generation_time": 0.001,
+    "file_list_transfer_time": 0.0,
+    "bytes_sent": 2187,
+    "bytes_received": 57,
+    "speedup": 0.91,
+}
+
+
+def test_rsync_stats():
+    """Test `RsyncStats`."""
+    stats = RsyncStats()
+    for line in RSYNC_STATS.decode().splitlines():
+        if line:
+            assert stats.feed(line)
+    assert not stats.feed("dir/b.txt")
+    assert stats.values == RSYNC_STATS_VALUES
+
+
+def test_progress_record_reader_trailing():
+    """Test attribute `trailing` of `ProgressRecordReader`."""
+    reader = ProgressRecordReader()
+    assert reader.feed(b"a\n  1 10% 1kB/s 0:00:01\rb\n\nc\nd") == (
+        "  1 10% 1kB/s 0:00:01"
+    )
+    assert reader.trailing == ["b", "c"]
+    assert reader.feed(b"\n") is None
+    assert reader.trailing == ["d"]
+    assert reader.feed(b"e") is None
+    assert reader.trailing == []
+    assert reader.flush() is None
+    assert reader.trailing == ["e"]
+
+
+@pytest.mark.parametrize("timeline", [False, True])
+@pytest.mark.parametrize("chunk_size", [7, 65536])
+def test_rsync_parser_consume_fd_stats(file_storage, timeline, chunk_size):
+    """Test method consume_fd of RsyncParser with stats."""
+    recording = file_storage / str(uuid4())
+    recording.write_bytes(
+        b"a.txt\n"
+        + b"      1,024  50%    1.00kB/s    0:00:01 (xfr#1, to-chk=1/3)\r"
+        + b"      2,048 100%    1.00kB/s    0:00:02 (xfr#2, to-chk=0/3)\n"
+        + RSYNC_STATS
+    )
+    read_fd = os.open(recording, os.O_RDONLY)
+    progress = Progress(verbose="start", numeric=0)
+    stats = RsyncStats()
+    _timeline = FileTimeline() if timeline else None
+    try:
+        RsyncParser().consume_fd(
+            read_fd,
+            progress,
+            lambda: None,
+            timeline=_timeline,
+            stats=stats,
+            chunk_size=chunk_size,
+        )
+    finally:
+        os.close(read_fd)
+    assert progress.numeric == 100
+    assert stats.values == RSYNC_STATS_VALUES
+    if timeline:
+        assert _timeline.names == ["a.txt"]
+
+
+def test_rsync_parser_consume_stats():
+    """Test method consume of RsyncParser with stats."""
+    progress = Progress(verbose="start", numeric=0)
+    stats = RsyncStats()
+    RsyncParser().consume(
+        io.StringIO(
+            "      2,048 100%    1.00kB/s    0:00:02 (xfr#2, to-chk=0/3)\n"
+            + RSYNC_STATS.decode()
+        ),
+        progress,
+        lambda: None,
+        stats=stats,
+    )
+    assert progress.numeric == 100
+    assert stats.values == RSYNC_STATS_VALUES
@@ -0,0 +1,54 @@
+"""PhaseTimer-component test-module."""
+
+from dcm_transfer_module.components import PhaseTimer
+
+
+class _Clock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+def test_phase_timer():
+    """Test basic functionality of `PhaseTimer`."""
+    clock = _Clock()
+    recorded = []
+    timer = PhaseTimer(
+        on_record=lambda *args: recorded.append(args), clock=clock
+    )
+    assert timer.current is None
+    timer.start("a")
+    assert timer.current == "a"
+    clock.time = 1.0
+    timer.start("b", 0)
+    clock.time = 3.5
+    timer.stop()
+    assert timer.current is None
+    timer.stop()
+    assert timer.phases == [("a", None, 1.0), ("b", 0, 2.5)]
+    assert recorded == timer.phases
+
+
+def test_phase_timer_fail():
+    """Test method `fail` of `PhaseTimer`."""
+    timer = PhaseTimer(clock=_Clock())
+    timer.start("a")
+    assert timer.failed_phase is None
+    timer.fail()
+    timer.start("b")
+    timer.start("c")
+    assert timer.failed_phase == "a"
+    timer.fail()
+    timer.stop()
+    assert timer.failed_phase == "c"
+
+
+def test_phase_timer_context_manager():
+    """Test `PhaseTimer` as context manager."""
+    clock = _Clock()
+    with PhaseTimer(clock=clock) as timer:
+        timer.start("a")
+        clock.time = 2.0
+    assert timer.phases == [("a", None, 2.0)]
@@ -0,0 +1,177 @@
+"""S3Transport-component test-module."""
+
+from pathlib import Path
+from io import StringIO, BytesIO
+
+import pytest
+from dcm_common import LoggingContext as Context
+
+from dcm_transfer_module.components import (
+    FanOut, RsyncParser, ProgressWriter, S3Transport, get_transport
+)
+from benchmarks.fake.s3 import FakeS3Server
+
+
+boto3 = pytest.importorskip("boto3")
+botocore_config = pytest.importorskip("botocore.config")
+
+
+PART_SIZE = 1024
+
+
+@pytest.fixture(name="server")
+def _server(tmp_path):
+    server = FakeS3Server(tmp_path / "s3", buckets=["dcm"]).start()
+    yield server
+    server.stop()
+
+
+def get_transport_for(server: FakeS3Server, bucket: str = "dcm"):
+    """Returns `S3Transport` for `server`."""
+    return S3Transport(
+        lambda: boto3.session.Session().client(
+            "s3",
+            endpoint_url=server.url,
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+            config=botocore_config.Config(retries={"total_max_attempts": 1}),
+        ),
+        bucket,
+        endpoint=server.url,
+        part_size=PART_SIZE,
+        max_concurrency=4,
+    )
+
+
+@pytest.fixture(name="transport")
+def _transport(server):
+    return get_transport_for(server)
+
+
+def test_s3_transport(
+    transport: S3Transport, server: FakeS3Server, src: Path
+):
+    """Test operations of `S3Transport`."""
+    assert get_transport("s3") == S3Transport.from_config
+    assert transport.remote
+    assert transport.preflight(Path("/remote_storage")) == (True, "")
+
+    dst = Path("/remote_storage") / src.name
+    assert not transport.exists(dst)
+    progress = StringIO()
+    log = transport.transfer(src, dst, progress_file=progress)
+    assert Context.ERROR not in log
+    assert transport.exists(dst)
+
+    # layout and multipart upload
+    large = server.storage.meta(
+        "dcm", f"remote_storage/{src.name}/data/large"
+    )
+    assert large["size"] == 2560
+    assert large["checksum"].endswith("-3")
+    assert server.storage.get(
+        "dcm", f"remote_storage/{src.name}/data/large"
+    ) == (src / "data" / "large").read_bytes()
+    assert server.storage.uploads() == []
+
+    # progress is compatible with RsyncParser
+    final = progress.getvalue().replace("\r", "\n").splitlines()[-1]
+    parsed = RsyncParser().parse(final)
+    assert parsed.percent == 100
+    assert parsed.xfr == 3
+
+    # verification
+    assert Context.ERROR not in transport.verify(src, dst)
+    (src / "small").write_bytes(b"SMALL")
+    log = transport.verify(src, dst)
+    assert Context.ERROR in log
+    assert any("small" in msg["body"] for msg in log.json["ERROR"])
+
+    assert transport.remove(dst)[0] == 0
+    assert not transport.exists(dst)
+
+
+def test_s3_transport_mirror_resume(
+    transport: S3Transport, server: FakeS3Server, src: Path
+):
+    """Test options `mirror` and `resume` of `S3Transport`."""
+    dst = Path("/remote_storage") / src.name
+    assert Context.ERROR not in transport.transfer(src, dst)
+    modified = server.storage.meta(
+        "dcm", f"remote_storage/{src.name}/small"
+    )["modified"]
+
+    (src / "data" / "large").unlink()
+    log = transport.transfer(src, dst, mirror=True, resume=True)
+    assert Context.ERROR not in log
+    assert server.storage.meta(
+        "dcm", f"remote_storage/{src.name}/small"
+    )["modified"] == modified
+    assert not any(
+        meta["key"].endswith("large")
+        for meta in server.storage.objects("dcm")
+    )
+
+
+def test_s3_transport_failure(
+    transport: S3Transport, server: FakeS3Server, src: Path
+):
+    """Test that failed multipart uploads are aborted."""
+    server.storage.fail_parts = True
+    log = transport.transfer(src, Path("/remote_storage") / src.name)
+    assert Context.ERROR in log
+    assert server.storage.uploads() == []
+
+
+@pytest.mark.parametrize(
+    ("size", "actual"),
+    [
+        (PART_SIZE // 2, 10),
+        (3 * PART_SIZE, PART_SIZE),
+        (2 * PART_SIZE, 3 * PART_SIZE),
+    ],
+    ids=["single-shrunk", "multipart-shrunk", "multipart-grown"],
+)
+def test_s3_transport_changed_source(
+    size, actual, transport: S3Transport, server: FakeS3Server
+):
+    """
+    Test that a source which changes its size during the upload fails
+    the transfer and that the multipart upload is aborted.
+    """
+    with pytest.raises(RuntimeError):
+        # pylint: disable=protected-access
+        transport._transfer(
+            Path("/remote_storage") / "sip",
+            [("file", size, BytesIO(b"x" * actual))],
+            ProgressWriter(None, 0, 0),
+            False,
+            False,
+        )
+    assert server.storage.uploads() == []
+    assert not transport.exists(Path("/remote_storage") / "sip")
+
+
+def test_s3_transport_missing_bucket(server: FakeS3Server):
+    """Test preflight of `S3Transport` for missing bucket."""
+    ok, message = get_transport_for(server, "unknown").preflight(
+        Path("/remote_storage")
+    )
+    assert not ok
+    assert message
+
+
+def test_s3_transport_receive(
+    transport: S3Transport, server: FakeS3Server, src: Path
+):
+    """Test `S3Transport.receive` with a streamed archive."""
+    dst = Path("/remote_storage") / src.name
+    log = FanOut().run(
+        src, {"s3": lambda stream: transport.receive(stream, dst)}
+    )["s3"]
+    assert Context.ERROR not in log
+    assert server.storage.get(
+        "dcm", f"remote_storage/{src.name}/data/large"
+    ) == (src / "data" / "large").read_bytes()
+    assert Context.ERROR not in transport.verify(src, dst)
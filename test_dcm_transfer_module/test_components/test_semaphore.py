@@ -0,0 +1,100 @@
+"""RemoteSemaphore-component test-module."""
+
+from time import time
+import multiprocessing
+
+import pytest
+
+from dcm_transfer_module.components import RemoteSemaphore
+
+
+@pytest.fixture(name="lock_directory")
+def _lock_directory(temp_dir):
+    return temp_dir
+
+
+def test_remote_semaphore_unlimited(lock_directory):
+    """Test `RemoteSemaphore` without limit."""
+    semaphore = RemoteSemaphore(lock_directory, "host", 0)
+    slots = [semaphore.try_acquire() for _ in range(10)]
+    assert all(slot is not None for slot in slots)
+    assert not lock_directory.exists()
+
+
+def test_remote_semaphore_limit(lock_directory):
+    """Test `RemoteSemaphore` with limit."""
+    semaphore = RemoteSemaphore(lock_directory, "foo@host:22", 2)
+    slot0 = semaphore.try_acquire()
+    slot1 = semaphore.try_acquire()
+    assert slot0 is not None and slot1 is not None
+    assert slot0.index != slot1.index
+    assert semaphore.try_acquire() is None
+
+    slot0.release()
+    assert not slot0.held
+    with semaphore.try_acquire() as slot2:
+        assert slot2.index == slot0.index
+    assert semaphore.try_acquire() is not None
+
+
+def test_remote_semaphore_priority_limit(lock_directory):
+    """Test `RemoteSemaphore` with limited slots (priorities)."""
+    semaphore = RemoteSemaphore(lock_directory, "host", 3)
+    low = semaphore.try_acquire(limit=1)
+    assert low is not None
+    assert semaphore.try_acquire(limit=1) is None
+    assert semaphore.acquire(timeout=0, limit=2) is not None
+    assert semaphore.try_acquire(limit=2) is None
+    # remaining slot is reserved for unlimited jobs
+    assert semaphore.try_acquire() is not None
+    assert semaphore.try_acquire() is None
+
+
+def test_remote_semaphore_key(lock_directory):
+    """Test that `RemoteSemaphore`s for different remotes are separate."""
+    semaphore0 = RemoteSemaphore(lock_directory, "host0", 1)
+    semaphore1 = RemoteSemaphore(lock_directory, "host1", 1)
+    assert semaphore0.try_acquire() is not None
+    assert semaphore0.try_acquire() is None
+    assert semaphore1.try_acquire() is not None
+
+
+def test_remote_semaphore_acquire_timeout(lock_directory):
+    """Test method `acquire` of `RemoteSemaphore` with timeout."""
+    semaphore = RemoteSemaphore(lock_directory, "host", 1)
+    assert semaphore.acquire(timeout=0) is not None
+
+    waited = []
+    time0 = time()
+    assert (
+        semaphore.acquire(
+            timeout=0.1, interval=0.01, on_wait=lambda: waited.append(True)
+        )
+        is None
+    )
+    assert time() - time0 >= 0.1
+    assert waited == [True]
+
+
+def _hold_slot(lock_directory, acquired, release):
+    slot = RemoteSemaphore(lock_directory, "host", 1).try_acquire()
+    acquired.set()
+    release.wait()
+    slot.release()
+
+
+def test_remote_semaphore_multiprocess(lock_directory):
+    """Test `RemoteSemaphore` across processes."""
+    acquired = multiprocessing.Event()
+    release = multiprocessing.Event()
+    p = multiprocessing.Process(
+        target=_hold_slot, args=(lock_directory, acquired, release)
+    )
+    p.start()
+    assert acquired.wait(5)
+
+    semaphore = RemoteSemaphore(lock_directory, "host", 1)
+    assert semaphore.try_acquire() is None
+    release.set()
+    assert semaphore.acquire(timeout=5, interval=0.01) is not None
+    p.join()
@@ -0,0 +1,55 @@
+"""SpaceLedger-component test-module."""
+
+from uuid import uuid4
+import subprocess
+import json
+
+import pytest
+
+from dcm_transfer_module.components import SpaceLedger, directory_size
+
+
+@pytest.fixture(name="ledger_file")
+def _ledger_file(temp_dir):
+    return temp_dir / "remote.space.json"
+
+
+def test_directory_size(file_storage):
+    """Test function `directory_size`."""
+    dir_ = file_storage / str(uuid4())
+    (dir_ / "a" / "b").mkdir(parents=True)
+    (dir_ / "file").write_bytes(b"1" * 10)
+    (dir_ / "a" / "b" / "file").write_bytes(b"1" * 5)
+    (dir_ / "link").symlink_to(dir_ / "file")
+    assert directory_size(dir_) == 15
+    assert directory_size(dir_ / "file") == 10
+    assert directory_size(dir_ / "missing") == 0
+
+
+def test_space_ledger(ledger_file):
+    """Test reservations in `SpaceLedger`."""
+    ledger = SpaceLedger(ledger_file)
+    reservation = ledger.reserve(60, 100, reserve=10)
+    assert reservation is not None
+    assert ledger.reserved() == 60
+
+    # shared via file
+    assert SpaceLedger(ledger_file).reserve(40, 100, reserve=10) is None
+    with SpaceLedger(ledger_file).reserve(30, 100, reserve=10) as other:
+        assert other.held
+        assert ledger.reserved() == 90
+    assert not other.held
+    reservation.release()
+    assert ledger.reserved() == 0
+
+
+def test_space_ledger_dead_process(ledger_file):
+    """Test that reservations of exited processes are dropped."""
+    with subprocess.Popen(["true"]) as process:
+        process.wait()
+    ledger_file.parent.mkdir(parents=True)
+    ledger_file.write_text(
+        json.dumps({"a": {"size": 50, "pid": process.pid, "at": 0}}),
+        encoding="utf-8",
+    )
+    assert SpaceLedger(ledger_file).reserved() == 0
@@ -0,0 +1,65 @@
+"""FileTimeline-component test-module."""
+
+from uuid import uuid4
+import json
+
+from dcm_transfer_module.components import FileTimeline
+
+
+def test_file_timeline_empty():
+    """Test empty `FileTimeline`."""
+    timeline = FileTimeline()
+    assert len(timeline) == 0
+    assert timeline.json == {
+        "files": [], "start": [], "size": [], "duration": [],
+        "throughput": [],
+    }
+
+
+def test_file_timeline():
+    """Test `FileTimeline`."""
+    timeline = FileTimeline()
+    timeline.start("a", 0.0)
+    timeline.offset = 100
+    timeline.start("b", 1.0)
+    timeline.offset = 400
+    timeline.start("c", 4.0)
+    timeline.finish(4.0)
+
+    assert timeline.names == ["a", "b", "c"]
+    assert timeline.sizes.tolist() == [100, 300, 0]
+    assert timeline.durations.tolist() == [1.0, 3.0, 0.0]
+    assert timeline.json["throughput"] == [100.0, 100.0, None]
+
+
+def test_file_timeline_unfinished():
+    """Test `FileTimeline` without call to `finish`."""
+    timeline = FileTimeline()
+    timeline.start("a", 0.0)
+    timeline.offset = 100
+    assert timeline.sizes.tolist() == [100]
+    assert timeline.durations.tolist() == [0.0]
+
+
+def test_file_timeline_restart():
+    """Test `FileTimeline` with offsets restarting (new attempt)."""
+    timeline = FileTimeline()
+    timeline.offset = 100
+    timeline.start("a", 0.0)
+    timeline.offset = 0
+    timeline.start("a", 1.0)
+    timeline.offset = 50
+    timeline.finish(2.0)
+    assert timeline.sizes.tolist() == [0, 50]
+
+
+def test_file_timeline_write(file_storage):
+    """Test method `write` of `FileTimeline`."""
+    timeline = FileTimeline()
+    timeline.start("a", 0.0)
+    timeline.offset = 100
+    timeline.finish(1.0)
+
+    path = file_storage / str(uuid4()) / "timeline.json"
+    timeline.write(path)
+    assert json.loads(path.read_text(encoding="utf-8")) == timeline.json
@@ -0,0 +1,101 @@
+"""Tracing-component test-module."""
+
+import json
+
+import pytest
+
+from dcm_transfer_module.components import Tracer
+from dcm_transfer_module.components.tracing import parse_traceparent
+
+
+@pytest.fixture(name="export_file")
+def _export_file(temp_dir):
+    return temp_dir / "spans.jsonl"
+
+
+def _read_spans(path):
+    return [
+        json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        for line in path.read_text(encoding="utf-8").splitlines()
+    ]
+
+
+def test_tracer_disabled(export_file):
+    """Test that a `Tracer` without path does not record anything."""
+    tracer = Tracer()
+    assert not tracer.enabled
+    with tracer.span("a") as span:
+        assert span is None
+        assert tracer.traceparent() is None
+    tracer.record("b", 0, 1)
+    assert not export_file.exists()
+
+
+def test_tracer_nested(export_file):
+    """Test nesting of spans in `Tracer`."""
+    tracer = Tracer(export_file)
+    with tracer.span("outer", {"key": "value"}) as outer:
+        with tracer.span("inner") as inner:
+            inner.set_attribute("count", 1)
+            assert tracer.current is inner
+        assert tracer.traceparent() == outer.traceparent
+    assert tracer.current is None
+
+    spans = _read_spans(export_file)
+    assert [span["name"] for span in spans] == ["inner", "outer"]
+    assert spans[0]["traceId"] == spans[1]["traceId"]
+    assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+    assert "parentSpanId" not in spans[1]
+    assert spans[0]["attributes"] == [
+        {"key": "count", "value": {"intValue": "1"}}
+    ]
+    assert spans[1]["attributes"] == [
+        {"key": "key", "value": {"stringValue": "value"}}
+    ]
+    assert int(spans[1]["startTimeUnixNano"]) <= int(
+        spans[0]["startTimeUnixNano"]
+    )
+    assert int(spans[0]["endTimeUnixNano"]) <= int(
+        spans[1]["endTimeUnixNano"]
+    )
+
+
+def test_tracer_propagation(export_file):
+    """Test propagation of span context via `traceparent`."""
+    tracer = Tracer(export_file)
+    with tracer.span("submission") as submission:
+        traceparent = submission.traceparent
+    assert parse_traceparent(traceparent) == (
+        submission.trace_id, submission.span_id
+    )
+    tracer.record("queue", 1, 2, parent=traceparent)
+    with tracer.span("job", parent=traceparent):
+        pass
+
+    spans = _read_spans(export_file)
+    assert [span["name"] for span in spans] == ["submission", "queue", "job"]
+    assert {span["traceId"] for span in spans} == {submission.trace_id}
+    assert spans[1]["parentSpanId"] == submission.span_id
+    assert spans[1]["startTimeUnixNano"] == "1"
+    assert spans[1]["endTimeUnixNano"] == "2"
+    assert spans[2]["parentSpanId"] == submission.span_id
+
+
+def test_tracer_error(export_file):
+    """Test that exceptions are recorded in span status."""
+    tracer = Tracer(export_file)
+    with pytest.raises(ValueError):
+        with tracer.span("a"):
+            raise ValueError("message")
+    assert _read_spans(export_file)[0]["status"] == {
+        "code": 2, "message": "ValueError: message"
+    }
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, "", "00-abc-def-01", "00-" + "0" * 32 + "-" + "1" * 16 + "-01"],
+)
+def test_parse_traceparent_invalid(value):
+    """Test function `parse_traceparent` for invalid input."""
+    assert parse_traceparent(value) is None
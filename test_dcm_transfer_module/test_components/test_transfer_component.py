@@ -5,11 +5,16 @@ from uuid import uuid4
 import re
 import subprocess
 import os
+import ctypes
+from threading import Thread, current_thread
+from time import sleep, monotonic
 
 import pytest
 from dcm_common import LoggingContext as Context
 
-from dcm_transfer_module.components import SSHClient, TransferManager
+from dcm_transfer_module.components import (
+    OutputCapture, SSHClient, TransferManager
+)
 
 
 def get_data_sent(f) -> int:
@@ -518,3 +523,213 @@ def test_transfer_stderr(file_storage: Path, remote_storage: Path):
         file + '" failed: No such file or directory' in msg["body"]
         for msg in log.json["ERROR"]
     )
+
+
+def test_output_capture_deduplication():
+    """Test deduplication of `OutputCapture`."""
+    capture = OutputCapture()
+    capture.consume(["a\n", "b\n", "\n", "a\n", "c"])
+    assert len(capture) == 4
+    assert capture.items() == [("b", 1), ("a", 2), ("c", 1)]
+    assert capture.dropped == 0
+
+
+def test_output_capture_bounded():
+    """Test ring-buffer behavior of `OutputCapture`."""
+    capture = OutputCapture(maxlen=10)
+    capture.consume(f"warning {i}\n" for i in range(1000))
+    capture.add("warning 999")
+    assert len(capture) == 1001
+    assert len(capture.items()) == 10
+    assert capture.items()[-1] == ("warning 999", 2)
+    assert capture.items()[0] == ("warning 990", 1)
+    assert capture.dropped == 990
+
+
+def test_output_capture_on_line():
+    """Test passing on lines of `OutputCapture` as they arrive."""
+    lines = []
+    capture = OutputCapture(maxlen=2, on_line=lines.append)
+    capture.consume(["a\n", "a\n", "b\n", "c\n", "d\n"])
+    assert not lines
+    capture.flush()
+    assert lines == ["a", "b"]
+    assert capture.items() == [("c", 1), ("d", 1)]
+    capture.add("b")
+    assert capture.items() == [("d", 1), ("b", 1)]
+    assert capture.items(passed=False) == [("d", 1)]
+
+
+def test_transfer_stderr_live(file_storage: Path, remote_storage: Path):
+    """
+    Test method `transfer` of `TransferManager` with callback for
+    stderr.
+    """
+    lines = []
+    log = TransferManager().transfer(
+        file_storage / str(uuid4()),
+        remote_storage / str(uuid4()),
+        on_stderr=lambda line: lines.append((line, current_thread())),
+    )
+    assert lines
+    assert all(thread is current_thread() for _, thread in lines)
+    # messages are not repeated but the transfer is still marked failed
+    assert "exit code" in log.json["ERROR"][0]["body"]
+    assert not any(
+        line in msg["body"]
+        for line, _ in lines
+        for msgs in log.json.values()
+        for msg in msgs
+    )
+
+
+def test_transfer_stderr_bounded(file_storage: Path, remote_storage: Path):
+    """
+    Test method `transfer` of `TransferManager` with more stderr-output
+    than is retained.
+    """
+
+    log = TransferManager(max_stderr_lines=1).transfer(
+        file_storage / str(uuid4()),
+        remote_storage / str(uuid4()),
+    )
+    assert len(log.json["ERROR"]) == 2
+    assert "more message(s) omitted" in log.json["ERROR"][-1]["body"]
+
+
+@pytest.fixture(name="fake_ssh_client")
+def _fake_ssh_client(fake_ssh, monkeypatch, tmp_path):
+    monkeypatch.setenv("FAKE_STATE_DIRECTORY", str(tmp_path))
+    return SSHClient(
+        host="localhost",
+        user="foo",
+        batch_mode=True,
+        command=fake_ssh,
+    )
+
+
+@pytest.fixture(name="fake_tm")
+def _fake_tm(fake_ssh_client, fake_rsync):
+    return TransferManager(fake_ssh_client, command=fake_rsync)
+
+
+def test_query_remote_fake(fake_ssh_client: SSHClient, monkeypatch):
+    """
+    Test method `query_remote` of `SSHClient` with stand-in executable.
+    """
+    query = fake_ssh_client.query_remote("echo 'ok'")
+    assert query.returncode == 0
+    assert query.stdout == "ok\n"
+
+    monkeypatch.setenv("FAKE_UNREACHABLE", "1")
+    query = fake_ssh_client.query_remote("echo 'ok'")
+    assert query.returncode == 255
+    assert "Connection refused" in query.stderr
+
+
+def test_transfer_fake(
+    fake_tm: TransferManager, file_storage: Path, remote_storage: Path
+):
+    """
+    Test method `transfer` of `TransferManager` with stand-in
+    executables.
+    """
+
+    dir_ = str(uuid4())
+    progress_file = str(uuid4())
+    (file_storage / dir_).mkdir(parents=True, exist_ok=False)
+    (file_storage / dir_ / "file").write_bytes(b"test-fake")
+    log = fake_tm.transfer(
+        file_storage / dir_,
+        remote_storage.resolve() / dir_,
+        progress_file=file_storage / progress_file,
+    )
+    assert Context.ERROR not in log
+    assert (remote_storage / dir_ / "file").read_bytes() == b"test-fake"
+    assert b"100%" in (file_storage / progress_file).read_bytes()
+
+
+def test_transfer_fake_failure(
+    fake_tm: TransferManager,
+    file_storage: Path, remote_storage: Path, monkeypatch
+):
+    """
+    Test method `transfer` of `TransferManager` with stand-in
+    executables and emulated partial failure.
+    """
+
+    monkeypatch.setenv("FAKE_FAILURES", "1")
+    monkeypatch.setenv("FAKE_PROGRESS_CHUNK", "4")
+    dir_ = str(uuid4())
+    (file_storage / dir_).mkdir(parents=True, exist_ok=False)
+    (file_storage / dir_ / "file").write_bytes(b"test-fake")
+
+    log = fake_tm.transfer(
+        file_storage / dir_, remote_storage.resolve() / dir_, partial=True
+    )
+    assert Context.ERROR in log
+    assert (remote_storage / dir_ / "file").read_bytes() == b"test"
+
+    log = fake_tm.transfer(
+        file_storage / dir_, remote_storage.resolve() / dir_, partial=True
+    )
+    assert Context.ERROR not in log
+    assert (remote_storage / dir_ / "file").read_bytes() == b"test-fake"
+
+
+def test_transfer_fake_cancel(
+    fake_tm: TransferManager,
+    file_storage: Path, remote_storage: Path, monkeypatch
+):
+    """
+    Test method `transfer` of `TransferManager` with stand-in
+    executables being interrupted (like an aborted job).
+    """
+
+    monkeypatch.setenv("FAKE_THROUGHPUT", "10")
+    monkeypatch.setenv("FAKE_PROGRESS_CHUNK", "1")
+    fake_tm.terminate_timeout = 1
+    dir_ = str(uuid4())
+    (file_storage / dir_).mkdir(parents=True, exist_ok=False)
+    (file_storage / dir_ / "file").write_bytes(b"test-fake" * 100)
+    dst = remote_storage.resolve() / dir_
+
+    result = {}
+
+    def run():
+        try:
+            fake_tm.transfer(file_storage / dir_, dst)
+        except SystemExit as exc_info:
+            result["exc_info"] = exc_info
+
+    thread = Thread(target=run)
+    thread.start()
+    temporary = dst / ".file.fake"
+    while not temporary.is_file():
+        sleep(0.01)
+
+    # emulate abort by raising exception in thread
+    time0 = monotonic()
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread.ident), ctypes.py_object(SystemExit)
+    )
+    thread.join(5)
+    assert not thread.is_alive()
+    assert monotonic() - time0 < 2
+    assert "exc_info" in result
+
+    # rsync has been terminated
+    size = temporary.stat().st_size
+    sleep(0.3)
+    assert temporary.stat().st_size == size
+    assert not (dst / "file").exists()
+
+
+def test_free_space(fake_tm: TransferManager, remote_storage: Path):
+    """Test method `free_space` of `TransferManager`."""
+    local = TransferManager().free_space(remote_storage)
+    assert local > 0
+    # remote via df (executed locally by fake ssh)
+    remote = fake_tm.free_space(remote_storage.resolve())
+    assert abs(remote - local) < 100 * 1024**2
+    assert fake_tm.free_space(remote_storage / str(uuid4())) is None
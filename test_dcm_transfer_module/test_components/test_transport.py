@@ -0,0 +1,73 @@
+"""Transport-component test-module."""
+
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from dcm_common import LoggingContext as Context
+
+from dcm_transfer_module.components import (
+    TransferManager,
+    Transport,
+    RsyncTransport,
+    register_transport,
+    get_transport,
+)
+
+
+@pytest.fixture(name="transport")
+def _transport(fake_rsync):
+    return RsyncTransport(TransferManager(command=fake_rsync))
+
+
+def test_transport_registry():
+    """Test registry of transport backends."""
+    assert get_transport("rsync") == RsyncTransport.from_config
+    with pytest.raises(ValueError):
+        get_transport("unknown-transport")
+
+    class DummyTransport(RsyncTransport):
+        """Transport for testing."""
+
+    register_transport("dummy", DummyTransport.from_config)
+    assert get_transport("dummy") == DummyTransport.from_config
+
+
+def test_transport_interface():
+    """Test that incomplete backends cannot be instantiated."""
+
+    class IncompleteTransport(Transport):
+        """Transport without methods."""
+
+    with pytest.raises(TypeError):
+        IncompleteTransport()
+
+
+def test_rsync_transport(
+    transport: RsyncTransport, src: Path, remote_storage: Path
+):
+    """Test operations of `RsyncTransport` (local)."""
+    assert transport.key == "local"
+    assert not transport.remote
+
+    destination = remote_storage.resolve() / str(uuid4())
+    assert transport.preflight(destination) == (True, "")
+    assert destination.is_dir()
+    assert transport.free_space(destination) > 0
+
+    dst = destination / src.name
+    assert not transport.exists(dst)
+    log = transport.transfer(src, dst, mirror=True, resume=True)
+    assert Context.ERROR not in log
+    assert transport.exists(dst)
+    assert (dst / "small").read_bytes() == b"small"
+
+    # verification
+    assert Context.ERROR not in transport.verify(src, dst)
+    (dst / "small").write_bytes(b"SMALL")
+    log = transport.verify(src, dst)
+    assert Context.ERROR in log
+    assert any("small" in msg["body"] for msg in log.json["ERROR"])
+
+    assert transport.remove(dst)[0] == 0
+    assert not transport.exists(dst)
@@ -0,0 +1,66 @@
+"""AppConfig test-module."""
+
+import json
+
+from dcm_transfer_module import app_factory
+from dcm_transfer_module.config import AppConfig
+
+
+def test_api_document_lazy(testing_config, tmp_path):
+    """Test lazy loading of `AppConfig.api`."""
+
+    class Config(testing_config):
+        API_DOCUMENT = tmp_path / "openapi.yaml"
+        IDENTITY_CACHE_FILE = tmp_path / "identity.json"
+
+    Config.API_DOCUMENT.write_bytes(AppConfig.API_DOCUMENT.read_bytes())
+    # pylint: disable=protected-access
+    documents = AppConfig.__dict__["api"]._documents
+
+    # fill identity cache and discard document (like a new process)
+    Config()
+    documents.pop(Config.API_DOCUMENT)
+
+    app = app_factory(Config())
+    assert Config.API_DOCUMENT not in documents
+    assert "api" not in map(str.lower, app.config)
+
+    assert "info" in Config().api
+    assert Config.API_DOCUMENT in documents
+    assert Config.api is Config().api
+
+
+def test_identity_cache(fake_ssh, fake_rsync, tmp_path):
+    """Test caching of software versions in self-description."""
+
+    class Config(AppConfig):
+        IDENTITY_CACHE_FILE = tmp_path / "identity.json"
+        SSH_COMMAND = fake_ssh
+        RSYNC_COMMAND = fake_rsync
+
+    software = Config().CONTAINER_SELF_DESCRIPTION["version"]["software"]
+    assert "fake" in software["ssh"]
+    assert "fake" in software["rsync"]
+    cache = json.loads(Config.IDENTITY_CACHE_FILE.read_text("utf-8"))
+    assert sorted(cache) == ["api", "rsync", "ssh"]
+
+    # cached values are used as long as the executable is unchanged
+    cache["rsync"]["value"] = "rsync (cached)"
+    Config.IDENTITY_CACHE_FILE.write_text(json.dumps(cache), "utf-8")
+    assert (
+        Config().CONTAINER_SELF_DESCRIPTION["version"]["software"]["rsync"]
+        == "rsync (cached)"
+    )
+
+    # cache is ignored if it is writable by others
+    Config.IDENTITY_CACHE_FILE.chmod(0o666)
+    assert "fake" in (
+        Config().CONTAINER_SELF_DESCRIPTION["version"]["software"]["rsync"]
+    )
+    assert Config.IDENTITY_CACHE_FILE.stat().st_mode & 0o777 == 0o600
+
+    # caching can be disabled
+    Config.IDENTITY_CACHE = False
+    assert "fake" in (
+        Config().CONTAINER_SELF_DESCRIPTION["version"]["software"]["rsync"]
+    )
@@ -81,6 +81,80 @@ def _transfer_handler(fixtures):
             },
             Responses.GOOD.status
         ),
+        (
+            {
+                "transfer": {"target": {"path": "test_sip"}, "profile": True},
+            },
+            Responses.GOOD.status
+        ),
+        (
+            {
+                "transfer": {"target": {"path": "test_sip"}, "profile": 1},
+            },
+            422
+        ),
+        (
+            {
+                "transfer": {
+                    "target": {"path": "test_sip"},
+                    "options": {
+                        "compression": True,
+                        "compressionLevel": 3,
+                        "verify": "full",
+                        "bandwidthLimit": 1024,
+                        "parallelism": 4,
+                        "retries": 0,
+                        "priority": "high",
+                    },
+                },
+            },
+            Responses.GOOD.status
+        ),
+        (
+            {
+                "transfer": {
+                    "target": {"path": "test_sip"},
+                    "options": {"unknown": 1},
+                },
+            },
+            400
+        ),
+        (
+            {
+                "transfer": {
+                    "target": {"path": "test_sip"},
+                    "options": {"compressionLevel": 10},
+                },
+            },
+            422
+        ),
+        (
+            {
+                "transfer": {
+                    "target": {"path": "test_sip"},
+                    "options": {"verify": "unknown"},
+                },
+            },
+            422
+        ),
+        (
+            {
+                "transfer": {
+                    "target": {"path": "test_sip"},
+                    "options": {"parallelism": 0},
+                },
+            },
+            422
+        ),
+        (
+            {
+                "transfer": {
+                    "target": {"path": "test_sip"},
+                    "options": {"retries": -1},
+                },
+            },
+            422
+        ),
     ]),
     ids=[f"stage {i+1}" for i in range(len(pytest_args))]
 )
@@ -97,3 +171,39 @@ def test_transfer_handler(
     else:
         assert isinstance(output.data.value["transfer"], TransferConfig)
         assert fixtures not in output.data.value["transfer"].target.path.parents
+
+
+@pytest.mark.parametrize(
+    ("options", "status"),
+    [
+        ({"bandwidthLimit": 100}, Responses.GOOD.status),
+        ({"bandwidthLimit": 0}, 422),
+        ({"bandwidthLimit": 101}, 422),
+        ({"parallelism": 3}, 422),
+        ({"retries": 2}, 422),
+        ({"verify": "none"}, 422),
+        ({"verify": "checksums"}, Responses.GOOD.status),
+        ({"priority": "normal"}, Responses.GOOD.status),
+        ({"priority": "high"}, 422),
+    ],
+    ids=[
+        "bandwidth-ok", "bandwidth-unlimited", "bandwidth-exceeded",
+        "parallelism", "retries", "verify-not-allowed", "verify-allowed",
+        "priority-allowed", "priority-not-allowed",
+    ],
+)
+def test_transfer_handler_limits(options, status, fixtures):
+    """Test `get_transfer_handler` with limits for `TransferOptions`."""
+    output = handlers.get_transfer_handler(
+        fixtures,
+        max_bandwidth_limit=100,
+        max_parallelism=2,
+        max_retries=1,
+        verify_modes=["checksums", "full"],
+        priorities=["low", "normal"],
+    ).run(
+        json={
+            "transfer": {"target": {"path": "test_sip"}, "options": options}
+        }
+    )
+    assert output.last_status == status
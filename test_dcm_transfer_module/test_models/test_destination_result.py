@@ -0,0 +1,13 @@
+"""Test module for the `DestinationResult` data model."""
+
+from dcm_common.models.data_model import get_model_serialization_test
+
+from dcm_transfer_module.models import DestinationResult
+
+
+test_destination_result_json = get_model_serialization_test(
+    DestinationResult, (
+        (("primary", "/remote_storage/sip"), {}),
+        (("mirror", "/remote_storage/sip", "dcm@mirror", True, 2), {}),
+    )
+)
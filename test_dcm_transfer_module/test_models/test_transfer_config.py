@@ -3,11 +3,18 @@
 from pathlib import Path
 from dcm_common.models.data_model import get_model_serialization_test
 
-from dcm_transfer_module.models import Target, TransferConfig
+from dcm_transfer_module.models import (
+    Target, TransferConfig, TransferOptions
+)
 
 
 test_transfer_config_json = get_model_serialization_test(
     TransferConfig, (
         ((Target(Path(".")),), {}),
+        ((Target(Path(".")), True), {}),
+        (
+            (Target(Path(".")),),
+            {"options": TransferOptions(compression=True, retries=0)},
+        ),
     )
 )
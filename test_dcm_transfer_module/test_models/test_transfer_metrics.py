@@ -0,0 +1,13 @@
+"""Test module for the `TransferMetrics` data model."""
+
+from dcm_common.models.data_model import get_model_serialization_test
+
+from dcm_transfer_module.models import TransferMetrics
+
+
+test_transfer_metrics_json = get_model_serialization_test(
+    TransferMetrics, (
+        ((), {}),
+        ((1024, 512.0, 2.0, 2.0, 1, 2, 1), {}),
+    )
+)
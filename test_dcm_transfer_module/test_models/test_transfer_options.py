@@ -0,0 +1,14 @@
+"""Test module for the `TransferOptions` data model."""
+
+from dcm_common.models.data_model import get_model_serialization_test
+
+from dcm_transfer_module.models import TransferOptions
+
+
+test_transfer_options_json = get_model_serialization_test(
+    TransferOptions, (
+        ((), {}),
+        ((True, 3, "full", 1024, 4, 0, "high"), {}),
+        ((), {"compression": False, "verify": "none"}),
+    )
+)
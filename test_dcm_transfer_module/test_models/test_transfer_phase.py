@@ -0,0 +1,13 @@
+"""Test module for the `TransferPhase` data model."""
+
+from dcm_common.models.data_model import get_model_serialization_test
+
+from dcm_transfer_module.models import TransferPhase
+
+
+test_transfer_phase_json = get_model_serialization_test(
+    TransferPhase, (
+        (("slot", 0.1), {}),
+        (("transfer_attempt", 2.5, 1), {}),
+    )
+)
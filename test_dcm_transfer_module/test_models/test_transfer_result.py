@@ -2,11 +2,21 @@
 
 from dcm_common.models.data_model import get_model_serialization_test
 
-from dcm_transfer_module.models import TransferResult
+from dcm_transfer_module.models import (
+    TransferResult, TransferMetrics, TransferStats, TransferPhase,
+    DestinationResult,
+)
 
 test_transfer_result_json = get_model_serialization_test(
     TransferResult, (
         ((), {}),
         ((True,), {}),
+        ((True, TransferMetrics(bytes=1024)), {}),
+        ((True,), {"stats": TransferStats(files=2, speedup=1.5)}),
+        ((True,), {"phases": [TransferPhase("slot", 0.1)]}),
+        (
+            (True,),
+            {"destinations": [DestinationResult("primary", "/a", "local")]},
+        ),
     )
 )
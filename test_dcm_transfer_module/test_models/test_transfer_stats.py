@@ -0,0 +1,13 @@
+"""Test module for the `TransferStats` data model."""
+
+from dcm_common.models.data_model import get_model_serialization_test
+
+from dcm_transfer_module.models import TransferStats
+
+
+test_transfer_stats_json = get_model_serialization_test(
+    TransferStats, (
+        ((), {}),
+        ((3, 2, 2048, 2048, 2048, 0, 81, 0.001, 0.0, 2187, 57, 0.89), {}),
+    )
+)
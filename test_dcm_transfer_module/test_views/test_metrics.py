@@ -0,0 +1,66 @@
+"""Test-module for metrics-endpoint."""
+
+from uuid import uuid4
+
+from dcm_common.util import get_output_path
+
+from dcm_transfer_module import app_factory
+
+
+def test_metrics_disabled(testing_config):
+    """Test that /metrics is not available by default."""
+    client = app_factory(testing_config()).test_client()
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics(testing_config, minimal_request_body, file_storage):
+    """Test /metrics-GET endpoint after a successful and a failed job."""
+
+    class TestingConfig(testing_config):
+        EXPOSE_METRICS = True
+        METRICS_DATABASE = file_storage / str(uuid4()) / "metrics.db"
+
+    app = app_factory(TestingConfig())
+    client = app.test_client()
+
+    # second job fails since destination exists
+    conflicting_sip = get_output_path(file_storage)
+    (TestingConfig.REMOTE_DESTINATION / conflicting_sip.name).mkdir(
+        parents=True
+    )
+    for body in [
+        minimal_request_body,
+        {
+            "transfer": {
+                "target": {
+                    "path": str(conflicting_sip.relative_to(file_storage))
+                }
+            }
+        },
+    ]:
+        assert client.post("/transfer", json=body).status_code == 201
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    lines = response.text.splitlines()
+    for line in [
+        "# TYPE dcm_transfer_jobs_total counter",
+        "dcm_transfer_jobs_submitted_total 2",
+        "dcm_transfer_jobs_started_total 2",
+        'dcm_transfer_jobs_total{result="failure"} 1',
+        'dcm_transfer_jobs_total{result="success"} 1',
+        'dcm_transfer_failures_total{class="destination_exists"} 1',
+        "dcm_transfer_bytes_total 0",
+        'dcm_transfer_job_duration_seconds_bucket{le="+Inf"} 2',
+        'dcm_transfer_phase_duration_seconds_count{phase="callback"} 2',
+        'dcm_transfer_phase_duration_seconds_count{phase="transfer_attempt"}'
+        + " 1",
+        "dcm_transfer_throughput_bytes_per_second_count 1",
+        "dcm_transfer_queue_depth 0",
+    ]:
+        assert line in lines
+    assert not any(
+        line.startswith("dcm_transfer_retries_total ") for line in lines
+    )
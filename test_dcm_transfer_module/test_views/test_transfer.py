@@ -1,11 +1,13 @@
 """Test-module for transfer-endpoint."""
 
 from uuid import uuid4
-from time import sleep
+from time import sleep, time
+from threading import Thread
 from unittest.mock import patch
 import pytest
-import os
 from pathlib import Path
+from json import loads
+import pstats
 
 from dcm_common import Logger, LoggingContext as Context
 from dcm_common.util import get_output_path
@@ -34,6 +36,14 @@ def test_app_factory_ssh_fingerprint_config(
             app_factory(testing_config(), block=True)
 
 
+def test_app_factory_unknown_transport(testing_config):
+    """Test function `app_factory` with unknown transport backend."""
+    testing_config.TRANSFER_TRANSPORT = "unknown-transport"
+    testing_config.ORCHESTRA_AT_STARTUP = False
+    with pytest.raises(RuntimeError):
+        app_factory(testing_config(), block=True)
+
+
 def test_transfer_minimal(minimal_request_body, testing_config):
     """Test basic functionality of /transfer-POST endpoint."""
 
@@ -137,7 +147,7 @@ def test_transfer_dst_exists(
 
 
 def test_transfer_dst_exists_overwrite_fail(
-    testing_config, minimal_request_body, request
+    testing_config, minimal_request_body, restore_cwd
 ):
     """
     Test /transfer-POST endpoint when output destination already exists
@@ -148,9 +158,6 @@ def test_transfer_dst_exists_overwrite_fail(
     component.
     """
 
-    cwd = Path.cwd().resolve()
-    request.addfinalizer(lambda: os.chdir(cwd))
-
     # setup client with given settings
     class TestingConfig(testing_config):
         OVERWRITE_EXISTING = True
@@ -202,7 +209,7 @@ def _mock_transfer_return():
 
 
 def test_transfer_retries(
-    testing_config, minimal_request_body, mock_transfer_return, request
+    testing_config, minimal_request_body, mock_transfer_return, restore_cwd
 ):
     """
     Test /transfer-POST endpoint for repeated transfer attempts.
@@ -212,9 +219,6 @@ def test_transfer_retries(
     component.
     """
 
-    cwd = Path.cwd().resolve()
-    request.addfinalizer(lambda: os.chdir(cwd))
-
     # setup client with given settings
     class TestingConfig(testing_config):
         # Set config parameters to reduce the execution time
@@ -260,6 +264,171 @@ def test_transfer_retries(
             )
     # The final error message appears in log
     assert json["log"]["ERROR"][-1]["body"] == "SIP transfer failed."
+    # every attempt is timed
+    assert [
+        (phase["name"], phase.get("attempt"))
+        for phase in json["data"]["phases"]
+    ] == (
+        [
+            ("slot", None),
+            ("destination_check", None),
+            ("channel_setup", None),
+            ("transfer_attempt", 0),
+        ]
+        + [
+            phase
+            for i in range(TestingConfig.TRANSFER_RETRIES)
+            for phase in [
+                ("retry_wait", i), ("slot", i + 1), ("transfer_attempt", i + 1)
+            ]
+        ]
+        + [("cleanup", None), ("callback", None)]
+    )
+    assert all(phase["duration"] >= 0 for phase in json["data"]["phases"])
+    assert any(
+        phase["name"] == "retry_wait" and phase["duration"] >= 0.1
+        for phase in json["data"]["phases"]
+    )
+
+
+def test_transfer_stderr_live(
+    testing_config, minimal_request_body, mock_transfer_return, restore_cwd
+):
+    """
+    Test that messages on stderr are added to the report while the
+    transfer is running.
+    """
+
+    class TestingConfig(testing_config):
+        TRANSFER_RETRIES = 0
+
+    view = TransferView(TestingConfig())
+    report = Report(token=Token("0"))
+    live = []
+
+    def transfer(*args, on_stderr, **kwargs):
+        on_stderr("rsync: some warning")
+        live.extend(msg["body"] for msg in report.json["log"]["INFO"])
+        return mock_transfer_return(0)
+
+    with patch(
+        "dcm_transfer_module.components.transfer.TransferManager.transfer",
+        side_effect=transfer,
+    ):
+        view.transfer(
+            JobContext(lambda: None, None, None),
+            JobInfo(
+                JobConfig("", minimal_request_body, minimal_request_body),
+                report=report,
+            ),
+        )
+
+    assert "Transfer reported: rsync: some warning" in live
+
+
+def test_transfer_options(
+    testing_config, minimal_request_body, mock_transfer_return, restore_cwd
+):
+    """Test that the job honors per-request `TransferOptions`."""
+
+    class TestingConfig(testing_config):
+        TRANSFER_RETRIES = 3
+        TRANSFER_RETRY_INTERVAL = 0
+
+    view = TransferView(TestingConfig())
+
+    body = {
+        "transfer": minimal_request_body["transfer"]
+        | {
+            "options": {
+                "compression": True,
+                "compression_level": 3,
+                "verify": "checksums",
+                "bandwidth_limit": 64,
+                "retries": 1,
+            }
+        }
+    }
+    with patch(
+        "dcm_transfer_module.components.transfer.TransferManager.transfer",
+        side_effect=[mock_transfer_return(i) for i in range(2)],
+    ) as transfer:
+        report = Report(token=Token("0"))
+        view.transfer(
+            JobContext(lambda: None, None, None),
+            JobInfo(JobConfig("", body, body), report=report),
+        )
+
+    assert report.json["data"]["success"] is False
+    # retries of request replace TRANSFER_RETRIES
+    assert transfer.call_count == 2
+    assert transfer.call_args.kwargs["use_compression"]
+    assert transfer.call_args.kwargs["compression_level"] == 3
+    assert transfer.call_args.kwargs["validate_checksums"]
+    assert transfer.call_args.kwargs["bwlimit"] == 64
+
+
+@pytest.mark.parametrize(
+    ("bw_limit", "max_bw_limit", "expected"),
+    [(0, 0, 0), (64, 0, 64), (64, 100, 64), (0, 100, 100), (200, 100, 100)],
+    ids=["unlimited", "default", "below-max", "default-unlimited", "capped"],
+)
+def test_transfer_default_bandwidth_limit(
+    bw_limit,
+    max_bw_limit,
+    expected,
+    testing_config,
+    minimal_request_body,
+    restore_cwd,
+):
+    """
+    Test that the default bandwidth limit is subject to
+    `REQUEST_MAX_BANDWIDTH_LIMIT`.
+    """
+
+    class TestingConfig(testing_config):
+        BW_LIMIT = bw_limit
+        REQUEST_MAX_BANDWIDTH_LIMIT = max_bw_limit
+
+    view = TransferView(TestingConfig())
+
+    with patch(
+        "dcm_transfer_module.components.transfer.TransferManager.transfer",
+        return_value=Logger(default_origin="Transfer Manager"),
+    ) as transfer:
+        view.transfer(
+            JobContext(lambda: None, None, None),
+            JobInfo(
+                JobConfig("", minimal_request_body, minimal_request_body),
+                report=Report(token=Token("0")),
+            ),
+        )
+
+    assert transfer.call_args.kwargs["bwlimit"] == expected
+
+
+def test_transfer_options_verify(
+    testing_config, minimal_request_body, restore_cwd
+):
+    """Test per-request verification mode."""
+
+    view = TransferView(testing_config())
+
+    body = {
+        "transfer": minimal_request_body["transfer"]
+        | {"options": {"verify": "verify"}}
+    }
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(JobConfig("", body, body), report=report),
+    )
+
+    json = report.json
+    assert json["data"]["success"]
+    assert "verification" in [
+        phase["name"] for phase in json["data"]["phases"]
+    ]
 
 
 def test_transfer_progress(testing_config, file_storage):
@@ -317,6 +486,10 @@ def test_transfer_progress(testing_config, file_storage):
     assert json["progress"]["numeric"] == 100
     assert json["progress"]["status"] == "completed"
     assert json["data"]["success"] is True
+    assert json["data"]["metrics"]["bytes"] == len(b"payload" * 10000)
+    assert json["data"]["metrics"]["files_transferred"] >= 1
+    assert json["data"]["stats"]["files_transferred"] == 1
+    assert json["data"]["stats"]["total_size"] == len(b"payload" * 10000)
 
 
 def test_transfer_no_connection_remote(
@@ -348,3 +521,705 @@ def test_transfer_no_connection_remote(
         "Unable to establish connection" in msg["body"]
         for msg in json["log"]["ERROR"]
     )
+
+
+def test_transfer_connection_slot_timeout(
+    testing_config, minimal_request_body, file_storage, request, restore_cwd
+):
+    """
+    Test /transfer-POST endpoint when no connection slot becomes
+    available.
+    """
+
+    class TestingConfig(testing_config):
+        TRANSFER_MAX_CONNECTIONS = 1
+        TRANSFER_LOCK_DIRECTORY = file_storage.resolve() / str(uuid4())
+        TRANSFER_SLOT_INTERVAL = 0.01
+        TRANSFER_SLOT_TIMEOUT = 0.1
+
+    view = TransferView(TestingConfig())
+
+    # occupy only slot
+    slot = view.semaphore.try_acquire()
+    request.addfinalizer(slot.release)
+
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(
+            JobConfig("", minimal_request_body, minimal_request_body),
+            report=report,
+        ),
+    )
+
+    json = report.json
+    assert json["data"]["success"] is False
+    assert not (
+        TestingConfig.REMOTE_DESTINATION
+        / minimal_request_body["transfer"]["target"]["path"]
+    ).is_dir()
+    assert any(
+        "Unable to acquire a connection slot" in msg["body"]
+        for msg in json["log"]["ERROR"]
+    )
+    assert any(
+        "Maximum number of concurrent connections" in msg["body"]
+        for msg in json["log"]["INFO"]
+    )
+
+
+def test_transfer_connection_slot_retry_wait(
+    testing_config, minimal_request_body, mock_transfer_return, file_storage,
+    restore_cwd
+):
+    """
+    Test that the connection slot is released while waiting for a
+    retry.
+    """
+
+    class TestingConfig(testing_config):
+        TRANSFER_MAX_CONNECTIONS = 1
+        TRANSFER_LOCK_DIRECTORY = file_storage.resolve() / str(uuid4())
+        TRANSFER_RETRIES = 1
+        TRANSFER_RETRY_INTERVAL = 0.5
+
+    view = TransferView(TestingConfig())
+
+    # probe slot during retry wait
+    available = []
+
+    def probe(*_):
+        slot = view.semaphore.try_acquire()
+        available.append(slot is not None)
+        if slot is not None:
+            slot.release()
+
+    with patch(
+        "dcm_transfer_module.components.transfer.TransferManager.transfer",
+        side_effect=[mock_transfer_return(i) for i in range(2)],
+    ), patch("dcm_transfer_module.views.transfer._sleep", side_effect=probe):
+        report = Report(token=Token("0"))
+        view.transfer(
+            JobContext(lambda: None, None, None),
+            JobInfo(
+                JobConfig("", minimal_request_body, minimal_request_body),
+                report=report,
+            ),
+        )
+
+    assert available == [True]
+    assert [
+        (phase["name"], phase.get("attempt"))
+        for phase in report.json["data"]["phases"]
+        if phase["name"] == "slot"
+    ] == [("slot", None), ("slot", 1)]
+
+
+def test_transfer_connection_slot_preflight(
+    testing_config, minimal_request_body, mock_transfer_return, file_storage,
+    restore_cwd
+):
+    """
+    Test that the connection slot is held during the preflight, i.e.,
+    preflights of concurrent jobs do not overlap.
+    """
+
+    class TestingConfig(testing_config):
+        TRANSFER_MAX_CONNECTIONS = 1
+        TRANSFER_LOCK_DIRECTORY = file_storage.resolve() / str(uuid4())
+        TRANSFER_SLOT_INTERVAL = 0.01
+        TRANSFER_RETRIES = 0
+
+    view = TransferView(TestingConfig())
+
+    # record duration of every preflight
+    preflights = []
+    preflight = view.transport.preflight
+
+    def record(*args, **kwargs):
+        start = time()
+        sleep(0.1)
+        result = preflight(*args, **kwargs)
+        preflights.append((start, time()))
+        return result
+
+    def run():
+        view.transfer(
+            JobContext(lambda: None, None, None),
+            JobInfo(
+                JobConfig("", minimal_request_body, minimal_request_body),
+                report=Report(token=Token("0")),
+            ),
+        )
+
+    with patch.object(view.transport, "preflight", side_effect=record), patch(
+        "dcm_transfer_module.components.transfer.TransferManager.transfer",
+        side_effect=[mock_transfer_return(i) for i in range(4)],
+    ):
+        threads = [Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(preflights) == 4
+    preflights.sort()
+    assert all(
+        end <= start
+        for (_, end), (start, _) in zip(preflights, preflights[1:])
+    )
+
+
+@pytest.mark.parametrize(
+    ("exception", "deleted"),
+    [(SystemExit, True), (RuntimeError, False)],
+    ids=["abort", "error"],
+)
+def test_transfer_abort_cleanup(
+    exception, deleted, testing_config, minimal_request_body, restore_cwd
+):
+    """
+    Test that partial data is only deleted if the job has been aborted
+    (and `TRANSFER_ABORT_CLEANUP` is 'delete').
+    """
+
+    class TestingConfig(testing_config):
+        TRANSFER_ABORT_CLEANUP = "delete"
+
+    view = TransferView(TestingConfig())
+    target = (
+        TestingConfig.REMOTE_DESTINATION
+        / Path(minimal_request_body["transfer"]["target"]["path"]).name
+    )
+
+    def partial_transfer(*_, **__):
+        target.mkdir(parents=True)
+        (target / "partial").touch()
+        raise exception()
+
+    with patch(
+        "dcm_transfer_module.components.transfer.TransferManager.transfer",
+        side_effect=partial_transfer,
+    ), pytest.raises(exception):
+        view.transfer(
+            JobContext(lambda: None, None, None),
+            JobInfo(
+                JobConfig("", minimal_request_body, minimal_request_body),
+                report=Report(token=Token("0")),
+            ),
+        )
+
+    assert target.exists() is not deleted
+
+
+def test_transfer_failure_class(
+    testing_config, minimal_request_body, mock_transfer_return, file_storage,
+    request, restore_cwd
+):
+    """
+    Test that the failure class in the metrics refers to the phase in
+    which the job has failed (slot timeout in a retry; the job still
+    passes the cleanup-phase afterwards).
+    """
+
+    class TestingConfig(testing_config):
+        EXPOSE_METRICS = True
+        METRICS_DATABASE = file_storage / str(uuid4()) / "metrics.db"
+        TRANSFER_MAX_CONNECTIONS = 1
+        TRANSFER_LOCK_DIRECTORY = file_storage.resolve() / str(uuid4())
+        TRANSFER_RETRIES = 1
+        TRANSFER_SLOT_INTERVAL = 0.01
+        TRANSFER_SLOT_TIMEOUT = 0.1
+
+    view = TransferView(TestingConfig())
+
+    # occupy only slot during retry wait
+    def occupy(*_):
+        request.addfinalizer(view.semaphore.try_acquire().release)
+
+    with patch(
+        "dcm_transfer_module.components.transfer.TransferManager.transfer",
+        side_effect=[mock_transfer_return(0)],
+    ), patch("dcm_transfer_module.views.transfer._sleep", side_effect=occupy):
+        report = Report(token=Token("0"))
+        view.transfer(
+            JobContext(lambda: None, None, None),
+            JobInfo(
+                JobConfig("", minimal_request_body, minimal_request_body),
+                report=report,
+            ),
+        )
+
+    assert report.json["data"]["success"] is False
+    assert "cleanup" in [
+        phase["name"] for phase in report.json["data"]["phases"]
+    ]
+    assert view.metrics.samples()["dcm_transfer_failures_total"] == {
+        'class="slot_timeout"': 1
+    }
+
+
+@pytest.mark.parametrize(
+    ("priority", "success"),
+    [("low", False), ("normal", True)],
+    ids=["low", "normal"],
+)
+def test_transfer_priority_slots(
+    priority, success, testing_config, minimal_request_body, file_storage,
+    request, restore_cwd
+):
+    """
+    Test /transfer-POST endpoint with connection slots that are
+    limited by priority.
+    """
+
+    class TestingConfig(testing_config):
+        TRANSFER_MAX_CONNECTIONS = 2
+        TRANSFER_PRIORITY_SLOTS = {"low": 1}
+        TRANSFER_LOCK_DIRECTORY = file_storage.resolve() / str(uuid4())
+        TRANSFER_SLOT_INTERVAL = 0.01
+        TRANSFER_SLOT_TIMEOUT = 0.1
+
+    view = TransferView(TestingConfig())
+
+    # occupy slot that is available to low priority jobs
+    slot = view.semaphore.try_acquire()
+    request.addfinalizer(slot.release)
+
+    body = {
+        "transfer": minimal_request_body["transfer"]
+        | {"options": {"priority": priority}}
+    }
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(JobConfig("", body, body), report=report),
+    )
+
+    assert report.json["data"]["success"] is success
+
+
+def test_transfer_bad_priority_config(testing_config):
+    """Test `TransferView` with bad `TRANSFER_PRIORITY_SLOTS`."""
+
+    class TestingConfig(testing_config):
+        TRANSFER_PRIORITY_SLOTS = {"urgent": 1}
+
+    with pytest.raises(RuntimeError):
+        TransferView(TestingConfig())
+
+
+@pytest.mark.parametrize(
+    "wait", [0, 0.05], ids=["fail-fast", "wait"]
+)
+def test_transfer_remote_unavailable(
+    wait, testing_config_fake, minimal_request_body, monkeypatch, request,
+    restore_cwd
+):
+    """
+    Test /transfer-POST endpoint while the circuit breaker for the
+    remote is open.
+    """
+    monkeypatch.setenv("FAKE_UNREACHABLE", "1")
+
+    class TestingConfig(testing_config_fake):
+        REMOTE_HEALTH_INTERVAL = 0.01
+        REMOTE_HEALTH_FAILURE_THRESHOLD = 1
+        REMOTE_HEALTH_WAIT = wait
+
+    view = TransferView(TestingConfig())
+    request.addfinalizer(view.health.stop)
+    assert view.health.run_check()["state"] == "open"
+
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(
+            JobConfig("", minimal_request_body, minimal_request_body),
+            report=report,
+        ),
+    )
+
+    json = report.json
+    assert json["data"]["success"] is False
+    assert any(
+        "Remote is unavailable" in msg["body"]
+        for msg in json["log"]["ERROR"]
+    )
+    assert (
+        any(
+            "Remote is currently unavailable" in msg["body"]
+            for msg in json["log"].get("INFO", [])
+        )
+        == (wait > 0)
+    )
+    # no connection attempt by job
+    assert [phase["name"] for phase in json["data"]["phases"]] == [
+        "remote_health", "callback"
+    ]
+
+
+def test_transfer_verify(
+    testing_config_fake, minimal_request_body, restore_cwd
+):
+    """Test /transfer-POST endpoint with verification of the result."""
+
+    class TestingConfig(testing_config_fake):
+        TRANSFER_VERIFY = True
+
+    view = TransferView(TestingConfig())
+
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(
+            JobConfig("", minimal_request_body, minimal_request_body),
+            report=report,
+        ),
+    )
+
+    json = report.json
+    assert json["data"]["success"]
+    assert any(
+        "Verified transfer" in msg["body"] for msg in json["log"]["INFO"]
+    )
+    assert "verification" in [
+        phase["name"] for phase in json["data"]["phases"]
+    ]
+
+
+def test_transfer_replicas(
+    testing_config_fake, minimal_request_body, file_storage, restore_cwd
+):
+    """
+    Test /transfer-POST endpoint with replicas that are written with a
+    single read of the SIP.
+    """
+
+    class TestingConfig(testing_config_fake):
+        TRANSFER_VERIFY = True
+        TRANSFER_REPLICAS = [
+            {
+                "name": "local",
+                "LOCAL_TRANSFER": True,
+                "REMOTE_DESTINATION": str(
+                    file_storage.resolve() / "replica_local"
+                ),
+            },
+            {
+                "name": "remote",
+                "REMOTE_DESTINATION": str(
+                    file_storage.resolve() / "replica_remote"
+                ),
+            },
+        ]
+
+    view = TransferView(TestingConfig())
+
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(
+            JobConfig("", minimal_request_body, minimal_request_body),
+            report=report,
+        ),
+    )
+
+    json = report.json
+    assert json["data"]["success"]
+    sip = Path(minimal_request_body["transfer"]["target"]["path"]).name
+    assert [
+        (result["name"], result["success"], result["attempts"])
+        for result in json["data"]["destinations"]
+    ] == [("primary", True, 1), ("local", True, 1), ("remote", True, 1)]
+    for destination in (
+        TestingConfig.REMOTE_DESTINATION,
+        file_storage.resolve() / "replica_local",
+        file_storage.resolve() / "replica_remote",
+    ):
+        assert (destination / sip / "payload.txt").is_file()
+    # the SIP is read once
+    assert [phase["name"] for phase in json["data"]["phases"]].count(
+        "transfer_attempt"
+    ) == 1
+
+
+def test_transfer_replicas_partial_failure(
+    testing_config, minimal_request_body, file_storage, restore_cwd
+):
+    """
+    Test /transfer-POST endpoint with a replica that fails; only the
+    failed destination is retried.
+    """
+
+    class TestingConfig(testing_config):
+        TRANSFER_RETRIES = 1
+        TRANSFER_RETRY_INTERVAL = 0
+        TRANSFER_REPLICAS = [
+            {
+                "name": "broken",
+                "REMOTE_DESTINATION": str(
+                    file_storage.resolve() / str(uuid4())
+                ),
+            },
+        ]
+
+    # block target in replica with a file
+    sip = Path(minimal_request_body["transfer"]["target"]["path"]).name
+    broken = Path(TestingConfig.TRANSFER_REPLICAS[0]["REMOTE_DESTINATION"])
+    broken.mkdir()
+    (broken / sip).touch()
+
+    view = TransferView(TestingConfig())
+
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(
+            JobConfig("", minimal_request_body, minimal_request_body),
+            report=report,
+        ),
+    )
+
+    json = report.json
+    assert json["data"]["success"] is False
+    assert [
+        (result["name"], result["success"], result["attempts"])
+        for result in json["data"]["destinations"]
+    ] == [("primary", True, 1), ("broken", False, 2)]
+    assert (TestingConfig.REMOTE_DESTINATION / sip / "payload.txt").is_file()
+
+
+def test_transfer_replicas_unavailable(
+    testing_config, minimal_request_body, file_storage, restore_cwd
+):
+    """
+    Test /transfer-POST endpoint with a replica that is not available;
+    the other destinations are still written.
+    """
+
+    class TestingConfig(testing_config):
+        TRANSFER_VERIFY = True
+        TRANSFER_REPLICAS = [
+            {
+                "name": "existing",
+                "REMOTE_DESTINATION": str(
+                    file_storage.resolve() / str(uuid4())
+                ),
+            },
+            {
+                "name": "ok",
+                "REMOTE_DESTINATION": str(
+                    file_storage.resolve() / str(uuid4())
+                ),
+            },
+        ]
+
+    # target already exists in replica
+    sip = Path(minimal_request_body["transfer"]["target"]["path"]).name
+    existing = Path(TestingConfig.TRANSFER_REPLICAS[0]["REMOTE_DESTINATION"])
+    (existing / sip).mkdir(parents=True)
+
+    view = TransferView(TestingConfig())
+
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(
+            JobConfig("", minimal_request_body, minimal_request_body),
+            report=report,
+        ),
+    )
+
+    json = report.json
+    assert json["data"]["success"] is False
+    assert [
+        (result["name"], result["success"], result["attempts"])
+        for result in json["data"]["destinations"]
+    ] == [("primary", True, 1), ("existing", False, 0), ("ok", True, 1)]
+    assert (TestingConfig.REMOTE_DESTINATION / sip / "payload.txt").is_file()
+    assert (
+        Path(TestingConfig.TRANSFER_REPLICAS[1]["REMOTE_DESTINATION"])
+        / sip
+        / "payload.txt"
+    ).is_file()
+    assert not (existing / sip / "payload.txt").exists()
+
+
+@pytest.mark.parametrize(
+    "replicas",
+    [
+        [{"REMOTE_DESTINATION": "/replica"}],
+        [{"name": "primary"}],
+        [{"name": "a"}, {"name": "a"}],
+        [{"name": "a", "TRANSFER_TRANSPORT": "unknown-transport"}],
+        [{"name": "a", "TRANSFER_TRANSPORT": "rsync-daemon"}],
+    ],
+    ids=[
+        "missing-name", "reserved-name", "duplicate-name", "bad-transport",
+        "not-streaming",
+    ],
+)
+def test_transfer_replicas_bad_config(replicas, testing_config):
+    """Test `TransferView` with bad `TRANSFER_REPLICAS`."""
+
+    class TestingConfig(testing_config):
+        TRANSFER_REPLICAS = replicas
+
+    with pytest.raises(RuntimeError):
+        TransferView(TestingConfig())
+
+
+@pytest.mark.parametrize("ledger", [False, True], ids=["plain", "ledger"])
+def test_transfer_insufficient_space(
+    ledger, testing_config_fake, minimal_request_body, restore_cwd
+):
+    """
+    Test /transfer-POST endpoint with free-space preflight for a
+    remote that has insufficient space.
+    """
+
+    class TestingConfig(testing_config_fake):
+        TRANSFER_SPACE_CHECK = True
+        TRANSFER_SPACE_LEDGER = ledger
+        TRANSFER_SPACE_RESERVE = 2**62
+
+    view = TransferView(TestingConfig())
+
+    report = Report(token=Token("0"))
+    view.transfer(
+        JobContext(lambda: None, None, None),
+        JobInfo(
+            JobConfig("", minimal_request_body, minimal_request_body),
+            report=report,
+        ),
+    )
+
+    json = report.json
+    assert json["data"]["success"] is False
+    assert any(
+        "Insufficient space" in msg["body"]
+        for msg in json["log"]["ERROR"]
+    )
+    # no transfer attempt
+    assert "transfer_attempt" not in [
+        phase["name"] for phase in json["data"]["phases"]
+    ]
+    assert [phase["name"] for phase in json["data"]["phases"]][-2] == (
+        "space_check"
+    )
+    if ledger:
+        assert view.ledger.reserved() == 0
+
+
+def test_transfer_file_timeline(
+    testing_config, minimal_request_body, file_storage
+):
+    """Test /transfer-POST endpoint with per-file timeline."""
+
+    class TestingConfig(testing_config):
+        TRANSFER_FILE_TIMELINE = True
+        TRANSFER_TIMELINE_DIRECTORY = file_storage.resolve() / "timelines"
+
+    app = app_factory(TestingConfig())
+    client = app.test_client()
+
+    token = client.post("/transfer", json=minimal_request_body).json["value"]
+
+    # wait until job is completed
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+    json = client.get(f"/report?token={token}").json
+
+    assert json["data"]["success"]
+    assert "timeline" in json["data"]
+    timeline = Path(json["data"]["timeline"])
+    assert timeline.is_file()
+    assert "payload.txt" in timeline.read_text(encoding="utf-8")
+
+
+def test_transfer_tracing(testing_config, minimal_request_body, file_storage):
+    """
+    Test /transfer-POST endpoint with tracing and propagation of span
+    context from submission into the job.
+    """
+
+    class TestingConfig(testing_config):
+        TRACING_EXPORT_FILE = file_storage.resolve() / f"{uuid4()}.jsonl"
+
+    app = app_factory(TestingConfig())
+    client = app.test_client()
+
+    traceparent = "00-" + "1" * 32 + "-" + "2" * 16 + "-01"
+    client.post(
+        "/transfer",
+        json=minimal_request_body,
+        headers={"traceparent": traceparent},
+    )
+
+    # wait until job is completed
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+
+    spans = {
+        span["name"]: span
+        for line in TestingConfig.TRACING_EXPORT_FILE.read_text(
+            encoding="utf-8"
+        ).splitlines()
+        for span in loads(line)["resourceSpans"][0]["scopeSpans"][0][
+            "spans"
+        ]
+    }
+    assert set(spans) == {
+        "POST /transfer",
+        "queue_push",
+        "queue",
+        "TransferView.transfer",
+        "TransferManager.transfer",
+    }
+    assert {span["traceId"] for span in spans.values()} == {"1" * 32}
+    assert spans["POST /transfer"]["parentSpanId"] == "2" * 16
+    for name in ["queue_push", "queue", "TransferView.transfer"]:
+        assert (
+            spans[name]["parentSpanId"] == spans["POST /transfer"]["spanId"]
+        )
+    assert (
+        spans["TransferManager.transfer"]["parentSpanId"]
+        == spans["TransferView.transfer"]["spanId"]
+    )
+
+
+@pytest.mark.parametrize(
+    "allow_profiling", [True, False], ids=["allowed", "not-allowed"]
+)
+def test_transfer_profile(
+    allow_profiling, testing_config, minimal_request_body, file_storage
+):
+    """Test /transfer-POST endpoint with profiling."""
+
+    class TestingConfig(testing_config):
+        ALLOW_PROFILING = allow_profiling
+        PROFILING_DIRECTORY = file_storage.resolve() / "profiles"
+
+    app = app_factory(TestingConfig())
+    client = app.test_client()
+
+    minimal_request_body["transfer"]["profile"] = True
+    token = client.post("/transfer", json=minimal_request_body).json["value"]
+
+    # wait until job is completed
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+    json = client.get(f"/report?token={token}").json
+
+    assert json["data"]["success"]
+    if not allow_profiling:
+        assert json["data"].get("profile") is None
+        assert any(
+            "Profiling has been requested" in msg["body"]
+            for msg in json["log"]["WARNING"]
+        )
+        return
+    profile = Path(json["data"]["profile"])
+    assert profile == TestingConfig.PROFILING_DIRECTORY / f"{token}.pstats"
+    assert any(
+        "_run_job" in function
+        for _, _, function in pstats.Stats(str(profile)).stats
+    )